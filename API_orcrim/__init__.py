@@ -1,8 +1,31 @@
-import requests
-from urllib.parse import urlencode
 from typing import Union, Dict
 
-def buscar_personalidade(data_inicio: str, data_fim: str, token: str) -> Union[Dict, str]:
+# Este módulo não importa requests nem o transporte no nível do pacote: 'import API_orcrim' (e
+# 'python -m API_orcrim --help') não deve pagar o custo de carregar a pilha HTTP e as configurações.
+
+
+class ErroBusca(str):
+    """
+    Mensagem de erro devolvida por buscar_personalidade, com a causa estruturada.
+
+    Continua sendo uma str (a mesma mensagem de antes), para quem só exibe ou testa o retorno.
+
+    Atributos:
+        status (int): Código HTTP da resposta de erro, ou None se não houve resposta.
+        tipo (str): 'http' (resposta 4xx/5xx), 'timeout', 'conexao' (sem resposta), 'resposta'
+            (corpo interrompido ou JSON inválido), 'configuracao' (URL ou cabeçalho inválido, sem
+            requisição) ou 'desconhecido'.
+    """
+
+    def __new__(cls, mensagem, tipo, status=None):
+        erro = super().__new__(cls, mensagem)
+        erro.tipo = tipo
+        erro.status = status
+        return erro
+
+
+def buscar_personalidade(data_inicio: str, data_fim: str, token: str, transporte=None,
+                         base_url=None, timeout=None) -> Union[Dict, str]:
     """
     Consulta a API do sistema ORCRIM para buscar informações sobre personalidades dentro de um intervalo de datas.
 
@@ -10,10 +33,15 @@ def buscar_personalidade(data_inicio: str, data_fim: str, token: str) -> Union[D
     - data_inicio (str): A data de início para a busca, no formato 'DD/MM/AAAA HH:MM:SS.SSS'.
     - data_fim (str): A data de fim para a busca, no formato 'DD/MM/AAAA HH:MM:SS.SSS'.
     - token (str): Token de autorização para acessar a API.
+    - transporte (HttpTransport, opcional): Transporte HTTP com conexões persistentes. Se omitido, usa o
+      transporte compartilhado pelo processo (keep-alive e timeouts de config.settings).
+    - base_url (str, opcional): URL base da API (sem '/api/v1/...'). Se omitida, usa o ambiente de homologação.
+    - timeout (float ou tuple, opcional): Timeout desta requisição; se omitido, usa o do transporte.
 
     Retorna:
     - dict: Um objeto JSON com a resposta da API se a requisição for bem-sucedida e se a resposta puder ser processada corretamente.
-    - str: Uma mensagem de erro contendo o código de status da resposta ou descrição do erro se a requisição falhar ou ocorrer um erro durante o processamento.
+    - ErroBusca (str): Uma mensagem de erro contendo o código de status da resposta ou descrição do erro se a requisição falhar ou ocorrer um erro durante o processamento;
+      os atributos status e tipo indicam a causa.
 
     Exemplo de uso:
     >>> data_inicio = '01/01/2023 00:00:00.000'
@@ -25,12 +53,15 @@ def buscar_personalidade(data_inicio: str, data_fim: str, token: str) -> Union[D
     Nota: Esta função depende da biblioteca 'requests' para fazer a requisição HTTP e 'urllib.parse' para codificação de URL.
     Assegure-se de que ambas as bibliotecas estejam instaladas e disponíveis no seu ambiente.
     """
+    import requests
+    from urllib.parse import urlencode
+    from API_orcrim.transport import obter_transporte_padrao
 
     try:
         # Monta a URL com os parâmetros
-        base_url = 'https://hmlorcrim.mj.gov.br/backend-orcrim/api/v1/personalidade'
+        base_url = base_url or 'https://hmlorcrim.mj.gov.br/backend-orcrim'
         parametros = {'dataInicio': data_inicio, 'dataFim': data_fim}
-        url_completa = f"{base_url}?{urlencode(parametros)}"
+        url_completa = f"{base_url}/api/v1/personalidade?{urlencode(parametros)}"
 
         # Define os cabeçalhos da requisição
         headers = {
@@ -39,19 +70,33 @@ def buscar_personalidade(data_inicio: str, data_fim: str, token: str) -> Union[D
         }
 
         # Faz a requisição GET
-        response = requests.get(url_completa, headers=headers)
+        transporte = transporte or obter_transporte_padrao()
+        opcoes = {'timeout': timeout} if timeout is not None else {}
+        response = transporte.get(url_completa, headers=headers, **opcoes)
 
         # Verifica se a requisição foi bem-sucedida
         response.raise_for_status()  # Isso vai levantar uma exceção para respostas 4xx/5xx
 
         return response.json()  # Retorna a resposta em formato JSON
 
+    except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError,
+            requests.exceptions.InvalidJSONError) as e:
+        # Corpo interrompido no meio ou JSON truncado. Vem antes de HTTPError, de que ContentDecodingError
+        # é subclasse; InvalidURL e afins também são ValueError, por isso ValueError não entra aqui.
+        return ErroBusca(f'Erro ao ler a resposta: {e}', 'resposta')
     except requests.exceptions.HTTPError as e:
         # Captura erros específicos de HTTP e retorna a mensagem
-        return f'Erro HTTP: {e.response.status_code}, Mensagem: {e.response.text}'
+        return ErroBusca(f'Erro HTTP: {e.response.status_code}, Mensagem: {e.response.text}', 'http',
+                         e.response.status_code)
+    except requests.exceptions.Timeout as e:
+        return ErroBusca(f'Erro ao fazer a requisição: {e}', 'timeout')
+    except (requests.exceptions.InvalidURL, requests.exceptions.MissingSchema, requests.exceptions.InvalidSchema,
+            requests.exceptions.InvalidHeader, requests.exceptions.URLRequired) as e:
+        # Erro de configuração (base_url, token): a requisição nem foi feita.
+        return ErroBusca(f'Erro de configuração da requisição: {e}', 'configuracao')
     except requests.exceptions.RequestException as e:
         # Captura qualquer outra exceção de requests
-        return f'Erro ao fazer a requisição: {e}'
+        return ErroBusca(f'Erro ao fazer a requisição: {e}', 'conexao')
     except Exception as e:
         # Captura qualquer outra exceção geral
-        return f'Erro desconhecido: {str(e)}'
+        return ErroBusca(f'Erro desconhecido: {str(e)}', 'desconhecido')
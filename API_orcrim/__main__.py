@@ -0,0 +1,314 @@
+"""
+Linha de comando do pacote: python -m API_orcrim <comando> [opções].
+
+Comandos:
+    sincronizar  Atualiza a lista de UUIDs de forma incremental (e, opcionalmente, os detalhes).
+    hidratar     Busca o detalhe de cada UUID de um arquivo e grava em JSON Lines.
+    dominios     Recarrega as tabelas de domínio da API e regrava os snapshots.
+    criar        Cria personalidades em lote a partir de um arquivo JSON.
+    exportar     Converte detalhes em tabelas colunares (Parquet, ou CSV com gzip) para análise.
+    indexar      Inclui detalhes no índice local de busca por nome e alcunha.
+    buscar       Busca aproximada por nome, alcunha, nome da mãe ou do pai no índice local.
+
+Apenas argparse é carregado na inicialização; requests, o transporte, config.settings e os demais
+módulos pesados são importados dentro de cada comando, de modo que '--help' e erros de uso
+respondem em poucos milissegundos (útil em cron e pipelines de shell).
+
+Saída padrão é reservada para dados (JSON Lines); mensagens de resumo vão para a saída de erro.
+Códigos de saída: 0 sucesso, 1 houve falhas, 2 erro de uso.
+
+Exemplo de uso:
+    python -m API_orcrim sincronizar --detalhes json/detalhes.jsonl
+    python -m API_orcrim hidratar json/personalidade.json --cache json/cache_personalidades.sqlite3 > detalhes.jsonl
+    python -m API_orcrim dominios ufs municipios --condicional json/cache_condicional.sqlite3
+    python -m API_orcrim criar carga.json --diario json/carga.journal --validar
+    python -m API_orcrim criar carga.json --deduplicar json/detalhes.jsonl
+    python -m API_orcrim hidratar | python -m API_orcrim exportar - --destino exportacao/
+    python -m API_orcrim sincronizar --indice-busca json/busca_personalidades.sqlite3
+    python -m API_orcrim buscar "nandinho"
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+
+def _abrir_saida(caminho, modo='w'):
+    if caminho in (None, '-'):
+        return contextlib.nullcontext(sys.stdout)
+    return open(caminho, modo, encoding='utf-8')
+
+
+def _linha_json(dados):
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _informar(mensagem, *args):
+    print(mensagem % args, file=sys.stderr)
+
+
+def _iter_detalhes(entradas):
+    from API_orcrim.stream import iter_linhas_json, iter_registros
+
+    for caminho in entradas:
+        # JSON Lines (saída de hidratar) ou um JSON com lista/envelope {"data": [...]}.
+        if caminho == '-' or caminho.endswith(('.jsonl', '.ndjson')):
+            yield from iter_linhas_json(caminho)
+        else:
+            yield from iter_registros(caminho)
+
+
+def comando_sincronizar(args):
+    from API_orcrim.sync import SincronizadorIncremental
+
+    sincronizador = SincronizadorIncremental(args.uuids, args.estado)
+    with contextlib.ExitStack() as pilha:
+        destinos = []
+        if args.detalhes:
+            saida = pilha.enter_context(_abrir_saida(args.detalhes, 'a'))
+            destinos.append(lambda detalhe: saida.write(_linha_json(detalhe)))
+        if args.indice_busca:
+            from API_orcrim.busca import IndiceBusca
+            destinos.append(pilha.enter_context(IndiceBusca(args.indice_busca)).atualizar)
+
+        def processar(uuid, resposta):
+            detalhe = resposta.json()
+            for destino in destinos:
+                destino(detalhe)
+
+        if not destinos:
+            processar = None
+        resultado = sincronizador.sincronizar(processar=processar, max_concorrencia=args.concorrencia)
+    _informar("%d novo(s), %d alterado(s), %d falha(s); marca d'água %s.", len(resultado.novos),
+              len(resultado.alterados), len(resultado.falhas), resultado.marca_dagua)
+    return 1 if resultado.falhas else 0
+
+
+def _abrir_cache_condicional(args, pilha):
+    # None deixa o ApiClient usar o cache configurado em CACHE_CONDICIONAL_CAMINHO, se houver.
+    if not args.condicional:
+        return None
+    from API_orcrim.cache import CacheCondicional
+    condicional = CacheCondicional(args.condicional)
+    pilha.callback(condicional.close)
+    return condicional
+
+
+def comando_hidratar(args):
+    import asyncio
+    from API_orcrim.api_client import ApiClient
+    from API_orcrim.async_client import AsyncApiClient
+    from API_orcrim.stream import iter_uuids
+
+    with contextlib.ExitStack() as pilha:
+        cache = None
+        if args.cache:
+            from API_orcrim.cache import CachePersonalidades
+            cache = CachePersonalidades(args.cache)
+            pilha.callback(cache.close)
+        condicional = _abrir_cache_condicional(args, pilha)
+        saida = pilha.enter_context(_abrir_saida(args.saida))
+
+        async def hidratar():
+            detalhados = falhas = 0
+            async with AsyncApiClient(ApiClient(cache=cache, cache_condicional=condicional), max_concorrencia=args.concorrencia) as api:
+                async for uuid, resposta in api.buscar_personalidades(iter_uuids(args.uuids)):
+                    if isinstance(resposta, Exception) or not resposta.ok:
+                        falhas += 1
+                        motivo = resposta if isinstance(resposta, Exception) else f"HTTP {resposta.status_code}"
+                        _informar("Falha ao detalhar %s: %s", uuid, motivo)
+                        continue
+                    saida.write(_linha_json(resposta.json()))
+                    detalhados += 1
+            return detalhados, falhas
+
+        detalhados, falhas = asyncio.run(hidratar())
+    _informar("%d detalhe(s) gravado(s), %d falha(s).", detalhados, falhas)
+    return 1 if falhas else 0
+
+
+def comando_dominios(args):
+    from API_orcrim.api_client import ApiClient
+    from API_orcrim.domain import DomainRegistry
+
+    with contextlib.ExitStack() as pilha:
+        cliente = ApiClient(cache_condicional=_abrir_cache_condicional(args, pilha))
+        contagem = DomainRegistry(cliente=cliente).atualizar(args.tabelas or None, salvar=not args.sem_salvar)
+    for nome, quantidade in contagem.items():
+        _informar("%s: %d registro(s).", nome, quantidade)
+    return 0
+
+
+def comando_criar(args):
+    from API_orcrim.api_client import ApiClient
+    from API_orcrim.stream import iter_registros
+
+    validador = None
+    if args.validar:
+        from API_orcrim.validacao import ValidadorPessoa
+        validador = ValidadorPessoa()
+    api = ApiClient(validador=validador)
+    registros = iter_registros(args.arquivo)
+
+    contagem = {}
+    with contextlib.ExitStack() as pilha:
+        saida = pilha.enter_context(_abrir_saida(args.saida))
+        originais = None
+        if args.deduplicar:
+            from API_orcrim.duplicatas import DetectorDuplicatas, CRIAR
+            detector = DetectorDuplicatas()
+            _informar("%d registro(s) conhecido(s) carregado(s) para a verificação de duplicatas.",
+                      detector.adicionar_varios(_iter_detalhes(args.deduplicar)))
+            originais = []  # posição no envio -> posição no arquivo
+
+            def _a_criar(decisoes):
+                for decisao in decisoes:
+                    if decisao.acao == CRIAR:
+                        originais.append(decisao.indice)
+                        yield decisao.registro
+                        continue
+                    contagem[decisao.acao] = contagem.get(decisao.acao, 0) + 1
+                    saida.write(_linha_json({'indice': decisao.indice, 'situacao': decisao.acao, 'uuid': decisao.uuid,
+                                             'motivo': decisao.motivo, 'pontuacao': decisao.pontuacao,
+                                             'indice_correspondente': decisao.indice_correspondente}))
+
+            registros = _a_criar(detector.classificar(registros))
+        if args.diario:
+            from API_orcrim.carga import CargaRetomavel
+            carga = pilha.enter_context(CargaRetomavel(args.diario, api=api, batch_size=args.lote))
+            resultados = ((r.indice, r.situacao, r.uuid, r.status, r.erro) for r in carga.executar(registros))
+        else:
+            resultados = ((r.indice, 'criado' if r.sucesso else 'falha', r.uuid, r.status, r.erro)
+                          for r in api.post_personalidades(registros, batch_size=args.lote))
+        for indice, situacao, uuid, status, erro in resultados:
+            if originais is not None:
+                indice = originais[indice]
+            contagem[situacao] = contagem.get(situacao, 0) + 1
+            saida.write(_linha_json({'indice': indice, 'situacao': situacao, 'uuid': uuid,
+                                     'status': status, 'erro': erro}))
+    _informar("%s", ', '.join(f"{quantidade} {situacao}" for situacao, quantidade in sorted(contagem.items()))
+              or "Nenhum registro no arquivo.")
+    return 1 if contagem.get('falha') else 0
+
+
+def comando_exportar(args):
+    from API_orcrim.exportacao import ExportadorColunar
+
+    with ExportadorColunar(args.destino, formato=args.formato, linhas_por_arquivo=args.linhas_por_arquivo) as exportador:
+        resumo = exportador.exportar(_iter_detalhes(args.entradas))
+    _informar("%d registro(s) exportado(s) em %d arquivo(s) (%s): %s", resumo.registros, len(resumo.arquivos),
+              exportador.formato, ', '.join(f"{nome}={linhas}" for nome, linhas in resumo.linhas.items()))
+    return 0
+
+
+def comando_indexar(args):
+    from itertools import islice
+    from API_orcrim.busca import IndiceBusca
+
+    detalhes = _iter_detalhes(args.entradas)
+    total = 0
+    with IndiceBusca(args.indice) as indice:
+        while True:
+            quantidade = indice.atualizar_varios(islice(detalhes, 5000))
+            if not quantidade:
+                break
+            total += quantidade
+        _informar("%d personalidade(s) indexada(s); %d no índice.", total, len(indice))
+    return 0
+
+
+def comando_buscar(args):
+    from API_orcrim.busca import IndiceBusca
+
+    with IndiceBusca(args.indice) as indice:
+        resultados = indice.buscar(args.texto, limite=args.limite, campos=args.campo,
+                                   min_pontuacao=args.min_pontuacao)
+    for resultado in resultados:
+        sys.stdout.write(_linha_json(resultado._asdict()))
+    return 0 if resultados else 1
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='python -m API_orcrim',
+                                     description='Ferramentas de linha de comando da API ORCRIM.')
+    parser.add_argument('--log-nivel', help='Nível mínimo do log em arquivo (padrão: LOG_NIVEL de config.settings).')
+    comandos = parser.add_subparsers(dest='comando', required=True, metavar='comando')
+
+    sincronizar = comandos.add_parser('sincronizar', help='Sincroniza a lista de UUIDs de forma incremental.')
+    sincronizar.add_argument('--uuids', default='json/personalidade.json', help='Arquivo da lista de UUIDs.')
+    sincronizar.add_argument('--estado', default='json/sincronizacao.json', help="Arquivo da marca d'água.")
+    sincronizar.add_argument('--detalhes', metavar='ARQUIVO',
+                             help="Anexa o detalhe dos UUIDs novos ou alterados em JSON Lines ('-' para stdout).")
+    sincronizar.add_argument('--indice-busca', metavar='SQLITE', help='Atualiza o índice local de busca com os detalhes.')
+    sincronizar.add_argument('--concorrencia', type=int, default=8, help='Detalhes buscados em paralelo.')
+    sincronizar.set_defaults(funcao=comando_sincronizar)
+
+    hidratar = comandos.add_parser('hidratar', help='Busca o detalhe de cada UUID de um arquivo.')
+    hidratar.add_argument('uuids', nargs='?', default='json/personalidade.json',
+                          help='Arquivo {"data": [{"uuid", "dataAtualizacao"}]}.')
+    hidratar.add_argument('-o', '--saida', default='-', help='Arquivo JSON Lines de saída (padrão: stdout).')
+    hidratar.add_argument('--cache', metavar='SQLITE', help='Cache local de detalhes (CachePersonalidades).')
+    hidratar.add_argument('--concorrencia', type=int, default=16, help='Requisições simultâneas.')
+    hidratar.add_argument('--condicional', metavar='SQLITE',
+                          help='Cache de ETag/Last-Modified: detalhes inalterados voltam como 304, sem corpo.')
+    hidratar.set_defaults(funcao=comando_hidratar)
+
+    dominios = comandos.add_parser('dominios', help='Recarrega as tabelas de domínio da API.')
+    dominios.add_argument('tabelas', nargs='*', help='Tabelas a recarregar (padrão: todas).')
+    dominios.add_argument('--sem-salvar', action='store_true', help='Não regrava os snapshots em jsonBase/1/.')
+    dominios.add_argument('--condicional', metavar='SQLITE',
+                          help='Cache de ETag/Last-Modified: tabelas inalteradas voltam como 304, sem corpo.')
+    dominios.set_defaults(funcao=comando_dominios)
+
+    criar = comandos.add_parser('criar', help='Cria personalidades em lote a partir de um arquivo JSON.')
+    criar.add_argument('arquivo', help='Arquivo {"data": [...]} ou lista de registros.')
+    criar.add_argument('-o', '--saida', default='-', help='Resultados por registro em JSON Lines (padrão: stdout).')
+    criar.add_argument('--diario', metavar='ARQUIVO', help='Diário que torna a carga retomável (CargaRetomavel).')
+    criar.add_argument('--lote', type=int, default=50, help='Registros por requisição.')
+    criar.add_argument('--validar', action='store_true', help='Valida os registros localmente antes do envio.')
+    criar.add_argument('--deduplicar', nargs='+', metavar='DETALHES',
+                       help='Detalhes já conhecidos (JSON Lines ou JSON); registros que já existem neles ou se repetem '
+                            'no arquivo não são enviados e saem com situação "pular" ou "revisar".')
+    criar.set_defaults(funcao=comando_criar)
+
+    exportar = comandos.add_parser('exportar', help='Exporta detalhes para tabelas colunares.')
+    exportar.add_argument('entradas', nargs='+', help="Arquivos .jsonl ('-' para stdin) ou JSON com lista de detalhes.")
+    exportar.add_argument('--destino', default='exportacao', help='Diretório de saída (um subdiretório por tabela).')
+    exportar.add_argument('--formato', choices=('parquet', 'csv'),
+                          help='Formato dos arquivos (padrão: parquet se pyarrow estiver instalado, senão csv).')
+    exportar.add_argument('--linhas-por-arquivo', type=int, default=1000000, help='Linhas por fragmento de tabela.')
+    exportar.set_defaults(funcao=comando_exportar)
+
+    indexar = comandos.add_parser('indexar', help='Inclui detalhes no índice local de busca.')
+    indexar.add_argument('entradas', nargs='+', help="Arquivos .jsonl ('-' para stdin) ou JSON com lista de detalhes.")
+    indexar.add_argument('--indice', default='json/busca_personalidades.sqlite3', help='Arquivo do índice.')
+    indexar.set_defaults(funcao=comando_indexar)
+
+    buscar = comandos.add_parser('buscar', help='Busca aproximada no índice local.')
+    buscar.add_argument('texto', help='Nome, alcunha ou parte deles.')
+    buscar.add_argument('--indice', default='json/busca_personalidades.sqlite3', help='Arquivo do índice.')
+    buscar.add_argument('--limite', type=int, default=10, help='Quantidade máxima de resultados.')
+    buscar.add_argument('--campo', action='append', choices=('nome', 'alcunha', 'nomeMae', 'nomePai'),
+                        help='Restringe a busca ao campo (pode ser repetido).')
+    buscar.add_argument('--min-pontuacao', type=float, default=0.3, help='Pontuação mínima (0 a 1).')
+    buscar.set_defaults(funcao=comando_buscar)
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    from API_orcrim.log import configurar_logging
+    configurar_logging(nivel=args.log_nivel)
+    try:
+        return args.funcao(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # O consumidor do pipe (ex.: head) encerrou; evita o traceback na saída do interpretador.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Any, List
+from API_orcrim.api_client import ApiClient, item_alcunha
+
+logger = logging.getLogger(__name__)
+
+TELEFONES = 'telefones'
+ALCUNHAS = 'alcunhas'
+
+
+class ResultadoEnvio(NamedTuple):
+    """
+    Resultado do envio de um grupo de itens acumulados para uma personalidade.
+
+    Atributos:
+        uuid (str): UUID da personalidade.
+        recurso (str): 'telefones' ou 'alcunhas'.
+        itens (list): Itens enviados na requisição.
+        resposta (Any): Response da requisição, ou a exceção levantada se não houve resposta.
+    """
+    uuid: str
+    recurso: str
+    itens: List[Any]
+    resposta: Any
+
+    @property
+    def sucesso(self):
+        return not isinstance(self.resposta, Exception) and self.resposta.ok
+
+
+class EscritorAgrupado:
+    """
+    Acumula inclusões de telefones e alcunhas por personalidade e envia cada grupo em uma só requisição.
+
+    Os itens são guardados em um buffer por (uuid, recurso). Um buffer é enviado quando atinge
+    max_itens ou quando o item mais antigo nele completa 'intervalo' segundos; uma thread de fundo
+    verifica os prazos. Os envios são feitos em um pool de threads limitado a max_concorrencia.
+    Itens repetidos no mesmo buffer são enviados uma vez só.
+
+    Atributos:
+        cliente (ApiClient): Cliente usado nos envios (post_telefones e post_lista_alcunhas).
+        max_itens (int): Tamanho do buffer que dispara o envio imediato.
+        intervalo (float): Segundos máximos que um item espera no buffer.
+        falhas (list[ResultadoEnvio]): Envios sem resposta ou com resposta de erro.
+
+    Métodos:
+        adicionar_telefone(uuid, telefone): Acumula um telefone para o uuid.
+        adicionar_alcunha(uuid, alcunha, data_alcunha): Acumula uma alcunha para o uuid.
+        descarregar(uuid): Envia imediatamente os buffers (de um uuid ou de todos) e aguarda os envios.
+        close(): Descarrega tudo e encerra a thread de fundo e o pool.
+
+    Exemplo de uso:
+    >>> with EscritorAgrupado(max_itens=50, intervalo=2.0) as escritor:
+    ...     for uuid, telefone in telefones_encontrados:
+    ...         escritor.adicionar_telefone(uuid, telefone)
+    >>> print(len(escritor.falhas))
+    """
+
+    def __init__(self, cliente=None, max_itens=50, intervalo=2.0, max_concorrencia=4, ao_concluir=None):
+        """
+        Parâmetros:
+            cliente (ApiClient): Cliente da API. Se omitido, cria um com as configurações padrão.
+            max_itens (int): Quantidade de itens de um buffer que dispara o envio.
+            intervalo (float): Tempo máximo, em segundos, entre a inclusão de um item e o seu envio.
+            max_concorrencia (int): Envios simultâneos.
+            ao_concluir (callable): Função chamada com o ResultadoEnvio de cada envio.
+        """
+        self.cliente = cliente or ApiClient()
+        self.max_itens = max_itens
+        self.intervalo = intervalo
+        self.ao_concluir = ao_concluir
+        self.falhas = []
+        self._buffers = {}  # (uuid, recurso) -> (instante do primeiro item, dict de itens)
+        self._pendentes = set()
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_concorrencia, thread_name_prefix='orcrim-agrupador')
+        self._thread = threading.Thread(target=self._vigiar, name='orcrim-agrupador-prazos', daemon=True)
+        self._thread.start()
+
+    def adicionar_telefone(self, uuid, telefone):
+        self._adicionar(uuid, TELEFONES, f"{telefone}", telefone)
+
+    def adicionar_alcunha(self, uuid, alcunha, data_alcunha=None):
+        item = item_alcunha((alcunha, data_alcunha))
+        self._adicionar(uuid, ALCUNHAS, (item['alcunha'], item['dataAlcunha']), item)
+
+    def _adicionar(self, uuid, recurso, chave_item, item):
+        if self._parar.is_set():
+            raise RuntimeError("EscritorAgrupado já foi encerrado.")
+        chave = (uuid, recurso)
+        with self._lock:
+            buffer = self._buffers.get(chave)
+            if buffer is None:
+                buffer = self._buffers[chave] = (time.monotonic(), {})
+            buffer[1].setdefault(chave_item, item)
+            cheio = len(buffer[1]) >= self.max_itens
+            if cheio:
+                del self._buffers[chave]
+        if cheio:
+            self._enviar(chave, buffer[1])
+
+    def _enviar(self, chave, itens):
+        futuro = self._executor.submit(self._executar, chave[0], chave[1], list(itens.values()))
+        with self._lock:
+            self._pendentes.add(futuro)
+        futuro.add_done_callback(self._concluido)
+
+    def _concluido(self, futuro):
+        with self._lock:
+            self._pendentes.discard(futuro)
+
+    def _executar(self, uuid, recurso, itens):
+        try:
+            if recurso == TELEFONES:
+                resposta = self.cliente.post_telefones(uuid, itens)
+            else:
+                resposta = self.cliente.post_lista_alcunhas(uuid, itens)
+        except Exception as e:
+            resposta = e
+        resultado = ResultadoEnvio(uuid, recurso, itens, resposta)
+        if not resultado.sucesso:
+            logger.warning("Falha ao enviar %d item(ns) de %s para %s.", len(itens), recurso, uuid)
+            with self._lock:
+                self.falhas.append(resultado)
+        if self.ao_concluir is not None:
+            try:
+                self.ao_concluir(resultado)
+            except Exception:
+                logger.exception("Erro no callback ao_concluir do EscritorAgrupado.")
+        return resultado
+
+    def _vigiar(self):
+        while not self._parar.wait(self.intervalo / 4):
+            limite = time.monotonic() - self.intervalo
+            with self._lock:
+                vencidos = [(chave, itens) for chave, (inicio, itens) in self._buffers.items() if inicio <= limite]
+                for chave, _ in vencidos:
+                    del self._buffers[chave]
+            for chave, itens in vencidos:
+                self._enviar(chave, itens)
+
+    def descarregar(self, uuid=None):
+        """
+        Envia imediatamente os buffers do uuid informado (ou todos) e aguarda a conclusão dos envios em curso.
+        """
+        with self._lock:
+            chaves = [chave for chave in self._buffers if uuid is None or chave[0] == uuid]
+            grupos = [(chave, self._buffers.pop(chave)[1]) for chave in chaves]
+        for chave, itens in grupos:
+            self._enviar(chave, itens)
+        with self._lock:
+            pendentes = list(self._pendentes)
+        for futuro in pendentes:
+            futuro.result()
+
+    def close(self):
+        self._parar.set()
+        self._thread.join()
+        self.descarregar()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
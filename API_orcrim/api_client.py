@@ -1,90 +1,322 @@
+import json
+import time
 import requests
 import logging
-from config.settings import API_BASE_URL
+from typing import NamedTuple, Any, Optional
+from config.settings import API_BASE_URL, LOG_AMOSTRAGEM
+from API_orcrim.cache import obter_cache_condicional_padrao
+from API_orcrim.log import logger_amostrado
 from API_orcrim.token import TokenManager
+from API_orcrim.transport import obter_transporte_padrao, resposta_local
+from API_orcrim.validacao import ErroValidacao
+
+logger = logging.getLogger(__name__)
+# Mensagens emitidas a cada requisição: amostradas para não pesar em cargas em lote.
+_log_requisicoes = logger_amostrado(f'{__name__}.requisicoes', LOG_AMOSTRAGEM)
+
+# Respostas que rejeitam o conteúdo do lote: dividindo-o, os registros válidos ainda são criados.
+STATUS_DIVIDIR_LOTE = frozenset({400, 422})
+
+class ResultadoRegistro(NamedTuple):
+    """
+    Resultado do envio de um registro em uma carga em lote.
+
+    Atributos:
+        indice (int): Posição do registro no iterável de entrada.
+        registro (Any): Objeto recebido (Pessoa ou dicionário).
+        sucesso (bool): Indica se o registro foi aceito pela API.
+        uuid (str): UUID atribuído pela API, quando informado na resposta.
+        status (int): Código HTTP da resposta do lote que decidiu o resultado (None se não houve resposta).
+        erro (str): Descrição do erro, quando houver.
+    """
+    indice: int
+    registro: Any
+    sucesso: bool
+    uuid: Optional[str] = None
+    status: Optional[int] = None
+    erro: Optional[str] = None
 
-# Configuração básica do logging
-logging.basicConfig(level=logging.INFO,
-                    filename='app.log',  # Nome do arquivo de log
-                    filemode='a',  # Modo 'a' append adiciona ao arquivo existente
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 class ApiClient:
-    def __init__(self):
+    def __init__(self, transporte=None, base_url=None, token_manager=None, cache=None, indice=None, validador=None,
+                 cache_condicional=None):
         """
         Inicializa o cliente da API usando a URL base definida no arquivo de configuração.
+
+        Parâmetros:
+            transporte (HttpTransport): Transporte HTTP com conexões persistentes. Se omitido,
+                usa o transporte compartilhado pelo processo.
+            base_url (str): URL base da API. Se omitida, usa API_BASE_URL.
+            token_manager (TokenManager): Gerenciador de tokens. Se omitido, cria um com as
+                credenciais padrão (o cache do token é compartilhado entre instâncias).
+            cache (CachePersonalidades): Cache local de detalhes usado por get_personalidade.
+            indice (IndiceAtualizacao): Índice uuid -> dataAtualizacao consultado por
+                get_personalidade quando a data não é informada, para validar o cache.
+            validador (ValidadorPessoa): Se informado, os corpos são validados antes do envio;
+                registros inválidos não chegam à rede (veja validacao.ValidadorPessoa).
+            cache_condicional (CacheCondicional): ETag/Last-Modified e corpos usados em GETs
+                condicionais de detalhes e tabelas de domínio. Se omitido, usa o cache compartilhado
+                configurado em CACHE_CONDICIONAL_CAMINHO (se houver); False desativa.
         """
-        self.base_url = API_BASE_URL
+        self.base_url = base_url or API_BASE_URL
         self.token = None
+        self.token_manager = token_manager or TokenManager(transporte=transporte)
+        self.transporte = transporte or obter_transporte_padrao()
+        self.cache = cache
+        self.indice = indice
+        self.validador = validador
+        if cache_condicional is None:
+            cache_condicional = obter_cache_condicional_padrao()
+        self.cache_condicional = None if cache_condicional is False else cache_condicional
+
+    def _validar(self, violacoes):
+        if violacoes:
+            raise ErroValidacao(violacoes)
+
+    def _enviar(self, metodo, url, mensagem_sucesso, *args_mensagem, **kwargs):
+        """
+        Obtém o token, executa a requisição pelo transporte compartilhado e registra o resultado no log.
+
+        O cabeçalho Authorization é acrescentado aqui, e o tempo gasto esperando o TokenManager é
+        repassado ao transporte para compor a medição da requisição. Se a API recusar o token
+        (401), ele é invalidado no TokenManager e a requisição é repetida uma vez com um novo.
+
+        Parâmetros:
+            metodo (str): Método HTTP ('GET' ou 'POST').
+            url (str): URL completa da requisição.
+            mensagem_sucesso (str): Mensagem registrada quando a resposta não é um erro HTTP, com
+                marcadores %s preenchidos por args_mensagem.
+            **kwargs: Argumentos repassados ao transporte (headers, json...).
+
+        Retorna:
+            response: objeto resposta da requisição, inclusive para respostas 4xx/5xx.
+
+        Levanta:
+            requests.RequestException: Se não houver resposta (falha de conexão, timeout...).
+        """
+        inicio = time.perf_counter()
+        token_de_autorizacao = self.token_manager.get_access_token()
+        espera_token = time.perf_counter() - inicio
+        headers = kwargs.pop('headers', {})
+        try:
+            response = self.transporte.request(
+                metodo, url, espera_token=espera_token,
+                headers={**headers, 'Authorization': f'Bearer {token_de_autorizacao}'}, **kwargs)
+            if response.status_code == 401:
+                # Token revogado ou expirado antes do previsto: a requisição não foi processada.
+                inicio = time.perf_counter()
+                token_de_autorizacao = self.token_manager.invalidar(token_de_autorizacao)
+                espera_token = time.perf_counter() - inicio
+                response = self.transporte.request(
+                    metodo, url, espera_token=espera_token,
+                    headers={**headers, 'Authorization': f'Bearer {token_de_autorizacao}'}, **kwargs)
+        except requests.RequestException as e:
+            logger.error("Erro ao fazer a requisição %s: %s", metodo, e)
+            raise
+
+        try:
+            response.raise_for_status()  # Isso vai levantar uma exceção para respostas 4xx/5xx
+            _log_requisicoes.info(mensagem_sucesso, *args_mensagem)
+        except requests.HTTPError as http_err:
+            logger.error("Erro HTTP ao fazer a requisição %s: %s", metodo, http_err)
+        return response
+
+    def _get_condicional(self, url, mensagem_sucesso, *args_mensagem, headers):
+        """
+        GET com If-None-Match/If-Modified-Since quando há validadores guardados para a URL.
+
+        Uma resposta 304 é convertida na resposta 200 guardada, com o cabeçalho 'X-Cache: REVALIDATED';
+        respostas 200 com ETag ou Last-Modified atualizam o cache condicional.
+        """
+        condicional = self.cache_condicional
+        if condicional is None:
+            return self._enviar('GET', url, mensagem_sucesso, *args_mensagem, headers=headers)
+        response = self._enviar('GET', url, mensagem_sucesso, *args_mensagem,
+                                headers={**headers, **condicional.cabecalhos(url)})
+        if response.status_code == 304:
+            corpo = condicional.corpo(url)
+            if corpo is not None:
+                return resposta_local(url, corpo, headers={'X-Cache': 'REVALIDATED',
+                                                           **{nome: response.headers[nome]
+                                                              for nome in ('ETag', 'Last-Modified')
+                                                              if nome in response.headers}})
+            # O corpo saiu do cache entre a consulta e a resposta: pede a versão completa.
+            response = self._enviar('GET', url, mensagem_sucesso, *args_mensagem, headers=headers)
+        if response.status_code == 200:
+            condicional.gravar(url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                               response.content)
+        return response
 
     def post_personalidade(self, personalidade_data):
         """
         Envia uma requisição POST para criar uma nova personalidade no sistema.
 
         Parâmetros:
-            personalidade_data (dict): Um dicionário contendo os dados da personalidade.
+            personalidade_data (dict, bytes): Um dicionário contendo os dados da personalidade, ou o
+                corpo JSON já serializado (ex.: Pessoa.to_json_bytes()).
 
         Retorna:
             response: objeto resposta da requisição, possui métodos para serem manipulados
+
+        Levanta:
+            ErroValidacao: Se o cliente tiver um validador e o dicionário não passar nele.
         """
 
         url = f"{self.base_url}/api/v1/personalidade"
-        token_de_autorizacao = TokenManager().get_access_token()
+        if self.validador is not None and isinstance(personalidade_data, dict):
+            self._validar(self.validador.validar_lote(personalidade_data))
         dados_json = personalidade_data
+        if isinstance(dados_json, str):
+            dados_json = dados_json.encode('utf-8')
+        corpo = {'data': dados_json} if isinstance(dados_json, bytes) else {'json': dados_json}
         headers = {
         'accept': 'application/json',
-        'Authorization': f'Bearer {token_de_autorizacao}',
         'Content-Type': 'application/json'
         }
 
-        logging.info(f"Iniciando requisição POST para {url}")
+        _log_requisicoes.info("Iniciando requisição POST para %s", url)
 
-        try:
-            response = requests.post(url, headers=headers, json=dados_json)
-            response.raise_for_status()  # Isso vai levantar uma exceção para respostas 4xx/5xx
-            logging.info("Personalidade incluída com sucesso.")
-            return response  # Retorna a resposta JSON da API
-        except requests.HTTPError as http_err:
-            logging.error(f"Erro HTTP ao fazer a requisição POST: {http_err}")
-        except Exception as e:
-            logging.error(f"Erro ao fazer a requisição POST: {e}")
-        return response
+        return self._enviar('POST', url, "Personalidade incluída com sucesso.", headers=headers, **corpo)
 
 
-    def get_personalidade(self, uuid=None):
+    def post_personalidades(self, pessoas, batch_size=50):
+        """
+        Cria várias personalidades agrupando-as em lotes, um POST por lote.
+
+        O iterável é consumido sob demanda e cada lote é enviado assim que fica completo, de modo
+        que cargas muito grandes não precisam estar inteiras em memória. Se a API rejeitar o conteúdo
+        de um lote (400 ou 422), ele é dividido ao meio e reenviado até isolar os registros inválidos;
+        assim um registro ruim não derruba os demais. Outros erros (403, 429, 5xx...) não dependem
+        dos registros e valem para o lote inteiro, sem novas tentativas. Se o cliente tiver um validador, registros inválidos
+        são reportados como falha (status None) sem serem enviados.
+
+        Parâmetros:
+            pessoas (iterable): Objetos Pessoa (ou dicionários já no formato de um item de "data").
+            batch_size (int): Quantidade máxima de registros por requisição.
+
+        Retorna:
+            generator: Um ResultadoRegistro por registro de entrada, na ordem de conclusão dos lotes.
+        """
+        lote = []
+        for indice, pessoa in enumerate(pessoas):
+            if self.validador is not None:
+                problemas = self.validador.validar(pessoa)
+                if problemas:
+                    yield ResultadoRegistro(indice, pessoa, False,
+                                            erro='; '.join(f"{campo}: {mensagem}" for campo, mensagem in problemas))
+                    continue
+            lote.append((indice, pessoa))
+            if len(lote) >= batch_size:
+                yield from self._post_lote(lote)
+                lote = []
+        if lote:
+            yield from self._post_lote(lote)
+
+    def _post_lote(self, lote):
+        """
+        Envia um lote de personalidades e devolve o resultado de cada registro.
+
+        Parâmetros:
+            lote (list): Lista de tuplas (indice, pessoa).
+
+        Retorna:
+            list[ResultadoRegistro]: Resultado de cada registro do lote.
+        """
+        # Pessoas são serializadas pelo caminho rápido (to_registro_json); dicionários via json.
+        registros = [p.to_registro_json() if hasattr(p, 'to_registro_json') else json.dumps(p, ensure_ascii=False)
+                     for _, p in lote]
+        _log_requisicoes.info("Enviando lote de %d personalidade(s).", len(lote))
+
+        try:
+            response = self.post_personalidade(('{"data":[' + ','.join(registros) + ']}').encode('utf-8'))
+        except requests.RequestException as e:
+            return [ResultadoRegistro(i, p, False, erro=str(e)) for i, p in lote]
+
+        if response.ok:
+            try:
+                criados = response.json().get('data') or []
+            except ValueError:
+                criados = []
+            if len(criados) != len(lote):
+                # Sem correspondência um para um, não é possível atribuir os UUIDs.
+                criados = [{}] * len(lote)
+            return [ResultadoRegistro(i, p, True, uuid=c.get('uuid'), status=response.status_code)
+                    for (i, p), c in zip(lote, criados)]
+
+        if response.status_code in STATUS_DIVIDIR_LOTE and len(lote) > 1:
+            meio = len(lote) // 2
+            return self._post_lote(lote[:meio]) + self._post_lote(lote[meio:])
+
+        return [ResultadoRegistro(i, p, False, status=response.status_code, erro=response.text)
+                for i, p in lote]
+
+    def get_personalidade(self, uuid=None, data_atualizacao=None):
 
         """
         Envia uma requisição GET para obter informações de um uuid.
 
+        Se o cliente tiver um cache, a resposta armazenada é devolvida sem ir à rede quando a
+        dataAtualizacao informada coincide com a guardada. Sem data informada, ela é buscada no
+        índice do cliente, se houver; se continuar desconhecida, o cache não é lido nem gravado.
+        Respostas servidas pelo cache trazem o cabeçalho 'X-Cache: HIT'. Nas que vão à rede, com
+        cache condicional, um detalhe inalterado volta como 304 e é servido com 'X-Cache: REVALIDATED'.
+
         Parâmetros:
             uuid (str): Uma string com o valor do uuid a ser consultado.
+            data_atualizacao (str): dataAtualizacao conhecida do uuid (lista de UUIDs), usada para
+                validar o cache.
 
         Retorna:
             response: objeto resposta da requisição, possui métodos para serem manipulados
         """
 
-        logging.info(f"Iniciando requisição GET de personalidade, uuid: {uuid}")
-
         url = f"{self.base_url}/api/v1/personalidade/{uuid}"
-        token_de_autorizacao = TokenManager().get_access_token()
+
+        if self.cache is not None and data_atualizacao is None and self.indice is not None:
+            data_atualizacao = self.indice.obter(uuid)
+        # Sem dataAtualizacao não há como saber se o corpo guardado ainda vale: nem lê nem grava.
+        usar_cache = self.cache is not None and data_atualizacao is not None
+        if usar_cache:
+            corpo = self.cache.obter(uuid, data_atualizacao)
+            if corpo is not None:
+                return resposta_local(url, corpo, headers={'X-Cache': 'HIT'})
+
+        _log_requisicoes.info("Iniciando requisição GET de personalidade, uuid: %s", uuid)
 
         headers = {
-        'accept': 'application/json',
-        'Authorization': f'Bearer {token_de_autorizacao}'
+        'accept': 'application/json'
         }
 
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Isso vai levantar uma exceção para respostas 4xx/5xx
-            logging.info("Personalidade incluída com sucesso.")
-            return response  # Retorna a resposta JSON da API
-        except requests.HTTPError as http_err:
-            logging.error(f"Erro HTTP ao fazer a requisição POST: {http_err}")
-        except Exception as e:
-            logging.error(f"Erro ao fazer a requisição POST: {e}")
+        response = self._get_condicional(url, "Personalidade obtida com sucesso.", headers=headers)
+        if usar_cache and response.ok:
+            self.cache.gravar(uuid, data_atualizacao, response.content)
         return response
     
 
+    def get_dominio(self, endpoint):
+
+        """
+        Envia uma requisição GET para uma tabela de domínio (ex.: '/ufs', '/municipios').
+
+        Com cache condicional, uma tabela inalterada volta como 304 e é servida com 'X-Cache: REVALIDATED'.
+
+        Parâmetros:
+            endpoint (str): Caminho da tabela a partir de /api/v1.
+
+        Retorna:
+            response: objeto resposta da requisição, possui métodos para serem manipulados
+        """
+
+        url = f"{self.base_url}/api/v1{endpoint}"
+        headers = {
+        'accept': 'application/json'
+        }
+
+        logger.info("Iniciando requisição GET da tabela de domínio %s", endpoint)
+
+        return self._get_condicional(url, "Tabela de domínio %s obtida com sucesso.", endpoint, headers=headers)
+    
+
     def post_telefone(self, uuid=None, telefone=None):
 
         """
@@ -97,32 +329,41 @@ class ApiClient:
         Retorna:
             response: objeto resposta da requisição, possui métodos para serem manipulados
         """
-        
+
+        return self.post_telefones(uuid, [telefone])
+
+
+    def post_telefones(self, uuid=None, telefones=()):
+
+        """
+        Envia uma única requisição POST inserindo vários telefones ao uuid.
+
+        Parâmetros:
+            uuid (str): Uma string com o UUID da personalidade.
+            telefones (iterable): Números de telefone (str ou int) a serem inseridos.
+
+        Retorna:
+            response: objeto resposta da requisição, possui métodos para serem manipulados
+
+        Levanta:
+            ErroValidacao: Se o cliente tiver um validador e algum item não passar nele.
+        """
 
         url = f"{self.base_url}/api/v1/personalidade/{uuid}/telefones"
-        token_de_autorizacao = TokenManager().get_access_token()
 
-        dados_json = {"data": [{"telefone": f"{telefone}"}]}
+        dados_json = {"data": [{"telefone": f"{telefone}"} for telefone in telefones]}
+        if self.validador is not None:
+            self._validar(self.validador.validar_telefones(dados_json))
 
         headers = {
         'accept': 'application/json',
-        'Authorization': f'Bearer {token_de_autorizacao}',
         'Content-Type': 'application/json'
         }
 
-        logging.info(f"Iniciando POST de telefone para {uuid}")
+        _log_requisicoes.info("Iniciando POST de %d telefone(s) para %s", len(dados_json["data"]), uuid)
+
+        return self._enviar('POST', url, "Telefone(s) incluído(s) com sucesso.", headers=headers, json=dados_json)
 
-        try:
-            response = requests.post(url, headers=headers, json=dados_json)
-            response.raise_for_status()  # Isso vai levantar uma exceção para respostas 4xx/5xx
-            logging.info("Telefone incluído com sucesso.")
-            return response  # Retorna a resposta JSON da API
-        except requests.HTTPError as http_err:
-            logging.error(f"Erro HTTP ao fazer a requisição POST: {http_err}")
-        except Exception as e:
-            logging.error(f"Erro ao fazer a requisição POST: {e}")
-        return response
-    
 
     def post_alcunhas(self, uuid=None, alcunha=None, data_alcunha=None):
 
@@ -131,34 +372,57 @@ class ApiClient:
 
         Parâmetros:
             uuid (str): Uma string com o UUID da personalidade.
-            telefone (str): Uma string com a alcunha a ser inserida
+            alcunha (str): Uma string com a alcunha a ser inserida
+            data_alcunha (str): Data da alcunha no formato 'DD/MM/AAAA' (vazia se omitida).
 
         Retorna:
             response: objeto resposta da requisição, possui métodos para serem manipulados
         """
-        
+
+        return self.post_lista_alcunhas(uuid, [(alcunha, data_alcunha)])
+
+
+    def post_lista_alcunhas(self, uuid=None, alcunhas=()):
+
+        """
+        Envia uma única requisição POST inserindo várias alcunhas ao uuid.
+
+        Parâmetros:
+            uuid (str): Uma string com o UUID da personalidade.
+            alcunhas (iterable): Alcunhas a serem inseridas. Cada item pode ser a alcunha (str), uma
+                tupla (alcunha, data_alcunha) ou um dicionário {"alcunha": ..., "dataAlcunha": ...}.
+
+        Retorna:
+            response: objeto resposta da requisição, possui métodos para serem manipulados
+
+        Levanta:
+            ErroValidacao: Se o cliente tiver um validador e algum item não passar nele.
+        """
 
         url = f"{self.base_url}/api/v1/personalidade/{uuid}/alcunhas"
-        token_de_autorizacao = TokenManager().get_access_token()
 
-        dados_json = {"data": [{"alcunha": f"{alcunha}"}, {"dataAlcunha": ""}]}
+        dados_json = {"data": [item_alcunha(alcunha) for alcunha in alcunhas]}
+        if self.validador is not None:
+            self._validar(self.validador.validar_alcunhas(dados_json))
 
         headers = {
         'accept': 'application/json',
-        'Authorization': f'Bearer {token_de_autorizacao}',
         'Content-Type': 'application/json'
         }
 
-        logging.info(f"Iniciando POST de alcunha para {uuid}")
+        _log_requisicoes.info("Iniciando POST de %d alcunha(s) para %s", len(dados_json["data"]), uuid)
+
+        return self._enviar('POST', url, "Alcunha(s) incluída(s) com sucesso.", headers=headers, json=dados_json)
 
-        try:
-            response = requests.post(url, headers=headers, json=dados_json)
-            response.raise_for_status()  # Isso vai levantar uma exceção para respostas 4xx/5xx
-            logging.info("Alcunha incluída com sucesso.")
-            return response  # Retorna a resposta JSON da API
-        except requests.HTTPError as http_err:
-            logging.error(f"Erro HTTP ao fazer a requisição POST: {http_err}")
-        except Exception as e:
-            logging.error(f"Erro ao fazer a requisição POST: {e}")
-        return response
 
+def item_alcunha(alcunha):
+    """
+    Converte uma alcunha (str, tupla (alcunha, data) ou dicionário) no item enviado em "data".
+    """
+    if isinstance(alcunha, dict):
+        alcunha, data_alcunha = alcunha.get('alcunha'), alcunha.get('dataAlcunha')
+    elif isinstance(alcunha, (tuple, list)):
+        alcunha, data_alcunha = alcunha
+    else:
+        data_alcunha = None
+    return {"alcunha": f"{alcunha}", "dataAlcunha": data_alcunha or ""}
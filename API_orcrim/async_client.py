@@ -0,0 +1,130 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from API_orcrim.api_client import ApiClient
+
+
+class AsyncApiClient:
+    """
+    Versão assíncrona do ApiClient, com os mesmos métodos expostos como corrotinas.
+
+    Cada chamada é executada no ApiClient síncrono dentro de um pool de threads limitado a
+    max_concorrencia, de modo que token compartilhado, conexões keep-alive e demais
+    comportamentos do cliente síncrono valem também aqui. O número de requisições em voo
+    nunca passa de max_concorrencia.
+
+    Para conexões realmente reaproveitadas, o pool_maxsize do transporte (HTTP_POOL_MAXSIZE)
+    deve ser maior ou igual a max_concorrencia.
+
+    Atributos:
+        cliente (ApiClient): Cliente síncrono usado para executar as requisições.
+        max_concorrencia (int): Limite de requisições simultâneas.
+
+    Métodos:
+        get_personalidade(uuid): Corrotina equivalente a ApiClient.get_personalidade.
+        post_personalidade(personalidade_data): Corrotina equivalente a ApiClient.post_personalidade.
+        post_telefone(uuid, telefone): Corrotina equivalente a ApiClient.post_telefone.
+        post_telefones(uuid, telefones): Corrotina equivalente a ApiClient.post_telefones.
+        post_alcunhas(uuid, alcunha, data_alcunha): Corrotina equivalente a ApiClient.post_alcunhas.
+        post_lista_alcunhas(uuid, alcunhas): Corrotina equivalente a ApiClient.post_lista_alcunhas.
+        buscar_personalidades(uuids): Gerador assíncrono que devolve os detalhes conforme ficam prontos.
+        aclose(): Encerra o pool de threads sem bloquear o laço de eventos (usado por 'async with').
+        close(): Encerra o pool de threads, bloqueando até as requisições em voo terminarem.
+
+    Exemplo de uso:
+    >>> async def main():
+    ...     async with AsyncApiClient(max_concorrencia=32) as api:
+    ...         async for uuid, resposta in api.buscar_personalidades(iter_uuids('personalidades.json')):
+    ...             print(uuid, resposta.status_code)
+    >>> asyncio.run(main())
+    """
+
+    def __init__(self, cliente=None, max_concorrencia=16, **kwargs):
+        """
+        Inicializa o cliente assíncrono.
+
+        Parâmetros:
+            cliente (ApiClient): Cliente síncrono a ser usado. Se omitido, cria um ApiClient
+                repassando os demais argumentos nomeados (transporte, base_url, token_manager).
+            max_concorrencia (int): Número máximo de requisições simultâneas.
+        """
+        self.cliente = cliente or ApiClient(**kwargs)
+        self.max_concorrencia = max_concorrencia
+        self._executor = ThreadPoolExecutor(max_workers=max_concorrencia, thread_name_prefix='orcrim-async')
+
+    async def _executar(self, funcao, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(funcao, *args, **kwargs))
+
+    async def get_personalidade(self, uuid=None, data_atualizacao=None):
+        return await self._executar(self.cliente.get_personalidade, uuid, data_atualizacao)
+
+    async def post_personalidade(self, personalidade_data):
+        return await self._executar(self.cliente.post_personalidade, personalidade_data)
+
+    async def post_telefone(self, uuid=None, telefone=None):
+        return await self._executar(self.cliente.post_telefone, uuid, telefone)
+
+    async def post_alcunhas(self, uuid=None, alcunha=None, data_alcunha=None):
+        return await self._executar(self.cliente.post_alcunhas, uuid, alcunha, data_alcunha)
+
+    async def post_telefones(self, uuid=None, telefones=()):
+        return await self._executar(self.cliente.post_telefones, uuid, telefones)
+
+    async def post_lista_alcunhas(self, uuid=None, alcunhas=()):
+        return await self._executar(self.cliente.post_lista_alcunhas, uuid, alcunhas)
+
+    async def _buscar_um(self, item):
+        uuid, data_atualizacao = item if isinstance(item, tuple) else (item, None)
+        try:
+            return uuid, await self.get_personalidade(uuid, data_atualizacao)
+        except Exception as e:
+            return uuid, e
+
+    async def buscar_personalidades(self, uuids):
+        """
+        Busca os detalhes de vários UUIDs, devolvendo cada resultado assim que fica pronto.
+
+        Os UUIDs são consumidos do iterável sob demanda, mantendo no máximo o dobro de
+        max_concorrencia tarefas pendentes; iteráveis muito grandes (ou geradores) não são
+        carregados inteiros em memória.
+
+        Parâmetros:
+            uuids (iterable): Iterável de UUIDs (str) ou de tuplas (uuid, dataAtualizacao), como as
+                geradas por stream.iter_uuids; a data é repassada para validar o cache do cliente.
+
+        Retorna:
+            async generator: Tuplas (uuid, resultado), em ordem de conclusão. O resultado é o
+            response da requisição ou, se ela falhou sem resposta, a exceção levantada.
+        """
+        iterador = iter(uuids)
+        limite = 2 * self.max_concorrencia
+        pendentes = set()
+
+        def agendar():
+            while len(pendentes) < limite:
+                item = next(iterador, None)
+                if item is None:
+                    return
+                pendentes.add(asyncio.ensure_future(self._buscar_um(item)))
+
+        agendar()
+        while pendentes:
+            concluidas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+            for tarefa in concluidas:
+                yield tarefa.result()
+            agendar()
+
+    async def aclose(self):
+        # shutdown(wait=True) espera as requisições em voo; fora do laço, as demais tarefas seguem.
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
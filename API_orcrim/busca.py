@@ -0,0 +1,354 @@
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import logging
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import NamedTuple
+from API_orcrim.domain import normalizar
+
+logger = logging.getLogger(__name__)
+
+CAMPOS = ('nome', 'alcunha', 'nomeMae', 'nomePai')
+
+_NAO_ALFANUMERICO = re.compile(r'[^0-9A-Z ]+')
+_VAZIA = array('I')
+
+
+class ResultadoBusca(NamedTuple):
+    """
+    Personalidade encontrada por IndiceBusca.buscar.
+
+    Atributos:
+        uuid (str): UUID da personalidade.
+        pontuacao (float): Semelhança entre 0 e 1 (1 = correspondência exata).
+        campo (str): Campo em que a melhor correspondência foi encontrada ('nome', 'alcunha', 'nomeMae' ou 'nomePai').
+        texto (str): Valor original do campo correspondente.
+        nome (str): Nome da personalidade.
+    """
+    uuid: str
+    pontuacao: float
+    campo: str
+    texto: str
+    nome: str
+
+
+def normalizar_busca(texto):
+    """
+    Normaliza um texto para busca: sem acentos, em maiúsculas, sem pontuação e com espaços simples.
+    """
+    return ' '.join(_NAO_ALFANUMERICO.sub(' ', normalizar(texto)).split())
+
+
+def trigramas(texto_normalizado):
+    """
+    Retorna o conjunto de trigramas de um texto normalizado.
+
+    Como no pg_trgm, cada palavra é completada com dois espaços à esquerda e um à direita, de modo
+    que o início das palavras pesa mais que o meio ('  J', ' JO', 'JOA', 'OAO', 'AO ').
+    """
+    resultado = set()
+    for palavra in texto_normalizado.split():
+        palavra = f'  {palavra} '
+        resultado.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return resultado
+
+
+def extrair_termos(detalhe):
+    """
+    Extrai os termos indexados do detalhe de uma personalidade (resposta do GET ou dadosPessoais).
+
+    Retorna:
+        tuple: (uuid, nome, termos), em que termos é uma lista de [campo, texto, texto normalizado]
+        para nome, nomeMae, nomePai e cada alcunha, sem vazios nem repetidos.
+    """
+    pessoais = detalhe.get('dadosPessoais', detalhe)
+    valores = [('nome', pessoais.get('nome')), ('nomeMae', pessoais.get('nomeMae')),
+               ('nomePai', pessoais.get('nomePai'))]
+    valores.extend(('alcunha', a.get('alcunha') if isinstance(a, dict) else a) for a in pessoais.get('alcunhas') or ())
+    termos = {}
+    for campo, texto in valores:
+        normalizado = normalizar_busca(texto) if texto else ''
+        if normalizado:
+            termos.setdefault((campo, normalizado), [campo, texto, normalizado])
+    return pessoais.get('uuid'), pessoais.get('nome') or '', list(termos.values())
+
+
+class IndiceBusca:
+    """
+    Índice local de busca aproximada por nome, alcunhas, nome da mãe e nome do pai.
+
+    Os campos de cada personalidade ficam em uma tabela SQLite (fonte persistente) e são
+    indexados em memória em dois níveis: um vocabulário com as palavras distintas, indexado por
+    trigramas, e um índice invertido palavra -> termos (cada valor de campo é um termo). A busca
+    normaliza acentos, caixa e pontuação, encontra no vocabulário as palavras parecidas com cada
+    palavra da consulta (parciais como 'NANDI' ou com erros como 'NACIMENTO') e ordena os termos
+    que as contêm pela semelhança com a consulta inteira. Como o vocabulário de nomes é muito
+    menor que a quantidade de termos, a parte aproximada da busca não depende do tamanho da base.
+
+    A atualização é incremental: atualizar() substitui os campos de uma personalidade sem
+    reconstruir o índice, e processar(uuid, resposta) pode ser usado diretamente como callback de
+    SincronizadorIncremental.sincronizar. A instância pode ser compartilhada entre threads.
+
+    Atributos:
+        caminho (str): Arquivo SQLite do índice.
+
+    Métodos:
+        buscar(texto, limite, campos, min_pontuacao): Personalidades mais semelhantes ao texto.
+        atualizar(detalhe) / atualizar_varios(detalhes): Inclui ou substitui personalidades.
+        processar(uuid, resposta): Callback para SincronizadorIncremental.
+        remover(uuid): Retira uma personalidade do índice.
+
+    Exemplo de uso:
+    >>> indice = IndiceBusca('json/busca_personalidades.sqlite3')
+    >>> SincronizadorIncremental().sincronizar(processar=indice.processar)
+    >>> indice.buscar('nandinho', limite=5)
+    [ResultadoBusca(uuid='d72c5a7f-...', pontuacao=1.0, campo='alcunha', texto='NANDINHO', nome='ADRIANO BRAGA DO NASCIMENTO')]
+    """
+
+    # Semelhança mínima para uma palavra do vocabulário contar como correspondência de uma palavra da consulta.
+    MIN_SEMELHANCA_PALAVRA = 0.5
+    MAX_PALAVRAS_SEMELHANTES = 20
+    # Máximo de postagens percorridas por consulta. Consultas genéricas ('SILVA', 'MARIA') não percorrem o
+    # índice inteiro: as listas mais comuns são cortadas e só parte dos termos que as contêm é avaliada.
+    ORCAMENTO_POSTAGENS = 50000
+    MAX_CANDIDATOS = 2000
+
+    def __init__(self, caminho='json/busca_personalidades.sqlite3'):
+        """
+        Parâmetros:
+            caminho (str): Arquivo SQLite do índice (criado se não existir). O índice em memória é
+                montado a partir dele na abertura.
+        """
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.execute('CREATE TABLE IF NOT EXISTS personalidades ('
+                              'uuid TEXT PRIMARY KEY, nome TEXT, termos TEXT) WITHOUT ROWID')
+        self._carregar()
+        logger.info("Índice de busca %s carregado: %d personalidade(s), %d palavra(s).", caminho,
+                    len(self._registros), len(self._vocabulario))
+
+    def _carregar(self):
+        """
+        Monta o índice em memória a partir da tabela SQLite (os textos já estão normalizados nela).
+        """
+        self._registros = {}           # uuid -> (nome, lista de ids de termos)
+        self._vocabulario = {}         # palavra -> id da palavra
+        self._palavras = []            # id da palavra -> palavra
+        self._termos_da_palavra = []   # id da palavra -> array de ids de termos, em ordem crescente
+        self._trigramas = {}           # trigrama -> array de ids de palavras
+        self._termo_uuid = []          # id do termo -> uuid (None se removido)
+        self._termo_campo = []         # id do termo -> campo
+        self._termo_texto = []         # id do termo -> texto original
+        self._termo_palavras = []      # id do termo -> tupla de ids de palavras
+        self._removidos = 0
+        for uuid, nome, termos in self._conexao.execute('SELECT uuid, nome, termos FROM personalidades'):
+            self._indexar(uuid, nome, json.loads(termos))
+
+    def _nova_palavra(self, palavra):
+        id_ = self._vocabulario[palavra] = len(self._palavras)
+        self._palavras.append(palavra)
+        self._termos_da_palavra.append(array('I'))
+        for trigrama in trigramas(palavra):
+            lista = self._trigramas.get(trigrama)
+            if lista is None:
+                lista = self._trigramas[trigrama] = array('I')
+            lista.append(id_)
+        return id_
+
+    def _indexar(self, uuid, nome, termos):
+        vocabulario = self._vocabulario
+        termos_da_palavra = self._termos_da_palavra
+        ids = []
+        for campo, texto, normalizado in termos:
+            id_ = len(self._termo_uuid)
+            palavras = []
+            for palavra in normalizado.split():
+                id_palavra = vocabulario.get(palavra)
+                if id_palavra is None:
+                    id_palavra = self._nova_palavra(palavra)
+                if id_palavra not in palavras:
+                    palavras.append(id_palavra)
+                    termos_da_palavra[id_palavra].append(id_)
+            self._termo_uuid.append(uuid)
+            self._termo_campo.append(campo)
+            self._termo_texto.append(texto)
+            self._termo_palavras.append(tuple(palavras))
+            ids.append(id_)
+        self._registros[uuid] = (nome, ids)
+
+    def _desindexar(self, uuid):
+        registro = self._registros.pop(uuid, None)
+        if registro is None:
+            return
+        for id_ in registro[1]:
+            # As postagens do termo ficam no índice e são ignoradas na busca até a próxima compactação.
+            self._termo_uuid[id_] = None
+            self._removidos += 1
+
+    def _compactar_se_necessario(self):
+        if self._removidos > max(1000, len(self._termo_uuid) // 4):
+            self._carregar()
+
+    def atualizar_varios(self, detalhes):
+        """
+        Inclui ou substitui várias personalidades, gravando-as em uma única transação.
+
+        Parâmetros:
+            detalhes (iterable): Detalhes de personalidades (resposta do GET, dadosPessoais, ou o JSON em str/bytes).
+
+        Retorna:
+            int: Quantidade de personalidades indexadas.
+        """
+        linhas = []
+        for detalhe in detalhes:
+            if isinstance(detalhe, (str, bytes)):
+                detalhe = json.loads(detalhe)
+            uuid, nome, termos = extrair_termos(detalhe)
+            if not uuid:
+                logger.warning("Detalhe sem uuid ignorado pelo índice de busca.")
+                continue
+            linhas.append((uuid, nome, termos))
+        with self._lock:
+            self._conexao.execute('BEGIN')
+            try:
+                self._conexao.executemany('INSERT OR REPLACE INTO personalidades VALUES (?, ?, ?)',
+                                          [(uuid, nome, json.dumps(termos, ensure_ascii=False))
+                                           for uuid, nome, termos in linhas])
+                self._conexao.execute('COMMIT')
+            except BaseException:
+                self._conexao.execute('ROLLBACK')
+                raise
+            for linha in linhas:
+                self._desindexar(linha[0])
+                self._indexar(*linha)
+            self._compactar_se_necessario()
+        return len(linhas)
+
+    def atualizar(self, detalhe):
+        """
+        Inclui ou substitui uma personalidade a partir do seu detalhe.
+        """
+        self.atualizar_varios([detalhe])
+
+    def processar(self, uuid, resposta):
+        """
+        Indexa a resposta do GET de detalhe; compatível com o callback de SincronizadorIncremental.sincronizar.
+        """
+        self.atualizar(resposta.json())
+
+    def remover(self, uuid):
+        with self._lock:
+            self._conexao.execute('DELETE FROM personalidades WHERE uuid = ?', (uuid,))
+            self._desindexar(uuid)
+            self._compactar_se_necessario()
+
+    def _semelhantes(self, palavra):
+        """
+        Palavras do vocabulário parecidas com a palavra da consulta: dicionário id -> semelhança (0 a 1).
+        """
+        consulta = trigramas(palavra)
+        contagem = Counter()
+        for trigrama in consulta:
+            contagem.update(self._trigramas.get(trigrama, _VAZIA))
+        semelhantes = {}
+        for id_, comuns in contagem.most_common(10 * self.MAX_PALAVRAS_SEMELHANTES):
+            outros = len(trigramas(self._palavras[id_]))
+            semelhanca = _semelhanca(comuns, len(consulta), outros)
+            if semelhanca >= self.MIN_SEMELHANCA_PALAVRA:
+                semelhantes[id_] = semelhanca
+        exata = self._vocabulario.get(palavra)
+        if exata is not None:
+            semelhantes[exata] = 1.0
+        return dict(sorted(semelhantes.items(), key=lambda item: -item[1])[:self.MAX_PALAVRAS_SEMELHANTES])
+
+    def buscar(self, texto, limite=10, campos=None, min_pontuacao=0.3):
+        """
+        Busca as personalidades mais semelhantes ao texto.
+
+        Cada palavra da consulta vale a semelhança da palavra mais parecida do campo. A pontuação
+        é a média entre a fração da consulta encontrada no campo e a fração do campo coberta pela
+        consulta: correspondências exatas valem 1, e campos que contêm a consulta e mais palavras
+        ficam abaixo dos que contêm só ela.
+
+        Parâmetros:
+            texto (str): Nome, alcunha ou parte deles, com ou sem acentos.
+            limite (int): Quantidade máxima de resultados.
+            campos (iterable): Campos considerados (subconjunto de CAMPOS). Se omitido, todos.
+            min_pontuacao (float): Pontuação mínima, entre 0 e 1.
+
+        Retorna:
+            list[ResultadoBusca]: Uma entrada por personalidade, da mais para a menos semelhante.
+        """
+        palavras = list(dict.fromkeys(normalizar_busca(texto).split()))
+        if not palavras:
+            return []
+        campos = frozenset(campos or CAMPOS)
+
+        with self._lock:
+            expansoes = [self._semelhantes(palavra) for palavra in palavras]
+            # Um termo com pontuação >= m corresponde a pelo menos ceil(m * n) das n palavras da consulta e,
+            # portanto, aparece nas postagens de ao menos uma das n - ceil(m * n) + 1 palavras mais raras.
+            necessarias = len(palavras) - max(1, math.ceil(min_pontuacao * len(palavras))) + 1
+            listas = sorted(([self._termos_da_palavra[id_] for id_ in expansao] for expansao in expansoes),
+                            key=lambda postagens: sum(map(len, postagens)))[:necessarias]
+            contagem = Counter()
+            restante = self.ORCAMENTO_POSTAGENS
+            for postagens in listas:
+                for lista in postagens:
+                    if len(lista) > restante:
+                        lista = lista[:restante]
+                    contagem.update(lista)
+                    restante -= len(lista)
+                if restante <= 0:
+                    break
+            if len(contagem) <= self.MAX_CANDIDATOS:
+                candidatos = contagem
+            elif len(palavras) == 1:
+                candidatos = islice(contagem, self.MAX_CANDIDATOS)  # Todos com contagem 1: não há o que ordenar.
+            else:
+                candidatos = [id_ for id_, _ in contagem.most_common(self.MAX_CANDIDATOS)]
+
+            melhores = {}
+            for id_ in candidatos:
+                uuid = self._termo_uuid[id_]
+                if uuid is None or self._termo_campo[id_] not in campos:
+                    continue
+                termo = self._termo_palavras[id_]
+                soma = sum(max(map(expansao.get, termo, [0.0] * len(termo))) for expansao in expansoes)
+                pontuacao = (soma / len(palavras) + min(1.0, soma / len(termo))) / 2
+                if pontuacao < min_pontuacao:
+                    continue
+                atual = melhores.get(uuid)
+                if atual is None or pontuacao > atual.pontuacao:
+                    melhores[uuid] = ResultadoBusca(uuid, round(pontuacao, 4), self._termo_campo[id_],
+                                                    self._termo_texto[id_], self._registros[uuid][0])
+        return sorted(melhores.values(), key=lambda r: (-r.pontuacao, r.nome))[:limite]
+
+    def __len__(self):
+        return len(self._registros)
+
+    def close(self):
+        with self._lock:
+            self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _semelhanca(comuns, tamanho_consulta, tamanho_outro):
+    # Média entre a fração de trigramas da consulta presentes e a semelhança de Jaccard.
+    return (comuns / tamanho_consulta + comuns / (tamanho_consulta + tamanho_outro - comuns)) / 2
@@ -0,0 +1,264 @@
+import os
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CachePersonalidades:
+    """
+    Cache persistente em disco (SQLite) dos detalhes de personalidades.
+
+    Cada resposta é guardada sob a chave (uuid, dataAtualizacao). Uma consulta com uma
+    dataAtualizacao diferente da armazenada é um miss, de modo que o detalhe só volta à rede
+    quando a lista de UUIDs mostra uma atualização. O tamanho é limitado por max_registros,
+    com remoção dos registros usados há mais tempo (LRU). A instância pode ser compartilhada
+    entre threads.
+
+    Atributos:
+        caminho (str): Caminho do arquivo SQLite.
+        max_registros (int): Quantidade máxima de registros mantidos.
+        hits (int): Consultas atendidas pelo cache.
+        misses (int): Consultas que precisaram ir à rede.
+
+    Métodos:
+        obter(uuid, data_atualizacao): Retorna o corpo armazenado (bytes) ou None.
+        gravar(uuid, data_atualizacao, corpo): Armazena ou substitui o corpo de um uuid.
+        invalidar(uuid): Remove um uuid do cache.
+        estatisticas(): Retorna contadores de uso.
+    """
+
+    def __init__(self, caminho='json/cache_personalidades.sqlite3', max_registros=100000):
+        """
+        Parâmetros:
+            caminho (str): Caminho do arquivo SQLite (criado se não existir).
+            max_registros (int): Limite de registros; acima dele os menos usados são removidos.
+        """
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho
+        self.max_registros = max_registros
+        self.hits = 0
+        self.misses = 0
+        self.remocoes = 0
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.execute('CREATE TABLE IF NOT EXISTS personalidades ('
+                              'uuid TEXT PRIMARY KEY, data_atualizacao TEXT, '
+                              'corpo BLOB NOT NULL, ultimo_acesso INTEGER NOT NULL)')
+        self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_personalidades_acesso '
+                              'ON personalidades (ultimo_acesso)')
+        relogio, total = self._conexao.execute(
+            'SELECT COALESCE(MAX(ultimo_acesso), 0), COUNT(*) FROM personalidades').fetchone()
+        self._relogio = relogio
+        self._total = total
+
+    def _tique(self):
+        self._relogio += 1
+        return self._relogio
+
+    def obter(self, uuid, data_atualizacao=None):
+        """
+        Retorna o corpo armazenado para o uuid, se estiver atualizado.
+
+        Parâmetros:
+            uuid (str): UUID da personalidade.
+            data_atualizacao (str): dataAtualizacao esperada. Se informada, só há hit quando ela é
+                igual à armazenada; se omitida, qualquer versão armazenada é aceita.
+
+        Retorna:
+            bytes: Corpo da resposta armazenada, ou None em caso de miss.
+        """
+        with self._lock:
+            linha = self._conexao.execute('SELECT data_atualizacao, corpo FROM personalidades WHERE uuid = ?',
+                                          (uuid,)).fetchone()
+            if linha is None or (data_atualizacao is not None and linha[0] != data_atualizacao):
+                self.misses += 1
+                return None
+            self._conexao.execute('UPDATE personalidades SET ultimo_acesso = ? WHERE uuid = ?',
+                                  (self._tique(), uuid))
+            self.hits += 1
+            return bytes(linha[1])
+
+    def gravar(self, uuid, data_atualizacao, corpo):
+        """
+        Armazena o corpo da resposta de um uuid, substituindo a versão anterior.
+
+        Parâmetros:
+            uuid (str): UUID da personalidade.
+            data_atualizacao (str): dataAtualizacao correspondente ao corpo (pode ser None).
+            corpo (bytes): Corpo da resposta da API.
+        """
+        with self._lock:
+            existia = self._conexao.execute('SELECT 1 FROM personalidades WHERE uuid = ?', (uuid,)).fetchone()
+            self._conexao.execute('INSERT OR REPLACE INTO personalidades '
+                                  '(uuid, data_atualizacao, corpo, ultimo_acesso) VALUES (?, ?, ?, ?)',
+                                  (uuid, data_atualizacao, sqlite3.Binary(corpo), self._tique()))
+            if not existia:
+                self._total += 1
+            if self._total > self.max_registros:
+                excedente = self._total - self.max_registros
+                self._conexao.execute('DELETE FROM personalidades WHERE uuid IN ('
+                                      'SELECT uuid FROM personalidades ORDER BY ultimo_acesso LIMIT ?)',
+                                      (excedente,))
+                self._total -= excedente
+                self.remocoes += excedente
+                logger.info("Cache de personalidades: %d registro(s) removido(s) por LRU.", excedente)
+
+    def invalidar(self, uuid):
+        with self._lock:
+            removidos = self._conexao.execute('DELETE FROM personalidades WHERE uuid = ?', (uuid,)).rowcount
+            self._total -= removidos
+
+    def estatisticas(self):
+        """
+        Retorna um dicionário com hits, misses, taxa de acerto, remoções e registros armazenados.
+        """
+        consultas = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'taxa_acerto': self.hits / consultas if consultas else 0.0,
+                'remocoes': self.remocoes, 'registros': self._total}
+
+    def close(self):
+        with self._lock:
+            self._conexao.close()
+
+    def __len__(self):
+        return self._total
+
+
+class CacheCondicional:
+    """
+    Cache persistente em disco (SQLite) de respostas GET com validadores HTTP, para requisições condicionais.
+
+    Para cada URL respondida com ETag ou Last-Modified, guarda os validadores e o corpo. Na
+    próxima consulta, o cliente envia If-None-Match/If-Modified-Since (cabecalhos()); se o
+    servidor responder 304 Not Modified, sem corpo, o corpo guardado é reaproveitado (corpo()).
+    Assim, tabelas de domínio e detalhes que não mudaram custam só os cabeçalhos da resposta.
+    O tamanho é limitado por max_registros (LRU). A instância pode ser compartilhada entre threads.
+
+    Atributos:
+        caminho (str): Caminho do arquivo SQLite.
+        max_registros (int): Quantidade máxima de URLs mantidas.
+        revalidacoes (int): Respostas 304 atendidas com o corpo guardado.
+        gravacoes (int): Corpos novos ou alterados gravados.
+
+    Exemplo de uso:
+    >>> api = ApiClient(cache_condicional=CacheCondicional('json/cache_condicional.sqlite3'))
+    >>> api.get_dominio('/municipios').headers.get('X-Cache')  # 'REVALIDATED' se não mudou
+    """
+
+    def __init__(self, caminho='json/cache_condicional.sqlite3', max_registros=200000):
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho
+        self.max_registros = max_registros
+        self.revalidacoes = 0
+        self.gravacoes = 0
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.execute('CREATE TABLE IF NOT EXISTS respostas ('
+                              'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, '
+                              'corpo BLOB NOT NULL, ultimo_acesso INTEGER NOT NULL)')
+        self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (ultimo_acesso)')
+        relogio, total = self._conexao.execute(
+            'SELECT COALESCE(MAX(ultimo_acesso), 0), COUNT(*) FROM respostas').fetchone()
+        self._relogio = relogio
+        self._total = total
+
+    def _tique(self):
+        self._relogio += 1
+        return self._relogio
+
+    def cabecalhos(self, url):
+        """
+        Retorna os cabeçalhos condicionais (If-None-Match, If-Modified-Since) para a URL, ou {} se não houver.
+        """
+        with self._lock:
+            linha = self._conexao.execute('SELECT etag, last_modified FROM respostas WHERE url = ?',
+                                          (url,)).fetchone()
+        if linha is None:
+            return {}
+        cabecalhos = {}
+        if linha[0]:
+            cabecalhos['If-None-Match'] = linha[0]
+        if linha[1]:
+            cabecalhos['If-Modified-Since'] = linha[1]
+        return cabecalhos
+
+    def corpo(self, url):
+        """
+        Retorna o corpo guardado para a URL após um 304 (bytes), ou None se ele já foi removido.
+        """
+        with self._lock:
+            linha = self._conexao.execute('SELECT corpo FROM respostas WHERE url = ?', (url,)).fetchone()
+            if linha is None:
+                return None
+            self._conexao.execute('UPDATE respostas SET ultimo_acesso = ? WHERE url = ?', (self._tique(), url))
+            self.revalidacoes += 1
+            return bytes(linha[0])
+
+    def gravar(self, url, etag, last_modified, corpo):
+        """
+        Armazena o corpo de uma resposta 200 com seus validadores. Sem ETag nem Last-Modified não
+        há como revalidar: a entrada anterior da URL, se houver, é descartada.
+        """
+        with self._lock:
+            existia = self._conexao.execute('SELECT 1 FROM respostas WHERE url = ?', (url,)).fetchone()
+            if not etag and not last_modified:
+                if existia:
+                    self._conexao.execute('DELETE FROM respostas WHERE url = ?', (url,))
+                    self._total -= 1
+                return
+            self._conexao.execute('INSERT OR REPLACE INTO respostas '
+                                  '(url, etag, last_modified, corpo, ultimo_acesso) VALUES (?, ?, ?, ?, ?)',
+                                  (url, etag, last_modified, sqlite3.Binary(corpo), self._tique()))
+            self.gravacoes += 1
+            if not existia:
+                self._total += 1
+            if self._total > self.max_registros:
+                excedente = self._total - self.max_registros
+                self._conexao.execute('DELETE FROM respostas WHERE url IN ('
+                                      'SELECT url FROM respostas ORDER BY ultimo_acesso LIMIT ?)', (excedente,))
+                self._total -= excedente
+                logger.info("Cache condicional: %d registro(s) removido(s) por LRU.", excedente)
+
+    def estatisticas(self):
+        """
+        Retorna um dicionário com revalidações (304), gravações e registros armazenados.
+        """
+        return {'revalidacoes': self.revalidacoes, 'gravacoes': self.gravacoes, 'registros': self._total}
+
+    def close(self):
+        with self._lock:
+            self._conexao.close()
+
+    def __len__(self):
+        return self._total
+
+
+_cache_condicional_padrao = None
+_cache_condicional_lock = threading.Lock()
+
+
+def obter_cache_condicional_padrao():
+    """
+    Retorna o CacheCondicional compartilhado pelo processo, no caminho CACHE_CONDICIONAL_CAMINHO de
+    config.settings, criando-o na primeira chamada. Retorna None se a configuração estiver vazia.
+    """
+    global _cache_condicional_padrao
+    if _cache_condicional_padrao is None:
+        from config.settings import CACHE_CONDICIONAL_CAMINHO
+        if not CACHE_CONDICIONAL_CAMINHO:
+            return None
+        with _cache_condicional_lock:
+            if _cache_condicional_padrao is None:
+                _cache_condicional_padrao = CacheCondicional(CACHE_CONDICIONAL_CAMINHO)
+    return _cache_condicional_padrao
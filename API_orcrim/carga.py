@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import logging
+from itertools import islice
+from typing import NamedTuple, Any, Optional
+from API_orcrim.api_client import ApiClient
+
+logger = logging.getLogger(__name__)
+
+ENVIANDO = 'enviando'
+CRIADO = 'criado'
+FALHA = 'falha'
+JA_CRIADO = 'ja_criado'
+DUPLICADO = 'duplicado'
+
+
+class ResultadoCarga(NamedTuple):
+    """
+    Resultado de um registro em uma carga retomável.
+
+    Atributos:
+        indice (int): Posição do registro no iterável de entrada.
+        registro (Any): Objeto recebido (Pessoa ou dicionário).
+        situacao (str): 'criado' (enviado nesta execução), 'ja_criado' (concluído em execução
+            anterior, não reenviado), 'duplicado' (repetição de um registro anterior da mesma
+            entrada, não enviada; uuid, status e erro são os do primeiro) ou 'falha'.
+        uuid (str): UUID atribuído pela API, quando conhecido.
+        status (int): Código HTTP da resposta que decidiu o resultado.
+        erro (str): Descrição do erro, quando houver.
+    """
+    indice: int
+    registro: Any
+    situacao: str
+    uuid: Optional[str] = None
+    status: Optional[int] = None
+    erro: Optional[str] = None
+
+
+def hash_registro(registro):
+    """
+    Identifica um registro de entrada pelo SHA-256 do seu JSON.
+
+    Pessoas usam to_registro_json() (ordem de campos fixa); dicionários são serializados com
+    chaves ordenadas, de modo que o mesmo conteúdo sempre gera o mesmo hash.
+    """
+    if hasattr(registro, 'to_registro_json'):
+        texto = registro.to_registro_json()
+    else:
+        texto = json.dumps(registro, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class DiarioCarga:
+    """
+    Diário (journal) append-only de uma carga em lote, em JSON Lines.
+
+    Cada linha registra uma mudança de situação de um registro: {"hash", "situacao", "uuid",
+    "status", "erro"}. Ao abrir, o arquivo é relido e a última linha de cada hash define a
+    situação atual; uma linha final incompleta (queda durante a escrita) é descartada.
+
+    As linhas são gravadas com registrar() e só ficam duráveis após sincronizar(), que faz
+    flush + os.fsync; o carregador chama sincronizar uma vez por lote.
+
+    Atributos:
+        caminho (str): Arquivo do diário.
+        estado (dict): hash -> dicionário da última linha registrada para ele.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.estado = {}
+        if os.path.exists(caminho):
+            self._reler()
+        self._arquivo = open(caminho, 'a', encoding='utf-8')
+
+    def _reler(self):
+        descartadas = 0
+        valido = 0  # Posição logo após a última linha completa.
+        with open(self.caminho, 'rb') as arquivo:
+            for linha in arquivo:
+                if not linha.endswith(b'\n'):
+                    descartadas += 1
+                    break
+                valido += len(linha)
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    descartadas += 1
+                    continue
+                self.estado[entrada['hash']] = entrada
+        if valido < os.path.getsize(self.caminho):
+            # Remove a linha final interrompida para que as próximas não sejam anexadas a ela.
+            with open(self.caminho, 'r+b') as arquivo:
+                arquivo.truncate(valido)
+        if descartadas:
+            logger.warning("Diário %s: %d linha(s) incompleta(s) descartada(s).", self.caminho, descartadas)
+
+    def situacao(self, hash_):
+        entrada = self.estado.get(hash_)
+        return entrada['situacao'] if entrada else None
+
+    def registrar(self, hash_, situacao, uuid=None, status=None, erro=None):
+        entrada = {'hash': hash_, 'situacao': situacao, 'uuid': uuid, 'status': status, 'erro': erro}
+        self.estado[hash_] = entrada
+        self._arquivo.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+
+    def sincronizar(self):
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+    def contagem(self):
+        """
+        Retorna a quantidade de registros em cada situação.
+        """
+        contagem = {}
+        for entrada in self.estado.values():
+            contagem[entrada['situacao']] = contagem.get(entrada['situacao'], 0) + 1
+        return contagem
+
+    def close(self):
+        if not self._arquivo.closed:
+            self.sincronizar()
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CargaRetomavel:
+    """
+    Carga em lote de personalidades que pode ser interrompida e retomada sem duplicar envios.
+
+    Antes de cada lote ser enviado, seus registros são marcados como 'enviando' no diário (com
+    fsync); depois da resposta, cada um passa a 'criado' (com o UUID) ou 'falha', e o diário é
+    sincronizado de novo. Ao rodar outra vez sobre a mesma entrada, registros já criados são
+    pulados sem ir à rede; os que falharam ou estavam em voo quando o processo caiu são reenviados.
+
+    Registros 'enviando' podem ter sido criados pela API pouco antes da queda, sem que a
+    resposta tenha chegado ao diário; o reenvio deles é registrado em log como aviso.
+
+    Atributos:
+        diario (DiarioCarga): Diário da carga.
+        api (ApiClient): Cliente usado nos envios.
+        batch_size (int): Registros por requisição.
+
+    Exemplo de uso:
+    >>> with CargaRetomavel('json/carga_2024.journal') as carga:
+    ...     for resultado in carga.executar(pessoas):
+    ...         if resultado.situacao == 'falha':
+    ...             print(resultado.indice, resultado.erro)
+    """
+
+    def __init__(self, caminho_diario, api=None, batch_size=50):
+        """
+        Parâmetros:
+            caminho_diario (str): Arquivo do diário; é criado se não existir e retomado se existir.
+            api (ApiClient): Cliente da API. Se omitido, cria um com as configurações padrão.
+            batch_size (int): Quantidade máxima de registros por requisição.
+        """
+        self.diario = DiarioCarga(caminho_diario)
+        self.api = api or ApiClient()
+        self.batch_size = batch_size
+
+    def executar(self, registros):
+        """
+        Envia os registros ainda não criados, em lotes, registrando cada passo no diário.
+
+        Parâmetros:
+            registros (iterable): Objetos Pessoa ou dicionários no formato de um item de "data".
+                Consumido sob demanda; a entrada deve ser a mesma (em conteúdo) ao retomar.
+                Registros de conteúdo idêntico são tratados como um só: apenas o primeiro é enviado,
+                e as repetições saem como 'duplicado' depois que o resultado dele é conhecido.
+
+        Retorna:
+            generator: Um ResultadoCarga por registro de entrada.
+        """
+        iterador = enumerate(registros)
+        vistos = set()
+        while True:
+            bloco = list(islice(iterador, self.batch_size))
+            if not bloco:
+                break
+            lote, repetidos = [], []
+            for indice, registro in bloco:
+                hash_ = hash_registro(registro)
+                if hash_ in vistos:
+                    # O primeiro pode estar neste mesmo lote, ainda sem resultado: responde depois do envio.
+                    repetidos.append((indice, registro, hash_))
+                    continue
+                situacao = self.diario.situacao(hash_)
+                if situacao == CRIADO:
+                    vistos.add(hash_)
+                    entrada = self.diario.estado[hash_]
+                    yield ResultadoCarga(indice, registro, JA_CRIADO, uuid=entrada.get('uuid'))
+                    continue
+                if situacao == ENVIANDO:
+                    logger.warning("Registro %d estava em envio quando a carga anterior foi interrompida; "
+                                   "reenviando.", indice)
+                vistos.add(hash_)
+                lote.append((indice, registro, hash_))
+            if lote:
+                yield from self._enviar_lote(lote)
+            for indice, registro, hash_ in repetidos:
+                entrada = self.diario.estado[hash_]
+                yield ResultadoCarga(indice, registro, DUPLICADO, entrada.get('uuid'), entrada.get('status'),
+                                     entrada.get('erro'))
+
+    def _enviar_lote(self, lote):
+        for _, _, hash_ in lote:
+            self.diario.registrar(hash_, ENVIANDO)
+        self.diario.sincronizar()
+
+        resultados = self.api.post_personalidades([registro for _, registro, _ in lote], batch_size=len(lote))
+        saida = []
+        for resultado in resultados:
+            indice, registro, hash_ = lote[resultado.indice]
+            situacao = CRIADO if resultado.sucesso else FALHA
+            self.diario.registrar(hash_, situacao, uuid=resultado.uuid, status=resultado.status, erro=resultado.erro)
+            saida.append(ResultadoCarga(indice, registro, situacao, resultado.uuid, resultado.status, resultado.erro))
+        self.diario.sincronizar()
+        return saida
+
+    def close(self):
+        self.diario.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,18 @@
+import datetime
+
+FORMATO_DATA = '%d/%m/%Y %H:%M:%S.%f'
+DATA_INICIAL = '01/01/2010 00:00:00.000'
+
+
+def converter_data(texto):
+    """
+    Converte uma data no formato da API ('DD/MM/AAAA HH:MM:SS.SSS') para datetime.
+    """
+    return datetime.datetime.strptime(texto, FORMATO_DATA)
+
+
+def formatar_data(data):
+    """
+    Formata um datetime no formato aceito pela API ('DD/MM/AAAA HH:MM:SS.SSS').
+    """
+    return data.strftime(FORMATO_DATA)[:-3]
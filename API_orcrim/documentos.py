@@ -0,0 +1,52 @@
+from typing import NamedTuple, Any, Optional
+
+# tipoDocumento.id dos documentos no detalhe do GET.
+TIPO_DOCUMENTO_CPF = 9
+TIPO_DOCUMENTO_RG = 14
+
+
+class Documento(NamedTuple):
+    """
+    CPF ou RG lido da lista "documentos" do detalhe do GET de personalidade.
+
+    Atributos:
+        id (Any): Id do documento na API.
+        numero (str): Número como veio na resposta (sem normalização).
+        uf (dict): UF emissora ('ufRg' ou, na falta, 'uf'); {} se ausente. None para CPFs.
+    """
+    id: Any
+    numero: Optional[str]
+    uf: Optional[dict] = None
+
+
+def tipo_documento(documento):
+    """
+    Retorna o tipoDocumento.id de um item de "documentos" como int, ou None se ausente ou inválido.
+    """
+    tipo = (documento.get('tipoDocumento') or {}).get('id')
+    try:
+        return int(tipo) if tipo not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def extrair_documentos(documentos):
+    """
+    Separa os CPFs e RGs da lista "documentos" do detalhe (tipoDocumento 9 = CPF, 14 = RG).
+    Documentos de outros tipos são ignorados.
+
+    Parâmetros:
+        documentos (iterable): Itens de "documentos" (aceita None).
+
+    Retorna:
+        tuple: (cpfs, rgs), listas de Documento na ordem da entrada.
+    """
+    cpfs, rgs = [], []
+    for documento in documentos or ():
+        tipo = tipo_documento(documento)
+        if tipo == TIPO_DOCUMENTO_CPF:
+            cpfs.append(Documento(documento.get('id'), documento.get('numero')))
+        elif tipo == TIPO_DOCUMENTO_RG:
+            rgs.append(Documento(documento.get('id'), documento.get('numero'),
+                                 documento.get('ufRg') or documento.get('uf') or {}))
+    return cpfs, rgs
@@ -0,0 +1,248 @@
+import functools
+import json
+import logging
+import os
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_SNAPSHOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jsonBase', '1')
+
+# nome da tabela: (endpoint da API, arquivo do snapshot em jsonBase/1)
+TABELAS = {
+    'ufs': ('/ufs', 'UFs.json'),
+    'municipios': ('/municipios', 'municipios.json'),
+    'orcrims': ('/orcrims', 'orcrims.json'),
+    'sexos': ('/sexos', 'sexo.json'),
+    'nacionalidades': ('/nacionalidades', 'nacionalidades.json'),
+}
+
+
+@functools.lru_cache(maxsize=65536)
+def normalizar(texto):
+    """
+    Normaliza um texto para comparação: sem acentos, em maiúsculas e com espaços simples.
+
+    Exemplo:
+    >>> normalizar(' Brasília ')
+    'BRASILIA'
+    """
+    if texto is None:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.upper().split())
+
+
+class TabelaDominio:
+    """
+    Tabela de domínio em memória com índices de hash por id, sigla e nome normalizado.
+
+    Siglas e nomes não são únicos em todas as tabelas (há municípios homônimos em UFs
+    diferentes e orcrims com a mesma sigla), por isso esses índices guardam listas.
+
+    Atributos:
+        nome (str): Nome da tabela ('ufs', 'municipios'...).
+        registros (list[dict]): Registros na ordem recebida.
+        por_id (dict): id -> registro.
+        por_sigla (dict): sigla normalizada -> lista de registros.
+        por_nome (dict): nome normalizado -> lista de registros.
+    """
+
+    def __init__(self, nome, registros):
+        self.nome = nome
+        self.registros = registros
+        self.por_id = {}
+        self.por_sigla = {}
+        self.por_nome = {}
+        for registro in registros:
+            self.por_id[registro['id']] = registro
+            if registro.get('sigla'):
+                self.por_sigla.setdefault(normalizar(registro['sigla']), []).append(registro)
+            if registro.get('nome'):
+                self.por_nome.setdefault(normalizar(registro['nome']), []).append(registro)
+
+    def buscar(self, valor):
+        """
+        Retorna todos os registros que correspondem ao valor (id, sigla ou nome).
+
+        Parâmetros:
+            valor (int, str): Id numérico, sigla ou nome (sem distinção de acentos e caixa).
+
+        Retorna:
+            list[dict]: Registros encontrados (vazia se nenhum).
+        """
+        if isinstance(valor, int) or (isinstance(valor, str) and valor.isdigit()):
+            registro = self.por_id.get(int(valor))
+            return [registro] if registro else []
+        chave = normalizar(valor)
+        return self.por_sigla.get(chave) or self.por_nome.get(chave) or []
+
+    def __len__(self):
+        return len(self.registros)
+
+
+class DomainRegistry:
+    """
+    Registro das tabelas de domínio (UFs, municípios, orcrims, sexos, nacionalidades).
+
+    Cada tabela é carregada uma única vez, do snapshot em jsonBase/1/ ou da API, e indexada em
+    memória para que resolver 'DF', 27 ou 'Brasilia' custe uma consulta de dicionário.
+
+    Atributos:
+        diretorio (str): Diretório dos snapshots JSON.
+        cliente (ApiClient): Cliente usado por atualizar(); criado sob demanda se omitido.
+
+    Métodos:
+        tabela(nome): Retorna a TabelaDominio, carregando o snapshot na primeira vez.
+        atualizar(nomes, max_concorrencia, salvar): Recarrega tabelas da API em paralelo.
+        uf(valor), municipio(valor, uf), orcrim(valor), sexo(valor), nacionalidade(valor):
+            Resolvem um valor para o registro único correspondente.
+        padrao(): Instância compartilhada pelo processo.
+
+    Exemplo de uso:
+    >>> registro = DomainRegistry.padrao()
+    >>> registro.uf('DF')
+    {'id': 27, 'nome': 'DISTRITO FEDERAL', 'sigla': 'DF'}
+    >>> registro.municipio('Brasilia', uf='DF')['id']
+    530010801
+    """
+
+    _padrao = None
+    _padrao_lock = threading.Lock()
+
+    def __init__(self, diretorio=DIRETORIO_SNAPSHOT, cliente=None):
+        self.diretorio = diretorio
+        self.cliente = cliente
+        self._tabelas = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def padrao(cls):
+        """
+        Retorna o registro compartilhado pelo processo, baseado nos snapshots de jsonBase/1/.
+        """
+        if cls._padrao is None:
+            with cls._padrao_lock:
+                if cls._padrao is None:
+                    cls._padrao = cls()
+        return cls._padrao
+
+    def _carregar_snapshot(self, nome):
+        arquivo = os.path.join(self.diretorio, TABELAS[nome][1])
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        return TabelaDominio(nome, dados['data'] if isinstance(dados, dict) else dados)
+
+    def tabela(self, nome):
+        """
+        Retorna a tabela de domínio, carregando-a do snapshot na primeira consulta.
+
+        Parâmetros:
+            nome (str): Uma das chaves de TABELAS.
+
+        Retorna:
+            TabelaDominio: Tabela indexada.
+        """
+        tabela = self._tabelas.get(nome)
+        if tabela is None:
+            with self._lock:
+                tabela = self._tabelas.get(nome)
+                if tabela is None:
+                    tabela = self._tabelas[nome] = self._carregar_snapshot(nome)
+        return tabela
+
+    def atualizar(self, nomes=None, max_concorrencia=5, salvar=False):
+        """
+        Recarrega tabelas a partir da API, com as requisições feitas em paralelo.
+
+        Parâmetros:
+            nomes (iterable): Tabelas a recarregar. Se omitido, todas de TABELAS.
+            max_concorrencia (int): Quantidade de tabelas baixadas ao mesmo tempo.
+            salvar (bool): Se True, regrava os snapshots em disco com os dados recebidos.
+
+        Retorna:
+            dict: nome da tabela -> quantidade de registros carregados.
+        """
+        if self.cliente is None:
+            from API_orcrim.api_client import ApiClient
+            self.cliente = ApiClient()
+        nomes = list(nomes or TABELAS)
+
+        def baixar(nome):
+            response = self.cliente.get_dominio(TABELAS[nome][0])
+            response.raise_for_status()
+            dados = response.json()
+            return nome, dados['data'] if isinstance(dados, dict) else dados
+
+        with ThreadPoolExecutor(max_workers=max_concorrencia) as executor:
+            baixadas = list(executor.map(baixar, nomes))
+
+        contagem = {}
+        for nome, registros in baixadas:
+            tabela = TabelaDominio(nome, registros)
+            with self._lock:
+                self._tabelas[nome] = tabela
+            if salvar:
+                with open(os.path.join(self.diretorio, TABELAS[nome][1]), 'w', encoding='utf-8') as f:
+                    json.dump(registros, f, ensure_ascii=False, indent=2)
+            contagem[nome] = len(tabela)
+            logger.info("Tabela de domínio '%s' atualizada: %d registro(s).", nome, len(tabela))
+        return contagem
+
+    def resolver(self, nome, valor):
+        """
+        Resolve um valor para o registro único da tabela.
+
+        Parâmetros:
+            nome (str): Nome da tabela.
+            valor (int, str): Id, sigla ou nome.
+
+        Retorna:
+            dict: Registro encontrado.
+
+        Levanta:
+            ValueError: Se nenhum ou mais de um registro corresponder ao valor.
+        """
+        encontrados = self.tabela(nome).buscar(valor)
+        if len(encontrados) != 1:
+            motivo = 'não encontrado' if not encontrados else f'ambíguo ({len(encontrados)} registros)'
+            raise ValueError(f"Valor '{valor}' {motivo} na tabela '{nome}'.")
+        return encontrados[0]
+
+    def uf(self, valor):
+        return self.resolver('ufs', valor)
+
+    def orcrim(self, valor):
+        return self.resolver('orcrims', valor)
+
+    def sexo(self, valor):
+        return self.resolver('sexos', valor)
+
+    def nacionalidade(self, valor):
+        return self.resolver('nacionalidades', valor)
+
+    def municipio(self, valor, uf=None):
+        """
+        Resolve um município por id ou nome, usando a UF para desfazer homônimos.
+
+        Parâmetros:
+            valor (int, str): Id ou nome do município.
+            uf (int, str): Id, sigla ou nome da UF (opcional).
+
+        Retorna:
+            dict: Registro do município (inclui a chave 'uf').
+
+        Levanta:
+            ValueError: Se nenhum ou mais de um município corresponder.
+        """
+        encontrados = self.tabela('municipios').buscar(valor)
+        if uf is not None:
+            uf_id = self.uf(uf)['id']
+            encontrados = [m for m in encontrados if m.get('uf', {}).get('id') == uf_id]
+        if len(encontrados) != 1:
+            motivo = 'não encontrado' if not encontrados else f'ambíguo ({len(encontrados)} registros)'
+            raise ValueError(f"Município '{valor}' {motivo}.")
+        return encontrados[0]
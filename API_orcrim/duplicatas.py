@@ -0,0 +1,371 @@
+import functools
+import json
+import re
+import logging
+from itertools import islice
+from typing import NamedTuple, Any, Optional, FrozenSet, Tuple
+from API_orcrim.busca import normalizar_busca, trigramas
+from API_orcrim.documentos import extrair_documentos
+
+try:
+    import numpy
+except ImportError:  # Sem numpy, as pontuações do lote são combinadas em Python puro.
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+CRIAR = 'criar'
+PULAR = 'pular'
+REVISAR = 'revisar'
+
+# Peso de cada comparação na pontuação de um par: nome, data de nascimento, nome da mãe, nome do pai.
+PESOS = (0.45, 0.25, 0.2, 0.1)
+
+# Ignoradas nas chaves de bloco, assim como iniciais de uma letra.
+_PARTICULAS = frozenset({'DA', 'DE', 'DO', 'DAS', 'DOS', 'E', 'JUNIOR', 'JR', 'FILHO', 'NETO', 'SOBRINHO'})
+_NAO_DIGITOS = re.compile(r'\D')
+
+# Blocos maiores que isso (nomes muito comuns) não geram pares: o custo cresceria com o quadrado
+# do bloco, e esses registros ainda são achados pelo documento ou pela outra chave.
+MAX_BLOCO = 500
+
+
+class DecisaoDuplicata(NamedTuple):
+    """
+    Destino de um registro de entrada após a verificação de duplicatas.
+
+    Atributos:
+        indice (int): Posição do registro no iterável de entrada.
+        registro (Any): Objeto recebido (Pessoa ou dicionário).
+        acao (str): 'criar' (nenhuma duplicata provável), 'pular' (já existe) ou 'revisar' (suspeita).
+        motivo (str): Chave que levou ao candidato: 'cpf', 'rg', 'nome+nascimento', 'nome+mae' ou
+            'nascimento+mae'.
+        pontuacao (float): Semelhança com o candidato (0 a 1); 1 para CPF ou RG+UF iguais.
+        uuid (str): UUID do registro existente correspondente, se houver.
+        indice_correspondente (int): Posição do registro correspondente na mesma entrada, se a
+            duplicata for de outro registro desta carga.
+    """
+    indice: int
+    registro: Any
+    acao: str
+    motivo: Optional[str] = None
+    pontuacao: float = 0.0
+    uuid: Optional[str] = None
+    indice_correspondente: Optional[int] = None
+
+
+class _Perfil(NamedTuple):
+    uuid: Optional[str]
+    indice: Optional[int]
+    nome: str
+    data_nascimento: str
+    nome_mae: str
+    nome_pai: str
+    cpfs: FrozenSet[str]
+    rgs: FrozenSet[Tuple[str, int]]
+
+
+def _abreviar(nome):
+    """
+    Primeiro e último nomes significativos (sem partículas), usados nas chaves de bloco: pequenas
+    diferenças no meio do nome ('CARLOS ANDRE DEDF EXEMPLO' x 'CARLOS ANDRE EXEMPLO') caem no mesmo bloco.
+    """
+    palavras = [p for p in nome.split() if len(p) > 1 and p not in _PARTICULAS]
+    if not palavras:
+        return ''
+    return f'{palavras[0]} {palavras[-1]}' if len(palavras) > 1 else palavras[0]
+
+
+def perfil_registro(registro, uuid=None, indice=None):
+    """
+    Extrai os dados comparados de um registro: Pessoa, item de "data" do POST (cpfs/rgs) ou
+    detalhe do GET (dadosPessoais/documentos, com tipo 9 = CPF e 14 = RG).
+    """
+    if hasattr(registro, 'to_registro'):
+        registro = registro.to_registro()
+    pessoais = registro.get('dadosPessoais', registro)
+    cpfs = {_NAO_DIGITOS.sub('', str(cpf)) for cpf in pessoais.get('cpfs') or ()}
+    rgs = set()
+    for rg in pessoais.get('rgs') or ():
+        rgs.add((_NAO_DIGITOS.sub('', str(rg.get('rg') or '')), (rg.get('ufRg') or {}).get('id')))
+    documentos_cpf, documentos_rg = extrair_documentos(pessoais.get('documentos'))
+    cpfs.update(_NAO_DIGITOS.sub('', str(cpf.numero or '')) for cpf in documentos_cpf)
+    rgs.update((_NAO_DIGITOS.sub('', str(rg.numero or '')), rg.uf.get('id')) for rg in documentos_rg)
+    nome = normalizar_busca(pessoais.get('nome'))
+    nome_mae = normalizar_busca(pessoais.get('nomeMae'))
+    nome_pai = normalizar_busca(pessoais.get('nomePai'))
+    return _Perfil(uuid or pessoais.get('uuid'), indice, nome, pessoais.get('dataNascimento') or '', nome_mae,
+                   nome_pai, frozenset(c for c in cpfs if c),
+                   frozenset((rg, uf) for rg, uf in rgs if rg and uf is not None))
+
+
+def _significativas(nome):
+    return ' '.join(p for p in nome.split() if len(p) > 1 and p not in _PARTICULAS)
+
+
+def _chaves_bloco(perfil):
+    # Na chave da mãe vai o nome completo: primeiro+último dela se repetem demais para separar blocos.
+    chaves = []
+    abreviado = _abreviar(perfil.nome)
+    if abreviado and perfil.data_nascimento:
+        chaves.append(('nome+nascimento', abreviado, perfil.data_nascimento))
+    mae = _significativas(perfil.nome_mae)
+    if abreviado and mae:
+        chaves.append(('nome+mae', abreviado, mae))
+    if mae and perfil.data_nascimento:
+        # Pega erros de digitação no primeiro ou no último nome, que mudam as duas chaves acima.
+        chaves.append(('nascimento+mae', perfil.data_nascimento, mae))
+    return chaves
+
+
+@functools.lru_cache(maxsize=65536)
+def _trigramas(texto):
+    # Calculados só para os nomes que chegam a ser comparados; a maior parte do espelho nunca é.
+    return frozenset(trigramas(texto))
+
+
+def semelhanca_nomes(a, b):
+    """
+    Coeficiente de Dice entre os trigramas de dois nomes normalizados (0 a 1; 0 se algum for vazio).
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    ta, tb = _trigramas(a), _trigramas(b)
+    return 2 * len(ta & tb) / (len(ta) + len(tb))
+
+
+def _comparar(a, b):
+    """
+    Valores (semelhanças de 0 a 1) e presenças (1 se o campo existe nos dois) de um par de perfis.
+    """
+    valores = (semelhanca_nomes(a.nome, b.nome),
+               1.0 if a.data_nascimento == b.data_nascimento else 0.0,
+               semelhanca_nomes(a.nome_mae, b.nome_mae),
+               semelhanca_nomes(a.nome_pai, b.nome_pai))
+    presentes = (1.0 if a.nome and b.nome else 0.0,
+                 1.0 if a.data_nascimento and b.data_nascimento else 0.0,
+                 1.0 if a.nome_mae and b.nome_mae else 0.0,
+                 1.0 if a.nome_pai and b.nome_pai else 0.0)
+    return valores, presentes
+
+
+def pontuar_pares(valores, presentes, pesos=PESOS):
+    """
+    Combina as comparações de vários pares na pontuação de cada um: a média ponderada das
+    semelhanças dos campos presentes nos dois registros. Usa numpy, se instalado.
+
+    Parâmetros:
+        valores (list[tuple]): Semelhanças por par, na ordem de PESOS.
+        presentes (list[tuple]): 1.0 se o campo existe nos dois registros do par, senão 0.0.
+
+    Retorna:
+        list[float]: Pontuação de cada par, entre 0 e 1.
+    """
+    if not valores:
+        return []
+    if numpy is not None:
+        v = numpy.asarray(valores, dtype=float)
+        p = numpy.asarray(presentes, dtype=float)
+        w = numpy.asarray(pesos, dtype=float)
+        total = p @ w
+        return numpy.divide((v * p) @ w, total, out=numpy.zeros_like(total), where=total > 0).tolist()
+    pontuacoes = []
+    for linha, mascara in zip(valores, presentes):
+        total = sum(peso * m for peso, m in zip(pesos, mascara))
+        pontuacoes.append(sum(peso * v * m for peso, v, m in zip(pesos, linha, mascara)) / total if total else 0.0)
+    return pontuacoes
+
+
+class DetectorDuplicatas:
+    """
+    Verifica, antes da criação em lote, se cada registro já existe no espelho local ou na própria carga.
+
+    Os registros conhecidos (detalhes hidratados, ou registros já criados) ficam em índices em
+    memória: CPF e RG+UF (chaves exatas) e três chaves de bloco, primeiro+último nome com a data de
+    nascimento, primeiro+último nome com o da mãe e data de nascimento com o nome da mãe. Cada registro de entrada só é comparado com os
+    candidatos que compartilham alguma chave, e os pares de um lote são pontuados de uma vez
+    (pontuar_pares, vetorizado com numpy quando disponível) pela semelhança de trigramas dos nomes,
+    da mãe e do pai e pela igualdade da data de nascimento.
+
+    Destinos:
+        - 'pular': CPF ou RG+UF iguais (com nome compatível), ou pontuação >= limiar_pular.
+        - 'revisar': pontuação entre limiar_revisar e limiar_pular, documento igual com nome diferente,
+          ou pontuação alta com CPFs diferentes.
+        - 'criar': nenhum candidato acima de limiar_revisar. O registro passa a ser conhecido, de modo
+          que repetições na mesma carga são apontadas pelo indice_correspondente.
+
+    Exemplo de uso:
+    >>> detector = DetectorDuplicatas()
+    >>> detector.adicionar_varios(iter_linhas_json('json/detalhes.jsonl'))
+    >>> a_criar = [d.registro for d in detector.classificar(pessoas) if d.acao == 'criar']
+    >>> list(api.post_personalidades(a_criar))
+    """
+
+    def __init__(self, limiar_pular=0.9, limiar_revisar=0.7, tamanho_lote=1000):
+        """
+        Parâmetros:
+            limiar_pular (float): Pontuação a partir da qual o registro é considerado já existente.
+            limiar_revisar (float): Pontuação a partir da qual o par é enviado para revisão.
+            tamanho_lote (int): Registros de entrada classificados (e pares pontuados) por vez.
+        """
+        self.limiar_pular = limiar_pular
+        self.limiar_revisar = limiar_revisar
+        self.tamanho_lote = tamanho_lote
+        self._perfis = []
+        self._por_cpf = {}
+        self._por_rg = {}
+        self._blocos = {}
+
+    def __len__(self):
+        return len(self._perfis)
+
+    def _indexar(self, perfil):
+        ref = len(self._perfis)
+        self._perfis.append(perfil)
+        for cpf in perfil.cpfs:
+            self._por_cpf.setdefault(cpf, ref)
+        for rg in perfil.rgs:
+            self._por_rg.setdefault(rg, ref)
+        for chave in _chaves_bloco(perfil):
+            self._blocos.setdefault(chave, []).append(ref)
+
+    def adicionar(self, registro, uuid=None):
+        """
+        Inclui um registro existente (detalhe do GET, item de POST ou Pessoa) nos índices.
+        """
+        if isinstance(registro, (str, bytes)):
+            registro = json.loads(registro)
+        self._indexar(perfil_registro(registro, uuid))
+
+    def adicionar_varios(self, registros):
+        """
+        Inclui vários registros existentes; retorna a quantidade incluída.
+        """
+        quantidade = 0
+        for registro in registros:
+            self.adicionar(registro)
+            quantidade += 1
+        return quantidade
+
+    def classificar(self, registros):
+        """
+        Decide o destino de cada registro de entrada.
+
+        Parâmetros:
+            registros (iterable): Objetos Pessoa ou dicionários no formato de um item de "data".
+                Consumido sob demanda, em lotes de tamanho_lote.
+
+        Retorna:
+            generator: Uma DecisaoDuplicata por registro, na ordem da entrada.
+        """
+        iterador = enumerate(registros)
+        while True:
+            bloco = list(islice(iterador, self.tamanho_lote))
+            if not bloco:
+                return
+            yield from self._classificar_lote(bloco)
+
+    def _classificar_lote(self, bloco):
+        perfis = [perfil_registro(registro, indice=indice) for indice, registro in bloco]
+        base = len(self._perfis)
+        # Os perfis do lote entram nos índices já, para que repetições dentro do lote se encontrem;
+        # ao final, os que não forem 'criar' são retirados das chaves exatas e dos blocos.
+        exatos, pares = [], []
+        grandes = 0
+        for posicao, perfil in enumerate(perfis):
+            ref = base + posicao
+            exato = None
+            for cpf in perfil.cpfs:
+                candidato = self._por_cpf.get(cpf)
+                if candidato is not None and candidato < ref:
+                    exato = (candidato, 'cpf')
+                    break
+            if exato is None:
+                for rg in perfil.rgs:
+                    candidato = self._por_rg.get(rg)
+                    if candidato is not None and candidato < ref:
+                        exato = (candidato, 'rg')
+                        break
+            exatos.append(exato)
+            vistos = set()
+            for chave in _chaves_bloco(perfil):
+                refs = self._blocos.get(chave, ())
+                if len(refs) > MAX_BLOCO:
+                    grandes += 1
+                    continue
+                for candidato in refs:
+                    if candidato < ref and candidato not in vistos:
+                        vistos.add(candidato)
+                        pares.append((posicao, candidato, chave[0]))
+            self._indexar(perfil)
+
+        comparacoes = [_comparar(perfis[posicao], self._perfis[candidato]) for posicao, candidato, _ in pares]
+        pontuacoes = pontuar_pares([c[0] for c in comparacoes], [c[1] for c in comparacoes])
+        candidatos = {}  # posição no lote -> [(pontuação, ref do candidato, motivo)]
+        for (posicao, candidato, motivo), pontuacao in zip(pares, pontuacoes):
+            if perfis[posicao].cpfs and self._perfis[candidato].cpfs and \
+                    not perfis[posicao].cpfs & self._perfis[candidato].cpfs:
+                # Mesmo nome e nascimento com CPFs diferentes: nunca é pulado automaticamente.
+                pontuacao = min(pontuacao, self.limiar_revisar)
+            candidatos.setdefault(posicao, []).append((pontuacao, candidato, motivo))
+
+        acoes = {}  # ref -> DecisaoDuplicata dos registros deste lote
+        decisoes = []
+        for posicao, ((indice, registro), perfil) in enumerate(zip(bloco, perfis)):
+            melhor = None
+            if exatos[posicao] is not None:
+                candidato, motivo = exatos[posicao]
+                semelhanca = semelhanca_nomes(perfil.nome, self._perfis[candidato].nome)
+                melhor = (1.0, candidato, motivo) if semelhanca >= 0.5 or not perfil.nome else \
+                    (semelhanca, candidato, motivo)
+                acao = PULAR if melhor[0] == 1.0 else REVISAR
+            else:
+                # Registros do lote já pulados não servem de referência: a comparação vale com o
+                # registro existente a que eles correspondem, que também é candidato.
+                elegiveis = [c for c in candidatos.get(posicao, ())
+                             if c[1] not in acoes or acoes[c[1]].acao != PULAR]
+                melhor = max(elegiveis, default=None, key=lambda c: c[0])
+                if melhor is not None and melhor[0] >= self.limiar_revisar:
+                    acao = PULAR if melhor[0] >= self.limiar_pular else REVISAR
+                else:
+                    melhor = None
+            if melhor is None:
+                decisao = acoes[base + posicao] = DecisaoDuplicata(indice, registro, CRIAR)
+                decisoes.append(decisao)
+                continue
+            pontuacao, candidato, motivo = melhor
+            correspondente = self._perfis[candidato]
+            uuid, indice_correspondente = correspondente.uuid, correspondente.indice
+            anterior = acoes.get(candidato)
+            if anterior is not None and anterior.acao == PULAR:
+                # Repetição (por documento) de um registro do lote que já existia: aponta para o registro existente.
+                uuid, indice_correspondente = anterior.uuid, anterior.indice_correspondente
+            elif anterior is not None and anterior.acao == REVISAR:
+                acao = REVISAR
+            decisao = acoes[base + posicao] = DecisaoDuplicata(indice, registro, acao, motivo, round(pontuacao, 4),
+                                                               uuid, indice_correspondente)
+            decisoes.append(decisao)
+
+        for posicao, perfil in enumerate(perfis):
+            if acoes[base + posicao].acao != CRIAR:
+                self._desindexar(base + posicao, perfil)
+        if grandes:
+            logger.warning("Duplicatas: %d chave(s) de bloco com mais de %d registros ignorada(s).",
+                           grandes, MAX_BLOCO)
+        logger.info("Duplicatas: %d registro(s), %d par(es) comparado(s), %d a criar.", len(bloco), len(pares),
+                    sum(1 for d in decisoes if d.acao == CRIAR))
+        return decisoes
+
+    def _desindexar(self, ref, perfil):
+        for cpf in perfil.cpfs:
+            if self._por_cpf.get(cpf) == ref:
+                del self._por_cpf[cpf]
+        for rg in perfil.rgs:
+            if self._por_rg.get(rg) == ref:
+                del self._por_rg[rg]
+        for chave in _chaves_bloco(perfil):
+            refs = self._blocos.get(chave)
+            if refs and ref in refs:
+                refs.remove(ref)
@@ -0,0 +1,290 @@
+import csv
+import gzip
+import json
+import os
+import logging
+from typing import NamedTuple, Dict, List
+from API_orcrim.documentos import extrair_documentos, tipo_documento
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Sem pyarrow, a exportação é feita em CSV comprimido com gzip.
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# Tabela -> colunas (nome, tipo). Toda tabela filha começa por uuid, a chave da pessoa.
+TABELAS = {
+    'pessoas': (
+        ('uuid', 'str'), ('nome', 'str'), ('dataNascimento', 'str'), ('nomeMae', 'str'), ('nomePai', 'str'),
+        ('obito', 'str'), ('sexo_id', 'int'), ('sexo_nome', 'str'), ('nacionalidade_id', 'int'),
+        ('nacionalidade_nome', 'str'), ('uf_id', 'int'), ('uf_nome', 'str'), ('uf_sigla', 'str'),
+        ('municipio_id', 'int'), ('municipio_nome', 'str'),
+    ),
+    'alcunhas': (('uuid', 'str'), ('id', 'int'), ('alcunha', 'str'), ('dataAlcunha', 'str')),
+    'documentos': (('uuid', 'str'), ('id', 'int'), ('numero', 'str'), ('tipo_id', 'int'), ('tipo_descricao', 'str')),
+    'cpfs': (('uuid', 'str'), ('documento_id', 'int'), ('cpf', 'str')),
+    'rgs': (('uuid', 'str'), ('documento_id', 'int'), ('rg', 'str'), ('uf_id', 'int'), ('uf_sigla', 'str')),
+    'orcrims': (
+        ('uuid', 'str'), ('id', 'int'), ('idOrcrim', 'int'), ('nomeOrcrim', 'str'), ('siglaOrcrim', 'str'),
+        ('dataInicio', 'str'), ('dataTermino', 'str'),
+    ),
+    'telefones': (('uuid', 'str'), ('id', 'int'), ('telefone', 'str')),
+}
+
+
+class ResumoExportacao(NamedTuple):
+    """
+    Resumo de uma exportação.
+
+    Atributos:
+        registros (int): Personalidades exportadas.
+        linhas (dict): Tabela -> quantidade de linhas gravadas.
+        arquivos (list[str]): Arquivos gerados, na ordem em que foram concluídos.
+    """
+    registros: int
+    linhas: Dict[str, int]
+    arquivos: List[str]
+
+
+def _inteiro(valor):
+    try:
+        return int(valor) if valor not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def achatar_personalidade(detalhe):
+    """
+    Converte o detalhe de uma personalidade nas linhas de cada tabela de exportação.
+
+    Aceita a resposta do GET de detalhe ({"dadosPessoais": {...}, "dadosTelefone": [...], ...},
+    como em jsonBase/1/exemplo de personalidade.json) ou só o objeto de dadosPessoais (como nos
+    itens de "data" da resposta do POST). Campos ausentes viram None.
+
+    Parâmetros:
+        detalhe (dict): Detalhe da personalidade.
+
+    Retorna:
+        dict: Tabela (chave de TABELAS) -> lista de tuplas na ordem das colunas da tabela.
+    """
+    pessoais = detalhe.get('dadosPessoais', detalhe)
+    uuid = pessoais.get('uuid')
+    sexo = pessoais.get('sexo') or {}
+    nacionalidade = pessoais.get('nacionalidade') or {}
+    uf = pessoais.get('uf') or {}
+    municipio = pessoais.get('municipio') or {}
+    cpfs, rgs = extrair_documentos(pessoais.get('documentos'))
+    return {
+        'pessoas': [(
+            uuid, pessoais.get('nome'), pessoais.get('dataNascimento') or None, pessoais.get('nomeMae') or None,
+            pessoais.get('nomePai') or None, pessoais.get('obito') or None,
+            _inteiro(sexo.get('id')), sexo.get('nome'), _inteiro(nacionalidade.get('id')), nacionalidade.get('nome'),
+            _inteiro(uf.get('id')), uf.get('nome'), uf.get('sigla'), _inteiro(municipio.get('id')), municipio.get('nome'),
+        )],
+        'alcunhas': [(uuid, _inteiro(a.get('id')), a.get('alcunha'), a.get('dataAlcunha') or None)
+                     for a in pessoais.get('alcunhas') or ()],
+        'documentos': [(uuid, _inteiro(d.get('id')), d.get('numero'), tipo_documento(d),
+                        (d.get('tipoDocumento') or {}).get('descricao'))
+                       for d in pessoais.get('documentos') or ()],
+        'cpfs': [(uuid, _inteiro(cpf.id), cpf.numero) for cpf in cpfs],
+        'rgs': [(uuid, _inteiro(rg.id), rg.numero, _inteiro(rg.uf.get('id')), rg.uf.get('sigla')) for rg in rgs],
+        'orcrims': [(uuid, _inteiro(o.get('id')), _inteiro(o.get('idOrcrim')), o.get('nomeOrcrim'), o.get('siglaOrcrim'),
+                     o.get('dataInicioFormatoString') or None, o.get('dataTerminoFormatoString') or None)
+                    for o in pessoais.get('dadosPessoaisOrcrim') or ()],
+        'telefones': [(uuid, _inteiro(t.get('id')), t.get('telefone') or t.get('numero'))
+                      for t in detalhe.get('dadosTelefone') or ()],
+    }
+
+
+class _ArquivoParquet:
+    extensao = '.parquet'
+
+    def __init__(self, caminho, colunas, compressao):
+        tipos = {'int': pyarrow.int64(), 'str': pyarrow.string()}
+        self.esquema = pyarrow.schema([(nome, tipos[tipo]) for nome, tipo in colunas])
+        self._escritor = pyarrow.parquet.ParquetWriter(caminho, self.esquema, compression=compressao or 'zstd')
+
+    def gravar(self, linhas):
+        colunas = list(zip(*linhas))
+        self._escritor.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(valores, type=campo.type) for valores, campo in zip(colunas, self.esquema)],
+            schema=self.esquema))
+
+    def close(self):
+        self._escritor.close()
+
+
+class _ArquivoCsv:
+    extensao = '.csv.gz'
+
+    def __init__(self, caminho, colunas, compressao):
+        self._arquivo = gzip.open(caminho, 'wt', encoding='utf-8', newline='', compresslevel=compressao or 6)
+        self._escritor = csv.writer(self._arquivo)
+        self._escritor.writerow([nome for nome, _ in colunas])
+
+    def gravar(self, linhas):
+        self._escritor.writerows(linhas)
+
+    def close(self):
+        self._arquivo.close()
+
+
+class _TabelaExportada:
+    """
+    Buffer de linhas e fragmento (shard) aberto de uma tabela.
+    """
+
+    def __init__(self, exportador, nome):
+        self.exportador = exportador
+        self.nome = nome
+        self.colunas = TABELAS[nome]
+        self.buffer = []
+        self.total = 0
+        self._arquivo = None
+        self._caminho = None
+        self._linhas_arquivo = 0
+        self._partes = 0
+
+    def adicionar(self, linhas):
+        self.buffer.extend(linhas)
+        if len(self.buffer) >= self.exportador.linhas_por_lote:
+            self.descarregar()
+
+    def descarregar(self):
+        while self.buffer:
+            if self._arquivo is None:
+                self._abrir()
+            espaco = self.exportador.linhas_por_arquivo - self._linhas_arquivo
+            bloco, self.buffer = self.buffer[:espaco], self.buffer[espaco:]
+            self._arquivo.gravar(bloco)
+            self._linhas_arquivo += len(bloco)
+            self.total += len(bloco)
+            if self._linhas_arquivo >= self.exportador.linhas_por_arquivo:
+                self.fechar()
+
+    def _abrir(self):
+        classe = self.exportador._classe_arquivo
+        diretorio = os.path.join(self.exportador.diretorio, self.nome)
+        os.makedirs(diretorio, exist_ok=True)
+        self._caminho = os.path.join(diretorio, f'parte-{self._partes:05d}{classe.extensao}')
+        self._partes += 1
+        # Grava em .tmp e renomeia ao fechar: quem lê o diretório nunca vê um fragmento pela metade.
+        self._arquivo = classe(self._caminho + '.tmp', self.colunas, self.exportador.compressao)
+        self._linhas_arquivo = 0
+
+    def fechar(self):
+        if self._arquivo is None:
+            return
+        self._arquivo.close()
+        os.replace(self._caminho + '.tmp', self._caminho)
+        self.exportador.arquivos.append(self._caminho)
+        self._arquivo = None
+
+
+class ExportadorColunar:
+    """
+    Exporta detalhes de personalidades para arquivos colunares, em streaming e com memória limitada.
+
+    Cada detalhe é achatado (achatar_personalidade) em uma linha de 'pessoas' e linhas nas tabelas
+    filhas (alcunhas, documentos, cpfs, rgs, orcrims e telefones), todas ligadas pelo uuid. As linhas
+    ficam em um buffer por tabela de no máximo linhas_por_lote; cada descarga vira um row group no
+    fragmento aberto da tabela, e um novo fragmento é iniciado a cada linhas_por_arquivo linhas.
+    O uso de memória depende desses limites, não do tamanho da exportação.
+
+    Com pyarrow instalado, gera Parquet comprimido (zstd por padrão); sem ele, CSV com gzip.
+    Os arquivos ficam em <diretorio>/<tabela>/parte-00000.parquet (ou .csv.gz), prontos para
+    pyarrow.dataset, pandas.read_parquet ou DuckDB lerem o diretório da tabela inteiro.
+
+    Atributos:
+        diretorio (str): Diretório de destino.
+        formato (str): 'parquet' ou 'csv'.
+        arquivos (list[str]): Fragmentos concluídos.
+
+    Exemplo de uso:
+    >>> with ExportadorColunar('exportacao/2024-06') as exportador:
+    ...     exportador.exportar(iter_linhas_json('detalhes.jsonl'))
+    >>> exportador.resumo()
+    ResumoExportacao(registros=120000, linhas={'pessoas': 120000, 'alcunhas': 80412, ...}, arquivos=[...])
+    """
+
+    def __init__(self, diretorio, formato=None, linhas_por_lote=50000, linhas_por_arquivo=1000000, compressao=None):
+        """
+        Parâmetros:
+            diretorio (str): Diretório de destino (criado se não existir).
+            formato (str): 'parquet' ou 'csv'. Se omitido, usa parquet quando pyarrow está instalado.
+            linhas_por_lote (int): Linhas acumuladas por tabela antes de gravar (tamanho do row group).
+            linhas_por_arquivo (int): Linhas por fragmento de cada tabela.
+            compressao (str, int): Codec do Parquet ('zstd', 'snappy', 'gzip'...) ou nível do gzip no CSV.
+
+        Levanta:
+            ValueError: Se o formato for desconhecido ou parquet sem pyarrow instalado.
+        """
+        formato = formato or ('parquet' if pyarrow is not None else 'csv')
+        if formato == 'parquet':
+            if pyarrow is None:
+                raise ValueError("Formato parquet requer o pacote pyarrow.")
+            self._classe_arquivo = _ArquivoParquet
+        elif formato == 'csv':
+            self._classe_arquivo = _ArquivoCsv
+        else:
+            raise ValueError(f"Formato de exportação desconhecido: {formato!r}")
+        self.diretorio = diretorio
+        self.formato = formato
+        self.linhas_por_lote = linhas_por_lote
+        self.linhas_por_arquivo = linhas_por_arquivo
+        self.compressao = compressao
+        self.arquivos = []
+        self.registros = 0
+        self._fechado = False
+        self._tabelas = {nome: _TabelaExportada(self, nome) for nome in TABELAS}
+        os.makedirs(diretorio, exist_ok=True)
+
+    def adicionar(self, detalhe):
+        """
+        Acrescenta o detalhe de uma personalidade (dict, ou o JSON em str/bytes).
+        """
+        if self._fechado:
+            raise RuntimeError("ExportadorColunar já foi encerrado.")
+        if isinstance(detalhe, (str, bytes)):
+            detalhe = json.loads(detalhe)
+        for nome, linhas in achatar_personalidade(detalhe).items():
+            if linhas:
+                self._tabelas[nome].adicionar(linhas)
+        self.registros += 1
+
+    def exportar(self, detalhes):
+        """
+        Acrescenta todos os detalhes do iterável, consumido sob demanda, e conclui os arquivos.
+
+        Retorna:
+            ResumoExportacao: Registros, linhas por tabela e arquivos gerados.
+        """
+        for detalhe in detalhes:
+            self.adicionar(detalhe)
+        self.close()
+        return self.resumo()
+
+    def resumo(self):
+        return ResumoExportacao(self.registros, {nome: t.total + len(t.buffer) for nome, t in self._tabelas.items()},
+                                list(self.arquivos))
+
+    def close(self):
+        """
+        Grava os buffers restantes e fecha os fragmentos abertos.
+        """
+        if self._fechado:
+            return
+        self._fechado = True
+        for tabela in self._tabelas.values():
+            tabela.descarregar()
+            tabela.fechar()
+        logger.info("Exportação em %s: %d registro(s), %d arquivo(s).", self.diretorio, self.registros,
+                    len(self.arquivos))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
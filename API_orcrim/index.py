@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+import logging
+from itertools import islice
+from API_orcrim.stream import iter_uuids
+
+logger = logging.getLogger(__name__)
+
+
+class IndiceAtualizacao:
+    """
+    Índice persistente uuid -> dataAtualizacao construído a partir de um dump de UUIDs.
+
+    O índice é gravado em uma tabela SQLite ao lado do dump e reconstruído automaticamente,
+    via leitura em streaming, sempre que o mtime ou o tamanho do arquivo de origem mudam.
+    Consultas individuais e em lote não relêem o dump.
+
+    Atributos:
+        caminho_dump (str): Arquivo {"data": [{"uuid", "dataAtualizacao"}]} de origem.
+        caminho_indice (str): Arquivo SQLite do índice.
+
+    Métodos:
+        obter(uuid): Retorna a dataAtualizacao de um uuid (ou None).
+        obter_varios(uuids): Retorna um dicionário uuid -> dataAtualizacao para vários uuids.
+        reconstruir(): Força a reconstrução a partir do dump.
+
+    Exemplo de uso:
+    >>> indice = IndiceAtualizacao('json/personalidade.json')
+    >>> indice.obter('774edd21-0fa4-454c-ac0b-c4307ef10300')
+    '26/07/2021 00:00:00.000'
+    """
+
+    TAMANHO_LOTE = 500  # Limite de parâmetros por consulta IN (...)
+
+    def __init__(self, caminho_dump, caminho_indice=None):
+        """
+        Parâmetros:
+            caminho_dump (str): Arquivo de UUIDs de origem.
+            caminho_indice (str): Arquivo SQLite do índice. Se omitido, usa caminho_dump + '.idx.sqlite3'.
+        """
+        self.caminho_dump = caminho_dump
+        self.caminho_indice = caminho_indice or f"{caminho_dump}.idx.sqlite3"
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(self.caminho_indice, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('CREATE TABLE IF NOT EXISTS atualizacao (uuid TEXT PRIMARY KEY, data_atualizacao TEXT) '
+                              'WITHOUT ROWID')
+        self._conexao.execute('CREATE TABLE IF NOT EXISTS origem (chave TEXT PRIMARY KEY, valor TEXT)')
+        self._conexao.commit()
+        self._assinatura = None
+
+    def _assinatura_dump(self):
+        estado = os.stat(self.caminho_dump)
+        return f"{estado.st_mtime_ns}:{estado.st_size}"
+
+    def _verificar(self):
+        """
+        Reconstrói o índice se o dump mudou desde a última verificação ou construção.
+        """
+        assinatura = self._assinatura_dump()
+        if assinatura == self._assinatura:
+            return
+        with self._lock:
+            linha = self._conexao.execute("SELECT valor FROM origem WHERE chave = 'assinatura'").fetchone()
+            if linha is None or linha[0] != assinatura:
+                self._reconstruir(assinatura)
+            self._assinatura = assinatura
+
+    def reconstruir(self):
+        with self._lock:
+            assinatura = self._assinatura_dump()
+            self._reconstruir(assinatura)
+            self._assinatura = assinatura
+
+    def _reconstruir(self, assinatura):
+        logger.info("Construindo índice de atualização a partir de %s.", self.caminho_dump)
+        with self._conexao:
+            self._conexao.execute('DELETE FROM atualizacao')
+            self._conexao.executemany('INSERT OR REPLACE INTO atualizacao VALUES (?, ?)',
+                                      iter_uuids(self.caminho_dump))
+            self._conexao.execute("INSERT OR REPLACE INTO origem VALUES ('assinatura', ?)", (assinatura,))
+
+    def obter(self, uuid):
+        """
+        Retorna a dataAtualizacao do uuid, ou None se ele não estiver no dump.
+        """
+        self._verificar()
+        with self._lock:
+            linha = self._conexao.execute('SELECT data_atualizacao FROM atualizacao WHERE uuid = ?',
+                                          (uuid,)).fetchone()
+        return linha[0] if linha else None
+
+    def obter_varios(self, uuids):
+        """
+        Consulta vários uuids de uma vez.
+
+        Parâmetros:
+            uuids (iterable): UUIDs a consultar.
+
+        Retorna:
+            dict: uuid -> dataAtualizacao, apenas para os uuids presentes no dump.
+        """
+        self._verificar()
+        resultado = {}
+        iterador = iter(uuids)
+        with self._lock:
+            while True:
+                lote = list(islice(iterador, self.TAMANHO_LOTE))
+                if not lote:
+                    break
+                marcadores = ','.join('?' * len(lote))
+                resultado.update(self._conexao.execute(
+                    f'SELECT uuid, data_atualizacao FROM atualizacao WHERE uuid IN ({marcadores})', lote))
+        return resultado
+
+    def todos(self):
+        """
+        Retorna um dicionário com todos os pares uuid -> dataAtualizacao do índice.
+        """
+        self._verificar()
+        with self._lock:
+            return dict(self._conexao.execute('SELECT uuid, data_atualizacao FROM atualizacao'))
+
+    def __len__(self):
+        self._verificar()
+        with self._lock:
+            return self._conexao.execute('SELECT COUNT(*) FROM atualizacao').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conexao.close()
@@ -0,0 +1,140 @@
+import logging
+import time
+import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from API_orcrim import buscar_personalidade
+from API_orcrim.datas import converter_data, formatar_data
+from API_orcrim.token import TokenManager
+
+logger = logging.getLogger(__name__)
+
+# Erros 4xx que uma janela menor pode resolver (timeout da requisição, corpo grande demais); 5xx também.
+STATUS_SUBDIVIDIR = frozenset({408, 413})
+
+
+def _deve_subdividir(erro):
+    """
+    Indica se a falha de uma janela pode ser causada pelo tamanho da resposta. Os demais erros
+    (401, 403, 400...) se repetiriam em qualquer janela menor.
+    """
+    tipo = getattr(erro, 'tipo', None)
+    if tipo == 'http':
+        return erro.status >= 500 or erro.status in STATUS_SUBDIVIDIR
+    return tipo in ('timeout', 'resposta')
+
+
+def dividir_periodo(inicio, fim, partes):
+    """
+    Divide o período [inicio, fim] em 'partes' janelas contíguas de mesma duração.
+
+    Retorna:
+        list[tuple]: Pares (inicio, fim) de datetime.
+    """
+    passo = (fim - inicio) / partes
+    limites = [inicio + passo * i for i in range(partes)] + [fim]
+    return list(zip(limites[:-1], limites[1:]))
+
+
+def mesclar_por_uuid(destino, itens):
+    """
+    Acrescenta itens {"uuid", "dataAtualizacao"} a destino (uuid -> item), mantendo o mais recente.
+    """
+    for item in itens:
+        atual = destino.get(item['uuid'])
+        if atual is None or converter_data(item['dataAtualizacao']) > converter_data(atual['dataAtualizacao']):
+            destino[item['uuid']] = item
+
+
+def buscar_personalidade_janelas(data_inicio, data_fim, token_manager=None, transporte=None, base_url=None,
+                                 janelas=12, max_concorrencia=4, limite_registros=5000, tempo_maximo=120,
+                                 janela_minima=datetime.timedelta(minutes=1)):
+    """
+    Busca a lista de personalidades de um período longo em janelas de tempo paralelas.
+
+    O período é dividido em 'janelas' partes consultadas em paralelo. Uma janela é subdividida
+    ao meio e consultada de novo quando:
+    - retorna limite_registros itens ou mais (a resposta pode ter sido truncada e fica grande demais); ou
+    - não responde em tempo_maximo segundos, tem o corpo interrompido ou falha com 5xx, 408 ou 413.
+    Outras falhas (401, 403, demais 4xx, servidor inacessível, base_url inválida) não dependem do
+    tamanho da janela e encerram a busca na hora.
+    Janelas respondidas corretamente, mas com demora acima de tempo_maximo/2, têm o resultado
+    aproveitado e fazem as janelas ainda não enviadas começarem menores.
+
+    Os resultados são mesclados por uuid, mantendo a maior dataAtualizacao.
+
+    Parâmetros:
+        data_inicio (str): Início do período, no formato 'DD/MM/AAAA HH:MM:SS.SSS'.
+        data_fim (str): Fim do período, no mesmo formato.
+        token_manager (TokenManager): Gerenciador de tokens. Se omitido, usa as credenciais padrão.
+        transporte (HttpTransport): Transporte HTTP repassado a buscar_personalidade.
+        base_url (str): URL base da API.
+        janelas (int): Quantidade inicial de janelas.
+        max_concorrencia (int): Janelas consultadas ao mesmo tempo.
+        limite_registros (int): A partir de quantos itens a janela é considerada grande demais.
+        tempo_maximo (float): Timeout de leitura, em segundos, de cada janela.
+        janela_minima (timedelta): Menor janela permitida; abaixo dela não há subdivisão.
+
+    Retorna:
+        dict: {"data": [...]} no mesmo formato de buscar_personalidade, sem uuids repetidos.
+
+    Levanta:
+        RuntimeError: Se uma janela falhar por um erro que não se resolve subdividindo, ou se uma
+            janela do tamanho mínimo continuar falhando.
+
+    Exemplo de uso:
+    >>> resultado = buscar_personalidade_janelas('01/01/2010 00:00:00.000', '31/01/2024 00:00:00.000')
+    >>> len(resultado['data'])
+    """
+    token_manager = token_manager or TokenManager(transporte=transporte)
+    inicio, fim = converter_data(data_inicio), converter_data(data_fim)
+    fila = dividir_periodo(inicio, fim, janelas)
+    mesclados = {}
+
+    def consultar(janela):
+        a, b = janela
+        t0 = time.monotonic()
+        resultado = buscar_personalidade(formatar_data(a), formatar_data(b), token_manager.get_access_token(),
+                                         transporte=transporte, base_url=base_url, timeout=(5, tempo_maximo))
+        return resultado, time.monotonic() - t0
+
+    with ThreadPoolExecutor(max_workers=max_concorrencia) as executor:
+        pendentes = {}
+
+        def enviar():
+            while fila and len(pendentes) < max_concorrencia:
+                janela = fila.pop(0)
+                pendentes[executor.submit(consultar, janela)] = janela
+
+        enviar()
+        while pendentes:
+            concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                a, b = pendentes.pop(futuro)
+                resultado, duracao = futuro.result()
+                falhou = not isinstance(resultado, dict)
+                itens = [] if falhou else (resultado.get('data') or [])
+                if falhou and not _deve_subdividir(resultado):
+                    for futuro_pendente in pendentes:
+                        futuro_pendente.cancel()
+                    raise RuntimeError(f"Falha na janela {formatar_data(a)} - {formatar_data(b)}: {resultado}")
+
+                if falhou or len(itens) >= limite_registros:
+                    if b - a <= janela_minima:
+                        if falhou:
+                            raise RuntimeError(f"Falha na janela {formatar_data(a)} - {formatar_data(b)}: {resultado}")
+                        logger.warning("Janela mínima %s - %s com %d registro(s); resultado usado como está.",
+                                       formatar_data(a), formatar_data(b), len(itens))
+                    else:
+                        motivo = resultado if falhou else f"{len(itens)} registro(s)"
+                        logger.info("Subdividindo janela %s - %s: %s", formatar_data(a), formatar_data(b), motivo)
+                        fila[:0] = dividir_periodo(a, b, 2)
+                        continue
+
+                mesclar_por_uuid(mesclados, itens)
+                if duracao > tempo_maximo / 2:
+                    # Janela lenta: as próximas, ainda não enviadas, saem pela metade.
+                    fila[:] = [parte for janela in fila for parte in
+                               (dividir_periodo(*janela, 2) if janela[1] - janela[0] > janela_minima * 2 else [janela])]
+            enviar()
+
+    return {'data': list(mesclados.values())}
@@ -0,0 +1,156 @@
+import atexit
+import itertools
+import logging
+import logging.handlers
+import queue
+import threading
+
+FORMATO = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class FiltroAmostragem(logging.Filter):
+    """
+    Filtro que reduz mensagens repetitivas de alto volume.
+
+    As primeiras 'inicial' ocorrências de cada mensagem passam; depois disso, apenas uma a cada
+    'taxa'. Mensagens são identificadas pelo modelo (record.msg, antes da interpolação dos
+    argumentos), por isso as chamadas devem usar formatação preguiçosa com %:
+    logger.info("Iniciando GET de %s", uuid). WARNING e acima sempre passam.
+
+    Atributos:
+        taxa (int): A partir da ocorrência 'inicial', registra uma a cada 'taxa' mensagens.
+        inicial (int): Ocorrências de cada mensagem registradas integralmente.
+    """
+
+    def __init__(self, taxa=100, inicial=10):
+        super().__init__()
+        self.taxa = max(1, taxa)
+        self.inicial = inicial
+        self._contadores = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        contador = self._contadores.get(record.msg)
+        if contador is None:
+            contador = self._contadores.setdefault(record.msg, itertools.count())
+        n = next(contador)  # itertools.count é atômico sob o GIL.
+        return n < self.inicial or (n - self.inicial) % self.taxa == 0
+
+
+def logger_amostrado(nome, taxa=100, inicial=10):
+    """
+    Retorna o logger 'nome' com um FiltroAmostragem, usado para as mensagens do caminho quente
+    (uma por requisição ou por registro).
+    """
+    logger = logging.getLogger(nome)
+    if not any(isinstance(f, FiltroAmostragem) for f in logger.filters):
+        logger.addFilter(FiltroAmostragem(taxa, inicial))
+    return logger
+
+
+class _QueueHandlerAdiado(logging.handlers.QueueHandler):
+    """
+    QueueHandler que deixa a formatação para a thread do listener.
+
+    O QueueHandler padrão formata a mensagem na thread que chamou o log; aqui o registro vai
+    para a fila como está, e só registros com exceção são preparados antes (o traceback precisa
+    ser capturado enquanto ainda existe).
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+
+_listener = None
+_handler_fila = None
+_lock = threading.Lock()
+
+
+def configurar_logging(arquivo=None, nivel=None, max_bytes=None, backups=None, forcar=False):
+    """
+    Configura, uma única vez por processo, o log do pacote em arquivo com rotação por tamanho.
+
+    As chamadas de log apenas enfileiram o registro; a formatação e a escrita no arquivo ocorrem
+    em uma thread de fundo (QueueListener), fora do caminho das requisições. A fila é esvaziada
+    no encerramento do processo.
+
+    Assim como logging.basicConfig, não faz nada se o logger raiz já tiver handlers configurados
+    pela aplicação (a menos que forcar=True), nem se já tiver sido chamada.
+
+    Parâmetros:
+        arquivo (str): Arquivo de log. Se omitido, usa LOG_ARQUIVO de config.settings.
+        nivel (int, str): Nível mínimo do logger raiz. Se omitido, usa LOG_NIVEL.
+        max_bytes (int): Tamanho a partir do qual o arquivo é rotacionado. Se omitido, usa LOG_MAX_BYTES.
+        backups (int): Quantidade de arquivos rotacionados mantidos. Se omitido, usa LOG_BACKUPS.
+        forcar (bool): Substitui a configuração existente do logger raiz.
+
+    Retorna:
+        QueueListener: O listener em execução, ou None se a configuração da aplicação foi mantida.
+    """
+    global _listener, _handler_fila
+    with _lock:
+        raiz = logging.getLogger()
+        if _listener is not None and not forcar:
+            return _listener
+        if raiz.handlers and not forcar:
+            return None
+        from config.settings import LOG_ARQUIVO, LOG_NIVEL, LOG_MAX_BYTES, LOG_BACKUPS
+
+        _parar()
+        for handler in raiz.handlers[:]:
+            raiz.removeHandler(handler)
+            handler.close()
+
+        destino = logging.handlers.RotatingFileHandler(arquivo or LOG_ARQUIVO, maxBytes=max_bytes or LOG_MAX_BYTES,
+                                                       backupCount=LOG_BACKUPS if backups is None else backups,
+                                                       encoding='utf-8')
+        destino.setFormatter(logging.Formatter(FORMATO))
+        fila = queue.SimpleQueue()
+        _handler_fila = _QueueHandlerAdiado(fila)
+        raiz.addHandler(_handler_fila)
+        raiz.setLevel(nivel or LOG_NIVEL)
+        _listener = logging.handlers.QueueListener(fila, destino, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def _parar():
+    global _listener, _handler_fila
+    if _listener is None:
+        return
+    _listener.stop()  # Processa o que restou na fila antes de retornar.
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_handler_fila)
+    _listener = _handler_fila = None
+
+
+def desativar_logging():
+    """
+    Desliga o log do pacote em um processo de trabalho (initializer de ProcessPoolExecutor).
+
+    Um processo criado por fork herda o handler da fila, mas não a thread do listener que a
+    esvazia: os registros se acumulariam na memória sem chegar ao arquivo. Aqui os handlers
+    herdados são descartados e o logger raiz passa a usar um NullHandler.
+    """
+    global _listener, _handler_fila
+    with _lock:
+        raiz = logging.getLogger()
+        for handler in raiz.handlers[:]:
+            raiz.removeHandler(handler)
+        raiz.addHandler(logging.NullHandler())
+        _listener = _handler_fila = None
+
+
+def encerrar_logging():
+    """
+    Esvazia a fila e fecha o arquivo de log. Chamada automaticamente no encerramento do processo.
+    """
+    with _lock:
+        _parar()
+
+
+atexit.register(encerrar_logging)
@@ -0,0 +1,265 @@
+import bisect
+import re
+import threading
+import logging
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+LIMITES_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FASES = ('total', 'espera_token', 'espera_limite', 'conexao', 'ttfb', 'transferencia')
+
+_UUID = re.compile(r'/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)')
+
+
+class MedicaoRequisicao(NamedTuple):
+    """
+    Medição de uma requisição lógica (todas as tentativas de uma chamada ao transporte).
+
+    Os tempos estão em segundos. conexao soma o estabelecimento de conexões TCP+TLS de todas as
+    tentativas (zero quando a conexão keep-alive foi reaproveitada); ttfb e transferencia são da
+    última tentativa: do envio até a chegada dos cabeçalhos e da chegada dos cabeçalhos até o fim
+    do corpo, respectivamente.
+
+    Atributos:
+        metodo (str): Método HTTP.
+        endpoint (str): Rótulo do endpoint (caminho com UUIDs substituídos por {uuid}).
+        status (int): Código HTTP da última resposta, ou None se não houve resposta.
+        total (float): Duração total, incluindo esperas de retentativa.
+        espera_token (float): Tempo aguardando o TokenManager antes da requisição.
+        espera_limite (float): Tempo aguardando o limitador de taxa.
+        conexao (float): Tempo estabelecendo conexões.
+        ttfb (float): Tempo até o primeiro byte da resposta.
+        transferencia (float): Tempo lendo o corpo da resposta.
+        bytes_enviados (int): Tamanho do corpo enviado.
+        bytes_recebidos (int): Tamanho do corpo recebido, já descomprimido.
+        bytes_rede (int): Bytes do corpo lidos da conexão (comprimidos, se houve Content-Encoding).
+            Os três tamanhos são None quando desconhecidos (corpo em stream, sem resposta...) e
+            contam como 0 nos totais do registro.
+        retentativas (int): Tentativas além da primeira.
+        erro (str): Exceção que encerrou a requisição sem resposta, se houver.
+    """
+    metodo: str
+    endpoint: str
+    status: Optional[int] = None
+    total: float = 0.0
+    espera_token: float = 0.0
+    espera_limite: float = 0.0
+    conexao: float = 0.0
+    ttfb: float = 0.0
+    transferencia: float = 0.0
+    bytes_enviados: Optional[int] = 0
+    bytes_recebidos: Optional[int] = 0
+    bytes_rede: Optional[int] = 0
+    retentativas: int = 0
+    erro: Optional[str] = None
+
+
+def rotulo_endpoint(url):
+    """
+    Converte uma URL no rótulo usado para agregar métricas: o caminho, sem query string, com
+    UUIDs substituídos por {uuid} (ex.: '/backend-orcrim/api/v1/personalidade/{uuid}/telefones').
+    """
+    caminho = url.split('://', 1)[-1]
+    caminho = caminho[caminho.find('/'):] if '/' in caminho else '/'
+    return _UUID.sub('/{uuid}', caminho.split('?', 1)[0])
+
+
+class Histograma:
+    """
+    Histograma cumulativo de limites fixos, no formato usado pelo Prometheus.
+
+    Atributos:
+        limites (tuple): Limites superiores dos baldes, em ordem crescente (+Inf é implícito).
+        contagens (list): Observações por balde (não cumulativas; o último é o +Inf).
+        soma (float): Soma das observações.
+        contagem (int): Total de observações.
+    """
+
+    __slots__ = ('limites', 'contagens', 'soma', 'contagem')
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.contagem = 0
+
+    def observar(self, valor):
+        self.contagens[bisect.bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.contagem += 1
+
+    def quantil(self, q):
+        """
+        Estima o quantil q (0 a 1) por interpolação linear dentro do balde, como histogram_quantile.
+        """
+        if not self.contagem:
+            return 0.0
+        alvo = q * self.contagem
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            if acumulado + contagem >= alvo and contagem:
+                if i == len(self.limites):
+                    return self.limites[-1]
+                inferior = self.limites[i - 1] if i else 0.0
+                return inferior + (self.limites[i] - inferior) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return self.limites[-1]
+
+    def para_dict(self):
+        return {'contagem': self.contagem, 'soma': round(self.soma, 6),
+                'p50': round(self.quantil(0.5), 6), 'p95': round(self.quantil(0.95), 6),
+                'p99': round(self.quantil(0.99), 6)}
+
+
+class _MetricasEndpoint:
+    __slots__ = ('fases', 'status', 'bytes_enviados', 'bytes_recebidos', 'bytes_rede', 'retentativas')
+
+    def __init__(self, limites):
+        self.fases = {fase: Histograma(limites) for fase in FASES}
+        self.status = {}
+        self.bytes_enviados = 0
+        self.bytes_recebidos = 0
+        self.bytes_rede = 0
+        self.retentativas = 0
+
+
+class RegistroMetricas:
+    """
+    Agrega as medições das requisições em histogramas por método e endpoint.
+
+    Thread-safe; uma instância é compartilhada pelo processo (obter_metricas_padrao) e usada pelo
+    transporte padrão, de modo que ApiClient, TokenManager e buscar_personalidade alimentam o
+    mesmo registro. Ganchos recebem cada MedicaoRequisicao bruta, para quem quiser enviá-las a
+    outro sistema.
+
+    Métodos:
+        registrar(medicao): Agrega uma medição e repassa-a aos ganchos.
+        adicionar_gancho(funcao): Registra uma função chamada com cada medição.
+        remover_gancho(funcao): Remove um gancho registrado.
+        snapshot(): Retorna as métricas agregadas como dicionário serializável em JSON.
+        prometheus(): Retorna as métricas no formato de texto do Prometheus.
+        limpar(): Descarta as métricas acumuladas.
+
+    Exemplo de uso:
+    >>> metricas = obter_metricas_padrao()
+    >>> metricas.adicionar_gancho(lambda m: print(m.endpoint, m.status, m.total))
+    >>> ApiClient().get_personalidade(uuid)
+    >>> print(metricas.prometheus())
+    """
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = tuple(limites)
+        self._endpoints = {}
+        self._ganchos = []
+        self._lock = threading.Lock()
+
+    def registrar(self, medicao):
+        with self._lock:
+            chave = (medicao.metodo, medicao.endpoint)
+            metricas = self._endpoints.get(chave)
+            if metricas is None:
+                metricas = self._endpoints[chave] = _MetricasEndpoint(self.limites)
+            for fase, histograma in metricas.fases.items():
+                histograma.observar(getattr(medicao, fase))
+            status = str(medicao.status) if medicao.status is not None else 'erro'
+            metricas.status[status] = metricas.status.get(status, 0) + 1
+            metricas.bytes_enviados += medicao.bytes_enviados or 0
+            metricas.bytes_recebidos += medicao.bytes_recebidos or 0
+            metricas.bytes_rede += medicao.bytes_rede or 0
+            metricas.retentativas += medicao.retentativas
+            ganchos = tuple(self._ganchos)
+        for gancho in ganchos:
+            try:
+                gancho(medicao)
+            except Exception:
+                logger.exception("Erro em gancho de métricas.")
+
+    def adicionar_gancho(self, funcao):
+        with self._lock:
+            self._ganchos.append(funcao)
+
+    def remover_gancho(self, funcao):
+        with self._lock:
+            self._ganchos.remove(funcao)
+
+    def limpar(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        """
+        Retorna as métricas agregadas.
+
+        Retorna:
+            dict: {"endpoints": [{"metodo", "endpoint", "status", "bytes_enviados", "bytes_recebidos",
+            "bytes_rede", "taxa_compressao", "retentativas", "fases": {fase: {"contagem", "soma", "p50",
+            "p95", "p99"}}}]}, com tempos em segundos. taxa_compressao é bytes_recebidos / bytes_rede
+            (1.0 sem compressão; 0.0 se nada foi lido da rede, ex.: só respostas 304).
+        """
+        with self._lock:
+            return {'endpoints': [
+                {'metodo': metodo, 'endpoint': endpoint, 'status': dict(m.status),
+                 'bytes_enviados': m.bytes_enviados, 'bytes_recebidos': m.bytes_recebidos,
+                 'bytes_rede': m.bytes_rede,
+                 'taxa_compressao': round(m.bytes_recebidos / m.bytes_rede, 3) if m.bytes_rede else 0.0,
+                 'retentativas': m.retentativas,
+                 'fases': {fase: h.para_dict() for fase, h in m.fases.items()}}
+                for (metodo, endpoint), m in sorted(self._endpoints.items())
+            ]}
+
+    def prometheus(self):
+        """
+        Retorna as métricas no formato de exposição de texto do Prometheus (versão 0.0.4).
+        """
+        linhas = [
+            '# HELP orcrim_http_duracao_segundos Duração das requisições HTTP por fase.',
+            '# TYPE orcrim_http_duracao_segundos histogram',
+        ]
+        contadores = {
+            'orcrim_http_requisicoes_total': [], 'orcrim_http_bytes_enviados_total': [],
+            'orcrim_http_bytes_recebidos_total': [], 'orcrim_http_bytes_rede_total': [],
+            'orcrim_http_retentativas_total': [],
+        }
+        with self._lock:
+            for (metodo, endpoint), m in sorted(self._endpoints.items()):
+                rotulos = f'metodo="{metodo}",endpoint="{_escapar(endpoint)}"'
+                for fase, h in m.fases.items():
+                    base = f'{rotulos},fase="{fase}"'
+                    acumulado = 0
+                    for limite, contagem in zip(self.limites, h.contagens):
+                        acumulado += contagem
+                        linhas.append(f'orcrim_http_duracao_segundos_bucket{{{base},le="{limite}"}} {acumulado}')
+                    linhas.append(f'orcrim_http_duracao_segundos_bucket{{{base},le="+Inf"}} {h.contagem}')
+                    linhas.append(f'orcrim_http_duracao_segundos_sum{{{base}}} {h.soma}')
+                    linhas.append(f'orcrim_http_duracao_segundos_count{{{base}}} {h.contagem}')
+                for status, contagem in sorted(m.status.items()):
+                    contadores['orcrim_http_requisicoes_total'].append(f'{{{rotulos},status="{status}"}} {contagem}')
+                contadores['orcrim_http_bytes_enviados_total'].append(f'{{{rotulos}}} {m.bytes_enviados}')
+                contadores['orcrim_http_bytes_recebidos_total'].append(f'{{{rotulos}}} {m.bytes_recebidos}')
+                contadores['orcrim_http_bytes_rede_total'].append(f'{{{rotulos}}} {m.bytes_rede}')
+                contadores['orcrim_http_retentativas_total'].append(f'{{{rotulos}}} {m.retentativas}')
+        for nome, amostras in contadores.items():
+            linhas.append(f'# TYPE {nome} counter')
+            linhas.extend(nome + amostra for amostra in amostras)
+        return '\n'.join(linhas) + '\n'
+
+
+def _escapar(valor):
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_metricas_padrao = None
+_metricas_lock = threading.Lock()
+
+
+def obter_metricas_padrao():
+    """
+    Retorna o registro de métricas compartilhado pelo processo, criando-o na primeira chamada.
+    """
+    global _metricas_padrao
+    if _metricas_padrao is None:
+        with _metricas_lock:
+            if _metricas_padrao is None:
+                _metricas_padrao = RegistroMetricas()
+    return _metricas_padrao
@@ -1,9 +1,58 @@
 import json
 import logging
 from API_orcrim.api_client import ApiClient
+from API_orcrim.documentos import extrair_documentos
+from API_orcrim.domain import DomainRegistry
 
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+_codificar = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+class _ObjetoDominio:
+
+    """
+    Base dos objetos de domínio (UF, município, sexo, nacionalidade, orcrim) usados por Pessoa.
+
+    As instâncias obtidas por obter() são compartilhadas: todas as pessoas do DF apontam para o
+    mesmo objeto Uf, e o JSON de cada objeto é calculado uma única vez. Por isso essas
+    instâncias não devem ser alteradas depois de criadas.
+    """
+
+    __slots__ = ('_dict', '_json')
+    _campos = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._instancias = {}
+
+    @classmethod
+    def obter(cls, *valores):
+        """
+        Retorna a instância compartilhada para os valores informados, criando-a se necessário.
+        """
+        instancia = cls._instancias.get(valores)
+        if instancia is None:
+            instancia = cls._instancias.setdefault(valores, cls(*valores))
+        return instancia
+
+    def to_dict(self):
+        try:
+            return self._dict.copy()
+        except AttributeError:
+            self._dict = {campo: getattr(self, campo) for campo in self._campos}
+            return self._dict.copy()
+
+    def to_json(self):
+        try:
+            return self._json
+        except AttributeError:
+            self._json = _codificar(self.to_dict())
+            return self._json
+
+    def __reduce__(self):
+        # Ao desserializar (ex.: em outro processo), volta a usar a instância compartilhada.
+        return type(self).obter, tuple(getattr(self, campo) for campo in self._campos)
 
 
 class Pessoa:
@@ -14,10 +63,10 @@ class Pessoa:
 
     Atributos:
         nome (str): Nome da pessoa.
-        dataNascimento (str): Data de nascimento da pessoa no formato 'AAAA-MM-DD'.
+        dataNascimento (str): Data de nascimento da pessoa no formato 'DD/MM/AAAA'.
         nomeMae (str): Nome da mãe da pessoa.
         nomePai (str): Nome do pai da pessoa.
-        obito (bool): Indica se a pessoa está morta.
+        obito (str): Indica se a pessoa está morta ('S', 'N' ou vazio).
         municipio (Municipio): O município de residência da pessoa.
         uf (Uf): A unidade federativa de residência da pessoa.
         sexo (Sexo): O sexo da pessoa.
@@ -32,7 +81,7 @@ class Pessoa:
         to_json: Retorna uma string JSON representando a pessoa.
     """
 
-    class Municipio:
+    class Municipio(_ObjetoDominio):
 
         """
         Representa um município.
@@ -42,122 +91,203 @@ class Pessoa:
             nome (str): Nome do município.
         """
 
+        __slots__ = ('id', 'nome')
+        _campos = __slots__
+
         def __init__(self, id, nome):
             self.id = id
             self.nome = nome
-
-        def to_dict(self):
-            return vars(self)
         
-    class Uf:
-
+    class Uf(_ObjetoDominio):
+        __slots__ = ('id', 'nome', 'sigla')
+        _campos = __slots__
 
         def __init__(self, id, nome, sigla):
             self.id = id
             self.nome = nome
             self.sigla = sigla
-
-        def to_dict(self):
-            return vars(self)
         
     class Alcunhas:
+        __slots__ = ('alcunha', 'dataAlcunha')
+
         def __init__(self, alcunha, dataAlcunha):
             self.alcunha = alcunha
             self.dataAlcunha = dataAlcunha
             
         def to_dict(self):
-            return vars(self)
+            return {'alcunha': self.alcunha, 'dataAlcunha': self.dataAlcunha}
+
+        def to_json(self):
+            return _codificar(self.to_dict())
         
     class Cpfs:
+        __slots__ = ('cpf',)
+
         def __init__(self, cpf):
             self.cpf = cpf
 
         def to_dict(self):
-            return vars(self)
+            return {'cpf': self.cpf}
         
     class Rgs:
+        __slots__ = ('rg', 'ufRg')
+
         def __init__(self, rg, ufRg):
             self.rg = rg
             self.ufRg = ufRg
 
-        
         def to_dict(self):
-            # Cria uma cópia do dicionário de atributos para não alterar o objeto original
-            rgs_dict = vars(self).copy()
-            # Atualiza a cópia do dicionário com a representação em dicionário de UFRg
-            rgs_dict['ufRg'] = self.ufRg.to_dict()
-            return rgs_dict
+            return {'rg': self.rg, 'ufRg': self.ufRg.to_dict()}
+
+        def to_json(self):
+            return '{"rg":' + _codificar(self.rg) + ',"ufRg":' + self.ufRg.to_json() + '}'
         
 
-    class Sexo:
+    class Sexo(_ObjetoDominio):
+        __slots__ = ('id', 'nome')
+        _campos = __slots__
+
         def __init__(self, id, nome):
             self.id = id
             self.nome = nome
 
-        def to_dict(self):
-            return vars(self)
 
+    class Orcrim(_ObjetoDominio):
+        __slots__ = ('id', 'nome', 'sigla')
+        _campos = __slots__
 
-    class Orcrim:
         def __init__(self, id, nome, sigla):
             self.id = id
             self.nome = nome
             self.sigla = sigla
-
-        def to_dict(self):
-            return vars(self)
         
-    class Nacionalidade:
+    class Nacionalidade(_ObjetoDominio):
+        __slots__ = ('id', 'nome')
+        _campos = __slots__
+
         def __init__(self, id, nome):
             self.id = id
             self.nome = nome
 
-        def to_dict(self):
-            return vars(self)
-
+    __slots__ = ('nome', 'dataNascimento', 'nomeMae', 'nomePai', 'obito', 'municipio', 'uf', 'sexo',
+                 'nacionalidade', 'alcunhas', 'cpfs', 'rgs', 'orcrim')
 
-    
     def __init__(self, nome=None, dataNascimento=None, nomeMae=None, nomePai=None, obito=None, municipio_id=None, municipio_nome=None,
                  uf_id=None, uf_nome=None, uf_sigla=None, sexo_id=None, sexo_nome=None, nacionalidade_id=None, nacionalidade_nome=None,
-                 alcunhas=None, cpfs=None, rgs=None, orcrim=None):
+                 alcunhas=None, cpfs=None, rgs=None, orcrim=None, uf=None, municipio=None, sexo=None,
+                 nacionalidade=None, dominio=None):
         
         """
         Inicializa uma instância da classe Pessoa com informações detalhadas.
 
         Todos os parâmetros são opcionais, permitindo a criação de uma instância de Pessoa
         com diferentes níveis de detalhamento.
+
+        Em vez de informar id, nome e sigla separadamente, uf, municipio, sexo e nacionalidade
+        podem receber um id, sigla ou nome (ex.: uf='DF', municipio='Brasilia'), resolvidos nas
+        tabelas de domínio. Itens de orcrim também podem ser id ou sigla em vez de dicionário.
+
+        Parâmetros adicionais:
+            dominio (DomainRegistry): Registro de tabelas de domínio. Se omitido, usa o
+                registro padrão (snapshots de jsonBase/1/).
+
+        Levanta:
+            ValueError: Se um valor de domínio não for encontrado ou for ambíguo.
         """
-        logging.info(f"Criando nova instância de Pessoa: {nome}") 
+        logger.debug("Criando nova instância de Pessoa: %s", nome)
         self.nome = nome
         self.dataNascimento = dataNascimento if dataNascimento else ''
         self.nomeMae = nomeMae if nomeMae else ''
         self.nomePai = nomePai if nomePai else ''
         self.obito = obito if obito is not None else ''  
 
+        # Valores de domínio informados por id/sigla/nome são resolvidos nos índices do registro.
+        if uf is not None or municipio is not None or sexo is not None or nacionalidade is not None or \
+                (orcrim and not all(isinstance(o, dict) for o in orcrim)):
+            dominio = dominio or DomainRegistry.padrao()
+            if uf is not None:
+                uf_id, uf_nome, uf_sigla = (dominio.uf(uf)[k] for k in ('id', 'nome', 'sigla'))
+            if municipio is not None:
+                registro_municipio = dominio.municipio(municipio, uf=uf_id)
+                municipio_id, municipio_nome = registro_municipio['id'], registro_municipio['nome']
+            if sexo is not None:
+                sexo_id, sexo_nome = (dominio.sexo(sexo)[k] for k in ('id', 'nome'))
+            if nacionalidade is not None:
+                nacionalidade_id, nacionalidade_nome = (dominio.nacionalidade(nacionalidade)[k] for k in ('id', 'nome'))
+            if orcrim:
+                orcrim = [o if isinstance(o, dict) else dominio.orcrim(o) for o in orcrim]
+
         # Para os atributos compostos por outras classes, verifica a existência dos dados antes da criação.
-        self.municipio = self.Municipio(municipio_id, municipio_nome) if municipio_id and municipio_nome else None
-        self.uf = self.Uf(uf_id, uf_nome, uf_sigla) if uf_id and uf_nome and uf_sigla else None
-        self.sexo = self.Sexo(sexo_id, sexo_nome) if sexo_id and sexo_nome else None
-        self.nacionalidade = self.Nacionalidade(nacionalidade_id, nacionalidade_nome) if nacionalidade_id and nacionalidade_nome else None
+        # Objetos de domínio são compartilhados entre pessoas (veja _ObjetoDominio.obter).
+        self.municipio = self.Municipio.obter(municipio_id, municipio_nome) if municipio_id and municipio_nome else None
+        self.uf = self.Uf.obter(uf_id, uf_nome, uf_sigla) if uf_id and uf_nome and uf_sigla else None
+        self.sexo = self.Sexo.obter(sexo_id, sexo_nome) if sexo_id and sexo_nome else None
+        self.nacionalidade = self.Nacionalidade.obter(nacionalidade_id, nacionalidade_nome) if nacionalidade_id and nacionalidade_nome else None
 
         # Para listas, mantém a lógica de verificação e criação a partir dos dados fornecidos.
         self.alcunhas = [self.Alcunhas(a['alcunha'], a['dataAlcunha']) for a in alcunhas] if alcunhas else []
         self.cpfs = [self.Cpfs(c) for c in cpfs] if cpfs else []
-        self.rgs = [self.Rgs(rg['rg'], self.Uf(rg['ufRg']['id'], rg['ufRg']['nome'], rg['ufRg']['sigla'])) for rg in rgs] if rgs and self.uf else []
-        self.orcrim = [self.Orcrim(o['id'], o['nome'], o['sigla']) for o in orcrim] if orcrim else []
+        self.rgs = [self.Rgs(rg['rg'], self.Uf.obter(rg['ufRg']['id'], rg['ufRg']['nome'], rg['ufRg']['sigla'])) for rg in rgs] if rgs and self.uf else []
+        self.orcrim = [self.Orcrim.obter(o['id'], o['nome'], o['sigla']) for o in orcrim] if orcrim else []
 
-    def to_dict(self):
+    @classmethod
+    def from_api_response(cls, resposta):
 
         """
-        Converte a pessoa e seus atributos para um dicionário.
+        Cria uma Pessoa a partir do detalhe devolvido pelo GET de personalidade.
+
+        O detalhe tem outro formato que o do POST: os dados ficam em "dadosPessoais", CPFs e RGs
+        vêm em "documentos" (tipoDocumento 9 = CPF, 14 = RG) e as organizações em
+        "dadosPessoaisOrcrim" (idOrcrim, nomeOrcrim, siglaOrcrim). Os valores de domínio já vêm
+        completos na resposta, então não há consulta às tabelas de domínio.
+
+        Parâmetros:
+            resposta (dict, bytes, str, requests.Response): Detalhe completo, só o objeto
+                dadosPessoais, o corpo JSON ainda não decodificado ou a resposta HTTP.
 
         Retorna:
-            dict: Um dicionário contendo todos os atributos da pessoa e seus valores,
-            incluindo os detalhes das entidades relacionadas como listas de dicionários.
+            Pessoa: Pessoa equivalente, pronta para to_registro()/to_json().
+        """
+        if hasattr(resposta, 'content'):
+            resposta = resposta.content
+        if isinstance(resposta, (bytes, bytearray, str)):
+            resposta = json.loads(resposta)
+        pessoais = resposta.get('dadosPessoais', resposta)
+        municipio = pessoais.get('municipio') or {}
+        uf = pessoais.get('uf') or {}
+        sexo = pessoais.get('sexo') or {}
+        nacionalidade = pessoais.get('nacionalidade') or {}
+
+        documentos_cpf, documentos_rg = extrair_documentos(pessoais.get('documentos'))
+        cpfs = list(pessoais.get('cpfs') or ()) + [cpf.numero for cpf in documentos_cpf]
+        rgs = list(pessoais.get('rgs') or ()) + [
+            {'rg': rg.numero, 'ufRg': {'id': rg.uf.get('id'), 'nome': rg.uf.get('nome'), 'sigla': rg.uf.get('sigla')}}
+            for rg in documentos_rg]
+
+        return cls(
+            nome=pessoais.get('nome'), dataNascimento=pessoais.get('dataNascimento'), nomeMae=pessoais.get('nomeMae'),
+            nomePai=pessoais.get('nomePai'), obito=pessoais.get('obito'),
+            municipio_id=municipio.get('id'), municipio_nome=municipio.get('nome'),
+            uf_id=uf.get('id'), uf_nome=uf.get('nome'), uf_sigla=uf.get('sigla'),
+            sexo_id=sexo.get('id'), sexo_nome=sexo.get('nome'),
+            nacionalidade_id=nacionalidade.get('id'), nacionalidade_nome=nacionalidade.get('nome'),
+            alcunhas=[{'alcunha': a.get('alcunha'), 'dataAlcunha': a.get('dataAlcunha') or ''}
+                      for a in pessoais.get('alcunhas') or ()],
+            cpfs=[c for c in cpfs if c],
+            rgs=[rg for rg in rgs if rg.get('rg') and (rg.get('ufRg') or {}).get('id')],
+            orcrim=[{'id': o.get('idOrcrim'), 'nome': o.get('nomeOrcrim'), 'sigla': o.get('siglaOrcrim')}
+                    for o in pessoais.get('dadosPessoaisOrcrim') or ()] + list(pessoais.get('orcrims') or ()),
+        )
+
+    def to_registro(self):
+
+        """
+        Converte a pessoa para o dicionário de um único item da lista "data" do POST.
+
+        Retorna:
+            dict: Um dicionário com os atributos da pessoa, sem o envelope {"data": [...]}.
         """
-        pessoa_dict = {"data":
-        [
-        {
+        return {
         "nome": self.nome,
         "dataNascimento": self.dataNascimento,
         "nomeMae": self.nomeMae,
@@ -168,17 +298,98 @@ class Pessoa:
         "sexo": self.sexo.to_dict() if self.sexo else {},
         "nacionalidade": self.nacionalidade.to_dict() if self.nacionalidade else {},
         "alcunhas": [a.to_dict() for a in self.alcunhas],
-        "cpfs": [c.to_dict()["cpf"] for c in self.cpfs],
+        "cpfs": [c.cpf for c in self.cpfs],
         "rgs": [r.to_dict() for r in self.rgs],
         "orcrims": [o.to_dict() for o in self.orcrim],
     }
-    ]
-    }
+
+    def to_dict(self):
+
+        """
+        Converte a pessoa e seus atributos para um dicionário.
+
+        Retorna:
+            dict: Um dicionário contendo todos os atributos da pessoa e seus valores,
+            incluindo os detalhes das entidades relacionadas como listas de dicionários.
+        """
+        pessoa_dict = {"data": [self.to_registro()]}
         return pessoa_dict
 
+    def to_registro_json(self):
+
+        """
+        Serializa o item da lista "data" diretamente em JSON, sem montar dicionários intermediários.
+
+        O JSON dos objetos de domínio compartilhados é reaproveitado entre pessoas.
+
+        Retorna:
+            str: JSON equivalente a json.dumps(self.to_registro()), em forma compacta.
+        """
+        c = _codificar
+        return ''.join((
+            '{"nome":', c(self.nome),
+            ',"dataNascimento":', c(self.dataNascimento),
+            ',"nomeMae":', c(self.nomeMae),
+            ',"nomePai":', c(self.nomePai),
+            ',"obito":', c(self.obito if self.obito else ""),
+            ',"municipio":', self.municipio.to_json() if self.municipio else '{}',
+            ',"uf":', self.uf.to_json() if self.uf else '{}',
+            ',"sexo":', self.sexo.to_json() if self.sexo else '{}',
+            ',"nacionalidade":', self.nacionalidade.to_json() if self.nacionalidade else '{}',
+            ',"alcunhas":[', ','.join([a.to_json() for a in self.alcunhas]),
+            '],"cpfs":', c([cpf.cpf for cpf in self.cpfs]),
+            ',"rgs":[', ','.join([r.to_json() for r in self.rgs]),
+            '],"orcrims":[', ','.join([o.to_json() for o in self.orcrim]),
+            ']}',
+        ))
+
+    def to_json(self):
+
+        """
+        Retorna uma string JSON com o corpo do POST ({"data": [...]}) representando a pessoa.
+        """
+        return '{"data":[' + self.to_registro_json() + ']}'
+
+    def to_json_bytes(self):
+
+        """
+        Retorna o corpo do POST já codificado em UTF-8, pronto para envio.
+        """
+        return self.to_json().encode('utf-8')
+
     
-    def post_personalidade(self):
-        api = ApiClient()
+    def post_personalidade(self, api=None):
+        api = api or _api_padrao()
         corpo_json= self.to_dict()
         resposta = api.post_personalidade(corpo_json)
         return resposta
+
+    @staticmethod
+    def post_personalidades(pessoas, batch_size=50, api=None):
+
+        """
+        Cria várias pessoas em lotes. Veja ApiClient.post_personalidades.
+
+        Parâmetros:
+            pessoas (iterable): Instâncias de Pessoa.
+            batch_size (int): Quantidade máxima de pessoas por requisição.
+            api (ApiClient): Cliente a ser usado. Se omitido, usa o cliente compartilhado do módulo.
+
+        Retorna:
+            generator: Um ResultadoRegistro por pessoa.
+        """
+        api = api or _api_padrao()
+        return api.post_personalidades(pessoas, batch_size=batch_size)
+
+
+_api = None
+
+
+def _api_padrao():
+    """
+    Retorna o ApiClient compartilhado pelas instâncias de Pessoa, criando-o na primeira chamada.
+    """
+    global _api
+    if _api is None:
+        _api = ApiClient()
+    return _api
@@ -0,0 +1,149 @@
+import email.utils
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LimitadorTaxa:
+    """
+    Limitador de taxa (token bucket) compartilhado entre threads, com ajuste adaptativo.
+
+    Cada requisição consome um token; os tokens são repostos a 'taxa' por segundo, até o limite
+    'rajada'. Quando o servidor responde 429/503, a taxa é reduzida multiplicativamente e todas
+    as threads pausam até o fim do Retry-After; a cada resposta bem-sucedida a taxa volta a
+    subir aos poucos (aumento aditivo), até taxa_maxima. Assim o cliente converge para a maior
+    vazão que o servidor aceita sem que os workers disputem entre si.
+
+    Atributos:
+        taxa (float): Taxa atual, em requisições por segundo.
+        taxa_minima (float): Piso da taxa após reduções.
+        taxa_maxima (float): Teto da taxa após aumentos.
+        rajada (int): Quantidade máxima de tokens acumulados.
+
+    Métodos:
+        adquirir(): Bloqueia até haver um token disponível; retorna o tempo esperado.
+        penalizar(espera): Reduz a taxa e pausa todas as threads por 'espera' segundos.
+        recompensar(): Aumenta a taxa após uma resposta bem-sucedida.
+    """
+
+    def __init__(self, taxa_maxima=20.0, rajada=20, taxa_minima=0.5, fator_reducao=0.5, incremento=1.0,
+                 intervalo_reducao=1.0):
+        """
+        Parâmetros:
+            taxa_maxima (float): Requisições por segundo permitidas quando não há rejeições.
+            rajada (int): Tokens acumuláveis (requisições que podem sair de uma vez).
+            taxa_minima (float): Menor taxa a que as reduções podem levar.
+            fator_reducao (float): Multiplicador aplicado à taxa a cada 429/503.
+            incremento (float): Aumento aproximado da taxa, em req/s, por segundo de respostas boas.
+            intervalo_reducao (float): Segundos mínimos entre duas reduções; rejeições de requisições
+                que já estavam em voo na mesma rajada contam como uma só.
+        """
+        self.taxa_maxima = taxa_maxima
+        self.taxa_minima = taxa_minima
+        self.taxa = taxa_maxima
+        self.rajada = rajada
+        self.fator_reducao = fator_reducao
+        self.incremento = incremento
+        self.intervalo_reducao = intervalo_reducao
+        self._ultima_reducao = float('-inf')
+        self._tokens = float(rajada)
+        self._ultimo = time.monotonic()
+        self._pausa_ate = 0.0
+        self._lock = threading.Lock()
+
+    def adquirir(self):
+        """
+        Reserva um token e dorme o necessário até que ele esteja disponível.
+
+        Retorna:
+            float: Segundos esperados.
+        """
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(self.rajada, self._tokens + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._tokens -= 1
+            espera = -self._tokens / self.taxa if self._tokens < 0 else 0.0
+            espera = max(espera, self._pausa_ate - agora)
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def penalizar(self, espera=None):
+        """
+        Registra uma rejeição por sobrecarga (429/503).
+
+        Parâmetros:
+            espera (float): Segundos indicados pelo servidor (Retry-After) durante os quais
+                nenhuma thread deve enviar requisições.
+        """
+        with self._lock:
+            agora = time.monotonic()
+            if espera:
+                self._pausa_ate = max(self._pausa_ate, agora + espera)
+            self._tokens = min(self._tokens, 0.0)  # Sem rajada logo após a rejeição.
+            if agora - self._ultima_reducao < self.intervalo_reducao:
+                return
+            self._ultima_reducao = agora
+            self.taxa = max(self.taxa_minima, self.taxa * self.fator_reducao)
+        logger.warning("Servidor sobrecarregado: taxa reduzida para %.2f req/s.", self.taxa)
+
+    def recompensar(self):
+        with self._lock:
+            if self.taxa < self.taxa_maxima:
+                self.taxa = min(self.taxa_maxima, self.taxa + self.incremento / self.taxa)
+
+
+class PoliticaRetentativa:
+    """
+    Política de retentativas com backoff exponencial e jitter ("full jitter").
+
+    Atributos:
+        max_tentativas (int): Total de tentativas, incluindo a primeira.
+        base (float): Espera base, em segundos, da primeira retentativa.
+        maximo (float): Limite superior da espera calculada.
+        status (frozenset): Códigos HTTP que justificam nova tentativa.
+    """
+
+    def __init__(self, max_tentativas=5, base=0.5, maximo=30.0, status=(429, 502, 503, 504)):
+        self.max_tentativas = max_tentativas
+        self.base = base
+        self.maximo = maximo
+        self.status = frozenset(status)
+
+    def espera(self, tentativa, retry_after=None):
+        """
+        Calcula quanto esperar antes da próxima tentativa.
+
+        Parâmetros:
+            tentativa (int): Número da tentativa que falhou (1 para a primeira).
+            retry_after (float): Espera exigida pelo servidor, se houver; nunca é encurtada.
+
+        Retorna:
+            float: Segundos a esperar.
+        """
+        calculada = random.uniform(0, min(self.maximo, self.base * 2 ** (tentativa - 1)))
+        return max(calculada, retry_after or 0.0)
+
+
+def ler_retry_after(valor):
+    """
+    Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos a partir de agora.
+
+    Retorna:
+        float: Segundos a esperar, ou None se o valor estiver ausente ou for inválido.
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = email.utils.parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, data.timestamp() - time.time())
@@ -0,0 +1,155 @@
+import json
+
+_ESPACOS = ' \t\n\r'
+
+
+class _LeitorIncremental:
+    """
+    Leitor de JSON em blocos, que decodifica um valor por vez a partir de um arquivo texto.
+
+    Mantém em memória apenas o bloco atual e o valor em decodificação; o trecho já consumido
+    é descartado do buffer.
+    """
+
+    def __init__(self, arquivo, tamanho_bloco):
+        self.arquivo = arquivo
+        self.tamanho_bloco = tamanho_bloco
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.fim = False
+
+    def _ler_bloco(self):
+        bloco = self.arquivo.read(self.tamanho_bloco)
+        if not bloco:
+            self.fim = True
+            return False
+        self.buffer = self.buffer[self.pos:] + bloco
+        self.pos = 0
+        return True
+
+    def caractere(self):
+        """
+        Retorna o próximo caractere que não seja espaço, sem consumi-lo ('' no fim do arquivo).
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _ESPACOS:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._ler_bloco():
+                return ''
+
+    def consumir(self, esperado):
+        c = self.caractere()
+        if c != esperado:
+            raise ValueError(f"JSON inválido: esperado '{esperado}', encontrado '{c or 'fim do arquivo'}'.")
+        self.pos += 1
+
+    def valor(self):
+        """
+        Decodifica e retorna o próximo valor JSON, lendo mais blocos enquanto ele estiver incompleto.
+        """
+        self.caractere()
+        while True:
+            try:
+                valor, fim = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._ler_bloco():
+                    continue
+                raise
+            # Números no fim do buffer podem estar truncados; só confia se houver mais texto depois.
+            if fim == len(self.buffer) and not self.fim and not isinstance(valor, (dict, list, str)):
+                if self._ler_bloco():
+                    continue
+            self.pos = fim
+            return valor
+
+
+def iter_registros(caminho, chave='data', tamanho_bloco=1 << 16):
+    """
+    Percorre os itens da lista "data" de um arquivo JSON grande sem carregá-lo inteiro.
+
+    Aceita tanto o envelope da API ({"data": [...], ...}) quanto uma lista no nível raiz.
+    Outras chaves do envelope são lidas e descartadas.
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo JSON.
+        chave (str): Chave do envelope que contém a lista.
+        tamanho_bloco (int): Quantidade de caracteres lidos por vez.
+
+    Retorna:
+        generator: Cada item da lista (normalmente um dict), na ordem do arquivo.
+
+    Levanta:
+        ValueError: Se o arquivo não for um JSON no formato esperado.
+    """
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        leitor = _LeitorIncremental(arquivo, tamanho_bloco)
+        inicio = leitor.caractere()
+        if inicio == '{':
+            leitor.consumir('{')
+            while True:
+                if leitor.caractere() == '}':
+                    return
+                nome = leitor.valor()
+                leitor.consumir(':')
+                if nome == chave:
+                    break
+                leitor.valor()  # Valor de outra chave: descartado.
+                if leitor.caractere() == ',':
+                    leitor.consumir(',')
+        elif inicio != '[':
+            raise ValueError(f"JSON inválido: esperado objeto ou lista, encontrado '{inicio}'.")
+
+        leitor.consumir('[')
+        if leitor.caractere() == ']':
+            return
+        while True:
+            yield leitor.valor()
+            if leitor.caractere() == ',':
+                leitor.consumir(',')
+            else:
+                leitor.consumir(']')
+                return
+
+
+def iter_uuids(caminho, tamanho_bloco=1 << 16):
+    """
+    Percorre um arquivo de UUIDs de personalidades, com memória constante.
+
+    Parâmetros:
+        caminho (str): Arquivo no formato {"data": [{"uuid": ..., "dataAtualizacao": ...}]}.
+        tamanho_bloco (int): Quantidade de caracteres lidos por vez.
+
+    Retorna:
+        generator: Tuplas (uuid, dataAtualizacao).
+
+    Exemplo de uso:
+    >>> for uuid, data_atualizacao in iter_uuids('personalidades.json'):
+    ...     print(uuid, data_atualizacao)
+    """
+    for item in iter_registros(caminho, tamanho_bloco=tamanho_bloco):
+        yield item['uuid'], item.get('dataAtualizacao')
+
+
+def iter_linhas_json(caminho):
+    """
+    Percorre um arquivo JSON Lines (um objeto por linha), como a saída de 'python -m API_orcrim hidratar'.
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo; '-' lê da entrada padrão. Linhas em branco são ignoradas.
+
+    Retorna:
+        generator: Cada objeto, na ordem do arquivo.
+    """
+    if caminho == '-':
+        import sys
+        for linha in sys.stdin:
+            if linha.strip():
+                yield json.loads(linha)
+        return
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
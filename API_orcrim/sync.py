@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, List, Optional
+from API_orcrim import buscar_personalidade
+from API_orcrim.api_client import ApiClient
+from API_orcrim.token import TokenManager
+from API_orcrim.stream import iter_uuids
+from API_orcrim.datas import DATA_INICIAL, converter_data, formatar_data
+from API_orcrim.janelas import buscar_personalidade_janelas
+
+logger = logging.getLogger(__name__)
+
+
+def salvar_json_atomico(caminho, dados):
+    """
+    Grava um JSON em um arquivo temporário e o renomeia sobre o destino, para que uma
+    interrupção no meio da escrita não corrompa o arquivo anterior.
+    """
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w') as arquivo:
+        json.dump(dados, arquivo)
+    os.replace(temporario, caminho)
+
+
+class ResultadoSincronizacao(NamedTuple):
+    """
+    Resumo de uma execução de SincronizadorIncremental.sincronizar.
+
+    Atributos:
+        novos (list[str]): UUIDs que ainda não eram conhecidos.
+        alterados (list[str]): UUIDs conhecidos cuja dataAtualizacao mudou.
+        falhas (list[str]): UUIDs cujo detalhamento falhou e será repetido na próxima execução.
+        marca_dagua (str): Maior dataAtualizacao conhecida após a execução.
+    """
+    novos: List[str]
+    alterados: List[str]
+    falhas: List[str]
+    marca_dagua: Optional[str]
+
+
+class SincronizadorIncremental:
+    """
+    Sincroniza a lista de UUIDs de personalidades de forma incremental.
+
+    Guarda a maior dataAtualizacao já vista (marca d'água) e, a cada execução, consulta apenas a
+    janela desde essa marca, recuada por uma pequena sobreposição para não perder registros
+    gravados durante a execução anterior. Somente UUIDs novos ou com dataAtualizacao diferente
+    da conhecida são detalhados.
+
+    O arquivo de UUIDs mantém o mesmo formato devolvido pela API ({"data": [{"uuid", "dataAtualizacao"}]}),
+    e o arquivo de estado guarda a marca d'água e os UUIDs cujo detalhamento falhou.
+
+    Exemplo de uso:
+    >>> sincronizador = SincronizadorIncremental('json/personalidade.json', 'json/sincronizacao.json')
+    >>> resultado = sincronizador.sincronizar(processar=lambda uuid, resposta: salvar(uuid, resposta.json()))
+    >>> print(len(resultado.novos), len(resultado.alterados))
+    """
+
+    # Janelas maiores que isso são buscadas com buscar_personalidade_janelas.
+    periodo_janelas = datetime.timedelta(days=90)
+
+    def __init__(self, caminho_uuids='json/personalidade.json', caminho_estado='json/sincronizacao.json',
+                 sobreposicao=datetime.timedelta(minutes=10), token_manager=None, transporte=None,
+                 base_url=None):
+        """
+        Parâmetros:
+            caminho_uuids (str): Arquivo com a lista de UUIDs e dataAtualizacao conhecidos.
+            caminho_estado (str): Arquivo com a marca d'água e as pendências de detalhamento.
+            sobreposicao (timedelta): Quanto recuar a janela em relação à marca d'água.
+            token_manager (TokenManager): Gerenciador de tokens. Se omitido, usa as credenciais padrão.
+            transporte (HttpTransport): Transporte HTTP repassado a buscar_personalidade.
+            base_url (str): URL base da API. Se omitida, usa a do ambiente configurado.
+        """
+        self.caminho_uuids = caminho_uuids
+        self.caminho_estado = caminho_estado
+        self.sobreposicao = sobreposicao
+        self.token_manager = token_manager
+        self.transporte = transporte
+        self.base_url = base_url
+
+    def carregar_conhecidos(self):
+        """
+        Retorna o dicionário uuid -> dataAtualizacao do arquivo de UUIDs (vazio se não existir).
+        """
+        if not os.path.exists(self.caminho_uuids):
+            return {}
+        return dict(iter_uuids(self.caminho_uuids))
+
+    def carregar_estado(self):
+        """
+        Retorna o estado salvo ({'marcaDagua': str ou None, 'pendentes': list}).
+        """
+        if not os.path.exists(self.caminho_estado):
+            return {'marcaDagua': None, 'pendentes': []}
+        with open(self.caminho_estado, 'r') as arquivo:
+            estado = json.load(arquivo)
+        estado.setdefault('marcaDagua', None)
+        estado.setdefault('pendentes', [])
+        return estado
+
+    def janela(self, marca_dagua, agora=None):
+        """
+        Calcula a janela (data_inicio, data_fim) a consultar a partir da marca d'água.
+        """
+        agora = agora or datetime.datetime.now()
+        if marca_dagua is None:
+            return DATA_INICIAL, formatar_data(agora)
+        inicio = converter_data(marca_dagua) - self.sobreposicao
+        return formatar_data(inicio), formatar_data(agora)
+
+    def _buscar_lista(self, data_inicio, data_fim):
+        if self.token_manager is None:
+            self.token_manager = TokenManager(transporte=self.transporte)
+        if converter_data(data_fim) - converter_data(data_inicio) > self.periodo_janelas:
+            # Períodos longos (ex.: primeira execução) são consultados em janelas paralelas.
+            return buscar_personalidade_janelas(data_inicio, data_fim, token_manager=self.token_manager,
+                                                transporte=self.transporte, base_url=self.base_url)['data']
+        token = self.token_manager.get_access_token()
+        resultado = buscar_personalidade(data_inicio, data_fim, token, transporte=self.transporte,
+                                         base_url=self.base_url)
+        if not isinstance(resultado, dict):
+            raise RuntimeError(f"Falha ao buscar a lista de personalidades: {resultado}")
+        return resultado.get('data') or []
+
+    def sincronizar(self, processar=None, cliente=None, max_concorrencia=8):
+        """
+        Executa uma rodada de sincronização incremental.
+
+        Parâmetros:
+            processar (callable): Função processar(uuid, resposta) chamada com o detalhe de cada
+                UUID novo ou alterado. Se omitida, apenas a lista de UUIDs é atualizada, e os
+                UUIDs novos, alterados e pendentes ficam pendentes para a próxima rodada com processar.
+            cliente (ApiClient): Cliente usado para buscar os detalhes. Se omitido, cria um ApiClient.
+            max_concorrencia (int): Quantidade de detalhes buscados em paralelo.
+
+        Retorna:
+            ResultadoSincronizacao: UUIDs novos, alterados e com falha, e a nova marca d'água.
+
+        Levanta:
+            RuntimeError: Se a consulta da lista de UUIDs falhar; nada é gravado nesse caso.
+        """
+        conhecidos = self.carregar_conhecidos()
+        estado = self.carregar_estado()
+        if estado['marcaDagua'] is None and conhecidos:
+            # Lista gerada antes do modo incremental: a marca d'água é a maior data já conhecida.
+            estado['marcaDagua'] = max(conhecidos.values(), key=converter_data)
+        data_inicio, data_fim = self.janela(estado['marcaDagua'])
+        logger.info("Sincronização incremental de %s até %s.", data_inicio, data_fim)
+
+        recebidos = {item['uuid']: item['dataAtualizacao'] for item in self._buscar_lista(data_inicio, data_fim)}
+        novos = [uuid for uuid in recebidos if uuid not in conhecidos]
+        alterados = [uuid for uuid, data in recebidos.items() if uuid in conhecidos and conhecidos[uuid] != data]
+
+        a_processar = list(dict.fromkeys(novos + alterados + estado['pendentes']))
+        falhas = []
+        # Sem processar, nada foi detalhado: tudo continua pendente, pois a marca d'água avança
+        # além desses UUIDs e eles não voltariam em uma próxima lista.
+        pendentes = a_processar
+        if processar is not None and a_processar:
+            datas = {**conhecidos, **recebidos}
+            falhas = pendentes = self._detalhar([(uuid, datas.get(uuid)) for uuid in a_processar], processar,
+                                                cliente, max_concorrencia)
+
+        marca_dagua = estado['marcaDagua']
+        for data in recebidos.values():
+            if marca_dagua is None or converter_data(data) > converter_data(marca_dagua):
+                marca_dagua = data
+
+        conhecidos.update(recebidos)
+        salvar_json_atomico(self.caminho_uuids,
+                            {'data': [{'uuid': u, 'dataAtualizacao': d} for u, d in conhecidos.items()]})
+        salvar_json_atomico(self.caminho_estado, {'marcaDagua': marca_dagua, 'pendentes': pendentes})
+
+        logger.info("Sincronização concluída: %d novo(s), %d alterado(s), %d falha(s).",
+                    len(novos), len(alterados), len(falhas))
+        return ResultadoSincronizacao(novos, alterados, falhas, marca_dagua)
+
+    def _detalhar(self, itens, processar, cliente, max_concorrencia):
+        """
+        Busca o detalhe de cada (uuid, dataAtualizacao) e o entrega a processar; retorna os UUIDs
+        que falharam. A dataAtualizacao é repassada ao cliente para validar o cache, se houver.
+        """
+        if cliente is None:
+            cliente = ApiClient(transporte=self.transporte, base_url=self.base_url,
+                                token_manager=self.token_manager)
+
+        def detalhar(item):
+            uuid, data_atualizacao = item
+            try:
+                resposta = cliente.get_personalidade(uuid, data_atualizacao)
+                if not resposta.ok:
+                    return uuid
+                processar(uuid, resposta)
+            except Exception as e:
+                logger.error("Erro ao detalhar personalidade %s: %s", uuid, e)
+                return uuid
+            return None
+
+        with ThreadPoolExecutor(max_workers=max_concorrencia) as executor:
+            return [uuid for uuid in executor.map(detalhar, itens) if uuid is not None]
@@ -1,16 +1,28 @@
 
-from config.settings import client_id, client_secret, token_url, scopes
+from config.settings import client_id, client_secret, token_url, scopes, TOKEN_CACHE_DIRETORIO
 import requests
+import threading
 import time
 import logging
+from API_orcrim.token_arquivo import ArmazemTokenArquivo
+from API_orcrim.transport import obter_transporte_padrao
 
-# Configuração básica de logging
-# logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _EstadoToken:
+    """
+    Estado de token compartilhado por todas as instâncias de TokenManager com as mesmas credenciais.
+
+    Atributos:
+        token_data (dict): Token de acesso atual e instante (epoch) de expiração.
+        lock (threading.Lock): Garante que apenas uma renovação ocorra por vez (single-flight).
+    """
+
+    def __init__(self):
+        self.token_data = {'access_token': None, 'expires_at': 0}
+        self.lock = threading.Lock()
 
-logging.basicConfig(level=logging.INFO,
-                    filename='app.log',  # Nome do arquivo de log
-                    filemode='a',  # Modo 'a' append adiciona ao arquivo existente
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 class TokenManager:
     """
@@ -20,18 +32,35 @@ class TokenManager:
     necessários para autenticar chamadas de API. Os tokens são renovados automaticamente
     quando expiram.
 
+    O cache do token é compartilhado por todas as instâncias criadas com as mesmas credenciais,
+    no processo inteiro e entre threads. Quando várias threads encontram o token expirado ao
+    mesmo tempo, apenas uma faz a requisição ao token_url e as demais aguardam o resultado.
+    Dentro da janela de margem_renovacao antes da expiração, o token atual continua sendo
+    devolvido enquanto uma thread em segundo plano busca o próximo.
+
+    Com um armazém em arquivo (ArmazemTokenArquivo), o token também é compartilhado entre
+    processos da mesma máquina: antes de ir ao servidor de autenticação, o processo trava o
+    arquivo e reaproveita o token gravado por outro processo, se ainda for válido.
+
     Atributos:
         client_id (str): O ID do cliente obtido no registro do aplicativo OAuth.
         client_secret (str): O segredo do cliente associado ao ID do cliente.
         token_url (str): A URL completa para solicitar tokens de acesso.
         scopes (str): Uma string de escopos solicitados separados por espaços.
+        margem_renovacao (float): Segundos antes da expiração em que a renovação antecipada começa.
+        armazem (ArmazemTokenArquivo): Cache de token entre processos (None se desativado).
 
     Métodos:
         get_new_access_token(): Solicita um novo token de acesso usando as credenciais do cliente.
         get_access_token(): Retorna um token de acesso válido, solicitando um novo se necessário.
+        invalidar(token): Descarta um token recusado pela API e obtém outro.
     """
 
-    def __init__(self, client_id=client_id, client_secret=client_secret, token_url=token_url, scopes=scopes):
+    _estados = {}
+    _estados_lock = threading.Lock()
+
+    def __init__(self, client_id=client_id, client_secret=client_secret, token_url=token_url, scopes=scopes,
+                 margem_renovacao=60, transporte=None, armazem=None):
         """
         Inicializa uma nova instância do gerenciador de tokens com configurações específicas.
 
@@ -40,12 +69,39 @@ class TokenManager:
             client_secret (str): O segredo do cliente para autenticação OAuth.
             token_url (str): URL para solicitação do token de acesso.
             scopes (str): Escopos de acesso solicitados, separados por espaços.
+            margem_renovacao (float): Segundos antes da expiração em que o token passa a ser
+                renovado em segundo plano.
+            transporte (HttpTransport): Transporte HTTP usado para falar com o servidor de
+                autenticação. Se omitido, usa o transporte compartilhado pelo processo.
+            armazem (ArmazemTokenArquivo): Cache de token compartilhado entre processos. Se omitido,
+                usa um no diretório TOKEN_CACHE_DIRETORIO de config.settings, quando definido.
         """
         self.client_id = client_id
         self.client_secret = client_secret
         self.token_url = token_url
         self.scopes = scopes
-        self.token_data = {'access_token': None, 'expires_at': 0}
+        self.margem_renovacao = margem_renovacao
+        self.transporte = transporte
+        if armazem is None and TOKEN_CACHE_DIRETORIO:
+            try:
+                armazem = ArmazemTokenArquivo(TOKEN_CACHE_DIRETORIO)
+            except OSError as e:
+                logger.warning("Cache de token entre processos desativado: %s", e)
+        self.armazem = armazem
+        self._estado = self._obter_estado(client_id, token_url, scopes)
+        self.token_data = self._estado.token_data
+
+    @classmethod
+    def _obter_estado(cls, client_id, token_url, scopes):
+        """
+        Retorna o estado compartilhado para a combinação de credenciais, criando-o se necessário.
+        """
+        chave = (client_id, token_url, scopes)
+        with cls._estados_lock:
+            estado = cls._estados.get(chave)
+            if estado is None:
+                estado = cls._estados[chave] = _EstadoToken()
+            return estado
 
     def get_new_access_token(self):
         """
@@ -67,15 +123,17 @@ class TokenManager:
             'scope': self.scopes
         }
         try:
-            response = requests.post(self.token_url, data=params)
+            transporte = self.transporte or obter_transporte_padrao()
+            # client_credentials não altera estado no servidor: pode ser repetido com segurança.
+            response = transporte.post(self.token_url, data=params, idempotente=True)
             response.raise_for_status()  # Lança uma exceção para respostas de erro HTTP
             token_info = response.json()
             self.token_data['access_token'] = token_info['access_token']
             self.token_data['expires_at'] = time.time() + token_info['expires_in'] - 30
-            logging.info("Token de acesso atualizado com sucesso.")
+            logger.info("Token de acesso atualizado com sucesso.")
             return token_info['access_token']
         except requests.RequestException as e:
-            logging.error(f"Erro ao solicitar token de acesso: {e}")
+            logger.error("Erro ao solicitar token de acesso: %s", e)
             raise
 
     def get_access_token(self):
@@ -84,15 +142,97 @@ class TokenManager:
 
         Verifica se o token de acesso atual ainda é válido (não expirou) e, se expirou,
         solicita um novo. Isso garante que sempre um token válido seja retornado para uso.
+        Se o token estiver perto de expirar, a renovação é disparada em segundo plano e o
+        token atual é devolvido sem bloquear.
 
         Retorna:
             str: Um token de acesso válido.
         """
-        if self.token_data['access_token'] is None or time.time() > self.token_data['expires_at']:
-            logging.info("Token de acesso expirado ou ausente. Solicitando um novo.")
+        access_token = self.token_data['access_token']
+        expires_at = self.token_data['expires_at']
+        agora = time.time()
+
+        if access_token is not None and agora <= expires_at:
+            if agora > expires_at - self.margem_renovacao:
+                self._renovar_em_segundo_plano()
+            return access_token
+
+        with self._estado.lock:
+            # Outra thread pode ter renovado o token enquanto esta aguardava o lock.
+            if self.token_data['access_token'] is not None and time.time() <= self.token_data['expires_at']:
+                return self.token_data['access_token']
+            logger.info("Token de acesso expirado ou ausente. Solicitando um novo.")
+            return self._renovar()
+
+    def invalidar(self, token):
+        """
+        Descarta um token recusado pela API (HTTP 401) antes da expiração e obtém outro.
+
+        Se outra thread já trocou o token recusado, o atual é devolvido sem nova requisição.
+
+        Parâmetros:
+            token (str): O token de acesso recusado.
+
+        Retorna:
+            str: Um token de acesso diferente do recusado.
+        """
+        with self._estado.lock:
+            if self.token_data['access_token'] not in (None, token):
+                return self.token_data['access_token']
+            logger.info("Token de acesso recusado pela API. Solicitando um novo.")
+            return self._renovar(recusado=token)
+
+    def _renovar(self, antecipada=False, recusado=None):
+        """
+        Obtém um novo token, reaproveitando antes o do armazém entre processos, se houver um válido.
+
+        Parâmetros:
+            antecipada (bool): Renovação dentro da margem; o token do armazém só é aproveitado se
+                estiver fora da margem de renovação.
+            recusado (str): Token recusado pela API; não é reaproveitado do armazém.
+
+        Retorna:
+            str: O token de acesso.
+        """
+        if self.armazem is None:
             return self.get_new_access_token()
-        else:
-            return self.token_data['access_token']
+        chave = (self.client_id, self.token_url, self.scopes)
+        with self.armazem.bloquear(chave):
+            gravado = self.armazem.ler(chave)
+            limite = time.time() + (self.margem_renovacao if antecipada else 0)
+            if gravado is not None and gravado['expires_at'] > limite and gravado['access_token'] != recusado:
+                logger.info("Token de acesso reaproveitado do cache entre processos.")
+                self.token_data.update(gravado)
+                return gravado['access_token']
+            token = self.get_new_access_token()
+            self.armazem.gravar(chave, self.token_data)
+            return token
+
+    def _renovar_em_segundo_plano(self):
+        """
+        Inicia a renovação antecipada do token em uma thread daemon, se nenhuma estiver em curso.
+        """
+        if not self._estado.lock.acquire(blocking=False):
+            return  # Já existe uma renovação em andamento.
+
+        def renovar():
+            try:
+                if time.time() > self.token_data['expires_at'] - self.margem_renovacao:
+                    logger.info("Token de acesso próximo da expiração. Renovando antecipadamente.")
+                    self._renovar(antecipada=True)
+            except (requests.RequestException, OSError):
+                pass  # O erro já foi registrado; a próxima chamada tenta novamente.
+            except KeyError as e:
+                # Resposta 200 sem access_token/expires_in: sem o except a thread morreria em silêncio.
+                logger.error("Resposta do servidor de autenticação sem o campo %s.", e)
+            finally:
+                self._estado.lock.release()
+
+        try:
+            threading.Thread(target=renovar, name='renovacao-token', daemon=True).start()
+        except Exception:
+            self._estado.lock.release()
+            raise
 
 
 #   # Verifica se o token expirou
@@ -0,0 +1,115 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+def _travar(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)  # Tenta por ~10 s antes de levantar OSError.
+            return
+        except OSError:
+            continue
+
+
+def _destravar(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class ArmazemTokenArquivo:
+    """
+    Cache de tokens em arquivo, compartilhado por todos os processos do mesmo usuário na máquina.
+
+    Cada combinação (client_id, token_url, scopes) tem um arquivo JSON com o access_token e o
+    expires_at, gravado de forma atômica com permissão 0600 em um diretório 0700. Um arquivo de
+    trava ao lado (flock no POSIX, msvcrt.locking no Windows) garante que apenas um processo por
+    vez renove o token: os demais esperam a trava e leem o token recém-gravado.
+
+    Só o token de acesso é gravado; o client_secret nunca vai para o disco. Um diretório de outro
+    usuário é recusado (PermissionError), já que ele poderia ler ou trocar os tokens gravados.
+
+    Atributos:
+        diretorio (str): Diretório dos arquivos de token.
+
+    Exemplo de uso:
+    >>> armazem = ArmazemTokenArquivo(os.path.expanduser('~/.cache/orcrim'))
+    >>> TokenManager(armazem=armazem).get_access_token()
+    """
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, mode=0o700, exist_ok=True)
+        if hasattr(os, 'getuid'):
+            dono = os.stat(diretorio).st_uid
+            if dono != os.getuid():
+                raise PermissionError(f"Diretório do cache de token {diretorio} pertence a outro usuário (uid {dono}).")
+        # makedirs não altera um diretório existente, e o modo de um novo passa pela umask.
+        os.chmod(diretorio, 0o700)
+
+    def _caminho(self, chave):
+        nome = hashlib.sha256('\0'.join(map(str, chave)).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.diretorio, f'token-{nome}.json')
+
+    @contextlib.contextmanager
+    def bloquear(self, chave):
+        """
+        Trava exclusiva entre processos para a chave, usada durante a leitura e renovação do token.
+        """
+        fd = os.open(self._caminho(chave) + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            _travar(fd)
+            try:
+                yield
+            finally:
+                _destravar(fd)
+        finally:
+            os.close(fd)
+
+    def ler(self, chave):
+        """
+        Retorna o token gravado ({'access_token', 'expires_at'}), ou None se não houver ou estiver ilegível.
+        """
+        try:
+            with open(self._caminho(chave), 'r', encoding='utf-8') as arquivo:
+                dados = json.load(arquivo)
+            return {'access_token': dados['access_token'], 'expires_at': float(dados['expires_at'])}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Cache de token ilegível em %s: %s", self.diretorio, e)
+            return None
+
+    def gravar(self, chave, token_data):
+        """
+        Grava o token de forma atômica (arquivo temporário 0600 + os.replace).
+        """
+        caminho = self._caminho(chave)
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, prefix='.token-', suffix='.tmp')  # Criado com 0600.
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as arquivo:
+                json.dump({'access_token': token_data['access_token'], 'expires_at': token_data['expires_at']},
+                          arquivo)
+            os.replace(temporario, caminho)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temporario)
+            raise
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from API_orcrim.log import desativar_logging
+from API_orcrim.person import Pessoa
+
+logger = logging.getLogger(__name__)
+
+
+def _corpo(resposta):
+    """
+    Reduz uma resposta ao que é enviado ao processo de trabalho: o corpo em bytes (ou o dicionário
+    já decodificado). Respostas de erro e exceções viram a exceção devolvida como resultado.
+    """
+    if isinstance(resposta, BaseException):
+        return resposta
+    if hasattr(resposta, 'status_code'):
+        if not resposta.ok:
+            return ValueError(f"HTTP {resposta.status_code}")
+        return resposta.content
+    return resposta
+
+
+def transformar_lote(itens):
+    """
+    Converte um lote de detalhes em Pessoas; executada nos processos de trabalho.
+
+    Parâmetros:
+        itens (list): Pares (chave, corpo), com o corpo em bytes, str ou dict, ou uma exceção.
+
+    Retorna:
+        list: Pares (chave, Pessoa), ou (chave, exceção) para os corpos que não puderam ser convertidos.
+    """
+    resultados = []
+    for chave, corpo in itens:
+        if isinstance(corpo, BaseException):
+            resultados.append((chave, corpo))
+            continue
+        try:
+            resultados.append((chave, Pessoa.from_api_response(corpo)))
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            resultados.append((chave, e))
+    return resultados
+
+
+class TransformadorPessoas:
+    """
+    Converte detalhes do GET de personalidade em objetos Pessoa (Pessoa.from_api_response) em
+    um pool de processos.
+
+    A decodificação do JSON e o mapeamento são trabalho de CPU e, em uma thread, disputam o GIL
+    com as threads que fazem as requisições. Aqui os corpos seguem em lotes de tamanho_lote para
+    os processos de trabalho, e o gerador de entrada é consumido sob demanda: enquanto os
+    processos convertem um lote, o processo principal continua recebendo os próximos. No máximo
+    lotes_pendentes lotes ficam em voo, o que limita a memória em cargas do acervo inteiro.
+    Os resultados saem na ordem da entrada.
+
+    Os processos de trabalho não registram log (veja log.desativar_logging); falhas de conversão
+    voltam como exceções no resultado.
+
+    Com max_processos=0 a conversão é feita no próprio processo, sem pool (útil para poucos
+    registros, em que iniciar os processos custa mais do que a conversão).
+
+    Atributos:
+        max_processos (int): Processos de trabalho (0 = conversão no próprio processo).
+        tamanho_lote (int): Detalhes enviados a um processo por vez.
+        lotes_pendentes (int): Lotes em voo ao mesmo tempo.
+
+    Métodos:
+        transformar(respostas): Gerador de (chave, Pessoa ou exceção), na ordem da entrada.
+        transformar_async(respostas): Versão para geradores assíncronos, como
+            AsyncApiClient.buscar_personalidades.
+        close(): Encerra o pool de processos.
+
+    Exemplo de uso:
+    >>> async def main():
+    ...     async with AsyncApiClient(max_concorrencia=32) as api:
+    ...         with TransformadorPessoas() as transformador:
+    ...             respostas = api.buscar_personalidades(iter_uuids('json/personalidade.json'))
+    ...             async for uuid, pessoa in transformador.transformar_async(respostas):
+    ...                 print(uuid, pessoa.to_registro_json())
+    >>> asyncio.run(main())
+    """
+
+    def __init__(self, max_processos=None, tamanho_lote=200, lotes_pendentes=None):
+        """
+        Parâmetros:
+            max_processos (int): Processos de trabalho. Se omitido, um por CPU; 0 desativa o pool.
+            tamanho_lote (int): Detalhes por lote enviado a um processo.
+            lotes_pendentes (int): Lotes em voo. Se omitido, o dobro de max_processos.
+        """
+        self.max_processos = (os.cpu_count() or 1) if max_processos is None else max_processos
+        self.tamanho_lote = tamanho_lote
+        self.lotes_pendentes = lotes_pendentes or 2 * max(1, self.max_processos)
+        self._executor = (ProcessPoolExecutor(max_workers=self.max_processos, initializer=desativar_logging)
+                          if self.max_processos else None)
+
+    def _lotes(self, respostas):
+        iterador = iter(self._pares(respostas))
+        while True:
+            lote = list(islice(iterador, self.tamanho_lote))
+            if not lote:
+                return
+            yield lote
+
+    @staticmethod
+    def _pares(respostas):
+        for indice, item in enumerate(respostas):
+            chave, resposta = item if isinstance(item, tuple) else (indice, item)
+            yield chave, _corpo(resposta)
+
+    def transformar(self, respostas):
+        """
+        Converte os detalhes em Pessoas.
+
+        Parâmetros:
+            respostas (iterable): Respostas (requests.Response), corpos (bytes/str) ou dicionários,
+                ou tuplas (chave, resposta) como as de AsyncApiClient.buscar_personalidades.
+                Consumido sob demanda.
+
+        Retorna:
+            generator: Tuplas (chave, resultado), na ordem da entrada. A chave é a da tupla de
+            entrada ou a posição do item; o resultado é a Pessoa ou, se o detalhe não pôde ser
+            convertido (resposta de erro, JSON inválido), a exceção.
+        """
+        if self._executor is None:
+            for lote in self._lotes(respostas):
+                yield from transformar_lote(lote)
+            return
+        pendentes = deque()
+        for lote in self._lotes(respostas):
+            if len(pendentes) >= self.lotes_pendentes:
+                yield from pendentes.popleft().result()
+            pendentes.append(self._executor.submit(transformar_lote, lote))
+        while pendentes:
+            yield from pendentes.popleft().result()
+
+    async def transformar_async(self, respostas):
+        """
+        Como transformar(), para um gerador assíncrono de respostas: cada lote completo segue para
+        o pool sem bloquear o laço de eventos, e as requisições continuam enquanto ele é convertido.
+
+        Retorna:
+            async generator: Tuplas (chave, resultado), na ordem da entrada.
+        """
+        pendentes = deque()
+        lote = []
+        indice = 0
+
+        def submeter():
+            if self._executor is None:
+                futuro = asyncio.get_running_loop().create_future()
+                futuro.set_result(transformar_lote(lote))
+                return futuro
+            return asyncio.wrap_future(self._executor.submit(transformar_lote, lote))
+
+        async for item in respostas:
+            chave, resposta = item if isinstance(item, tuple) else (indice, item)
+            indice += 1
+            lote.append((chave, _corpo(resposta)))
+            if len(lote) < self.tamanho_lote:
+                continue
+            pendentes.append(submeter())
+            lote = []
+            while len(pendentes) >= self.lotes_pendentes or (pendentes and pendentes[0].done()):
+                for resultado in await pendentes.popleft():
+                    yield resultado
+        if lote:
+            pendentes.append(submeter())
+        while pendentes:
+            for resultado in await pendentes.popleft():
+                yield resultado
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,314 @@
+import threading
+import time
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+from API_orcrim.metrics import MedicaoRequisicao, obter_metricas_padrao, rotulo_endpoint
+from API_orcrim.ratelimit import LimitadorTaxa, PoliticaRetentativa, ler_retry_after
+
+METODOS_IDEMPOTENTES = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+STATUS_SOBRECARGA = frozenset({429, 503})
+# Codificações que o urllib3 sabe descomprimir neste ambiente: gzip e deflate sempre; br só com o
+# pacote brotli (ou brotlicffi) instalado, e zstd só com o zstandard.
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+logger = logging.getLogger(__name__)
+
+# Tempo de conexão acumulado pela requisição em curso na thread atual.
+_contexto = threading.local()
+
+
+class _ConexaoHttpMedida(HTTPConnection):
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _contexto.conexao = getattr(_contexto, 'conexao', 0.0) + time.perf_counter() - inicio
+
+
+class _ConexaoHttpsMedida(HTTPSConnection):
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            super().connect()  # Inclui o handshake TLS.
+        finally:
+            _contexto.conexao = getattr(_contexto, 'conexao', 0.0) + time.perf_counter() - inicio
+
+
+class _PoolHttpMedido(HTTPConnectionPool):
+    ConnectionCls = _ConexaoHttpMedida
+
+
+class _PoolHttpsMedido(HTTPSConnectionPool):
+    ConnectionCls = _ConexaoHttpsMedida
+
+
+class _AdaptadorMedido(HTTPAdapter):
+    """
+    HTTPAdapter cujos pools cronometram o estabelecimento de cada nova conexão.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _PoolHttpMedido, 'https': _PoolHttpsMedido}
+
+
+class HttpTransport:
+    """
+    Camada de transporte HTTP com conexões persistentes (keep-alive) e timeouts.
+
+    Mantém uma requests.Session com um HTTPAdapter dedicado, de modo que chamadas sucessivas
+    ao mesmo host reutilizam conexões TCP+TLS já abertas em vez de refazer o handshake.
+    A instância pode ser compartilhada entre threads: a configuração da sessão não é
+    alterada depois da construção, os cabeçalhos são enviados por requisição e o pool de
+    conexões do urllib3 é thread-safe.
+
+    Todas as requisições passam pelo limitador de taxa do transporte. Respostas 429/503
+    reduzem a taxa de todo o processo e respeitam o Retry-After; operações idempotentes
+    (GET, ou marcadas com idempotente=True) são repetidas com backoff exponencial e jitter
+    conforme a política de retentativas.
+
+    Todas as requisições pedem respostas comprimidas (Accept-Encoding: ACCEPT_ENCODING); a
+    descompressão é feita pelo urllib3 ao ler o corpo.
+
+    Cada chamada a request() gera uma MedicaoRequisicao (espera do limitador, conexão, tempo até
+    o primeiro byte, transferência, bytes descomprimidos e lidos da rede, status e retentativas)
+    agregada no registro de métricas.
+
+    Atributos:
+        timeout (tuple): Par (timeout de conexão, timeout de leitura) em segundos.
+        session (requests.Session): Sessão com os pools de conexões montados.
+        limitador (LimitadorTaxa): Limitador de taxa compartilhado por todas as requisições.
+        politica (PoliticaRetentativa): Política de retentativas.
+        metricas (RegistroMetricas): Registro que recebe as medições (None desativa a instrumentação).
+
+    Métodos:
+        request(metodo, url, **kwargs): Executa uma requisição HTTP usando o pool.
+        get(url, **kwargs): Atalho para request('GET', ...).
+        post(url, **kwargs): Atalho para request('POST', ...).
+        close(): Fecha todas as conexões mantidas pelo pool.
+    """
+
+    def __init__(self, pool_connections=4, pool_maxsize=32, timeout_conexao=5, timeout_leitura=60,
+                 limitador=None, politica=None, metricas=None):
+        """
+        Inicializa o transporte com pools de conexões e timeouts configuráveis.
+
+        Parâmetros:
+            pool_connections (int): Quantidade de hosts distintos com pool mantido em cache.
+            pool_maxsize (int): Número máximo de conexões keep-alive mantidas por host.
+            timeout_conexao (float): Segundos para estabelecer a conexão.
+            timeout_leitura (float): Segundos aguardando dados do servidor entre pacotes.
+            limitador (LimitadorTaxa): Limitador de taxa. Se omitido, cria um com os valores padrão.
+            politica (PoliticaRetentativa): Política de retentativas. Se omitida, usa os valores padrão.
+            metricas (RegistroMetricas): Registro de métricas. Se omitido, usa o registro compartilhado
+                pelo processo; False desativa a instrumentação.
+        """
+        self.timeout = (timeout_conexao, timeout_leitura)
+        self.limitador = limitador or LimitadorTaxa()
+        self.politica = politica or PoliticaRetentativa()
+        self.metricas = None if metricas is False else (metricas or obter_metricas_padrao())
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        adapter = _AdaptadorMedido(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, metodo, url, idempotente=None, endpoint=None, espera_token=0.0, **kwargs):
+        """
+        Executa uma requisição HTTP reutilizando as conexões do pool, com controle de taxa e retentativas.
+
+        Parâmetros:
+            metodo (str): Método HTTP ('GET', 'POST', ...).
+            url (str): URL completa da requisição.
+            idempotente (bool): Se a operação pode ser repetida com segurança. Se omitido, vale
+                True para GET/HEAD/OPTIONS/PUT/DELETE e False para POST. Operações não idempotentes
+                só são repetidas após 429 ou quando a conexão nem chegou a ser estabelecida.
+            endpoint (str): Rótulo usado nas métricas. Se omitido, usa o caminho da URL com UUIDs
+                substituídos por {uuid}.
+            espera_token (float): Segundos que o chamador aguardou pelo token, registrados na medição.
+            **kwargs: Argumentos repassados a requests.Session.request (headers, json, data, params...).
+                Se 'timeout' não for informado, usa o timeout padrão do transporte.
+
+        Retorna:
+            requests.Response: Resposta da requisição (a última, se todas as tentativas falharem por status).
+
+        Levanta:
+            requests.RequestException: Se não houver resposta após as tentativas permitidas.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if idempotente is None:
+            idempotente = metodo.upper() in METODOS_IDEMPOTENTES
+        medicao = {'espera_limite': 0.0, 'conexao': 0.0, 'ttfb': 0.0, 'transferencia': 0.0, 'tentativas': 0}
+        if self.metricas is None:
+            return self._executar(metodo, url, idempotente, medicao, **kwargs)
+
+        inicio = time.perf_counter()
+        response = erro = None
+        try:
+            response = self._executar(metodo, url, idempotente, medicao, **kwargs)
+            return response
+        except Exception as e:
+            erro = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            # A medição nunca pode substituir a resposta (ou a exceção) da requisição.
+            try:
+                enviados, recebidos, rede = self._tamanhos(response)
+                self.metricas.registrar(MedicaoRequisicao(
+                    metodo=metodo.upper(), endpoint=endpoint or rotulo_endpoint(url),
+                    status=response.status_code if response is not None else None,
+                    total=time.perf_counter() - inicio, espera_token=espera_token,
+                    espera_limite=medicao['espera_limite'], conexao=medicao['conexao'], ttfb=medicao['ttfb'],
+                    transferencia=medicao['transferencia'],
+                    bytes_enviados=enviados, bytes_recebidos=recebidos, bytes_rede=rede,
+                    retentativas=max(0, medicao['tentativas'] - 1), erro=erro))
+            except Exception:
+                logger.exception("Falha ao registrar a medição de %s %s.", metodo, url)
+
+    @staticmethod
+    def _tamanhos(response):
+        """
+        Bytes enviados, recebidos e lidos da rede para a medição; None quando não dá para saber.
+
+        Nunca lê o corpo: com stream=True ele fica para o chamador, e os tamanhos recebidos são None.
+        Falhas aqui não podem substituir o retorno (ou a exceção) de request().
+        """
+        if response is None:
+            return None, None, None
+        try:
+            corpo = response.request.body if response.request is not None else None
+            enviados = len(corpo) if corpo else 0
+        except TypeError:  # Corpo em gerador ou arquivo.
+            enviados = None
+        if not getattr(response, '_content_consumed', False):
+            return enviados, None, None
+        try:
+            recebidos = len(response.content or b'')
+            # tell() do urllib3 conta os bytes lidos do socket, antes da descompressão.
+            rede = response.raw.tell() if hasattr(response.raw, 'tell') else recebidos
+        except Exception:
+            return enviados, None, None
+        return enviados, recebidos, rede
+
+    def _executar(self, metodo, url, idempotente, medicao, **kwargs):
+        """
+        Laço de tentativas de request(); acumula os tempos de cada fase em 'medicao'.
+        """
+        tentativa = 0
+        while True:
+            tentativa += 1
+            medicao['tentativas'] = tentativa
+            ultima = tentativa >= self.politica.max_tentativas
+            medicao['espera_limite'] += self.limitador.adquirir()
+            _contexto.conexao = 0.0
+            inicio = time.perf_counter()
+            try:
+                response = self.session.request(metodo, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                medicao['conexao'] += _contexto.conexao
+                # Sem conexão estabelecida a requisição não chegou ao servidor: pode repetir sempre.
+                repetivel = idempotente or isinstance(e, requests.ConnectTimeout)
+                if ultima or not repetivel:
+                    raise
+                espera = self.politica.espera(tentativa)
+                logger.warning("Falha de conexão em %s %s (%s); nova tentativa em %.2f s.", metodo, url, e, espera)
+                time.sleep(espera)
+                continue
+
+            # elapsed vai do envio até a chegada dos cabeçalhos (inclui a conexão); o corpo é lido depois.
+            decorrido = response.elapsed.total_seconds()
+            medicao['conexao'] += _contexto.conexao
+            medicao['ttfb'] = max(0.0, decorrido - _contexto.conexao)
+            medicao['transferencia'] = max(0.0, time.perf_counter() - inicio - decorrido)
+
+            if response.status_code not in self.politica.status:
+                self.limitador.recompensar()
+                return response
+
+            retry_after = ler_retry_after(response.headers.get('Retry-After'))
+            if response.status_code in STATUS_SOBRECARGA:
+                self.limitador.penalizar(retry_after)
+            # 429 indica que o servidor recusou a requisição sem processá-la: repetir é seguro mesmo em POST.
+            if ultima or not (idempotente or response.status_code == 429):
+                return response
+            espera = self.politica.espera(tentativa, retry_after)
+            logger.warning("%s %s retornou %d; nova tentativa em %.2f s.", metodo, url, response.status_code, espera)
+            response.close()
+            time.sleep(espera)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def resposta_local(url, corpo, status=200, headers=None):
+    """
+    Cria um requests.Response a partir de um corpo já disponível localmente (cache).
+
+    Permite que respostas servidas sem ir à rede tenham a mesma interface (status_code, ok,
+    json(), content, text) das respostas reais.
+
+    Parâmetros:
+        url (str): URL que a resposta representa.
+        corpo (bytes): Corpo da resposta.
+        status (int): Código HTTP a ser atribuído.
+        headers (dict): Cabeçalhos adicionais.
+
+    Retorna:
+        requests.Response: Resposta montada localmente.
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response._content = corpo
+    response.encoding = 'utf-8'
+    response.headers['Content-Type'] = 'application/json'
+    response.headers.update(headers or {})
+    return response
+
+
+_transporte_padrao = None
+_transporte_lock = threading.Lock()
+
+
+def obter_transporte_padrao():
+    """
+    Retorna o transporte compartilhado pelo processo, criando-o na primeira chamada.
+
+    As configurações de pool e timeout são lidas de config.settings.
+
+    Retorna:
+        HttpTransport: Instância única compartilhada entre ApiClient, TokenManager e buscar_personalidade,
+        inclusive o limitador de taxa.
+    """
+    global _transporte_padrao
+    if _transporte_padrao is None:
+        with _transporte_lock:
+            if _transporte_padrao is None:
+                from config.settings import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+                                             HTTP_TIMEOUT_CONEXAO, HTTP_TIMEOUT_LEITURA,
+                                             HTTP_TAXA_MAXIMA, HTTP_RAJADA, HTTP_MAX_TENTATIVAS)
+                _transporte_padrao = HttpTransport(pool_connections=HTTP_POOL_CONNECTIONS,
+                                                   pool_maxsize=HTTP_POOL_MAXSIZE,
+                                                   timeout_conexao=HTTP_TIMEOUT_CONEXAO,
+                                                   timeout_leitura=HTTP_TIMEOUT_LEITURA,
+                                                   limitador=LimitadorTaxa(taxa_maxima=HTTP_TAXA_MAXIMA,
+                                                                           rajada=HTTP_RAJADA),
+                                                   politica=PoliticaRetentativa(max_tentativas=HTTP_MAX_TENTATIVAS))
+    return _transporte_padrao
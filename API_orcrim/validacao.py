@@ -0,0 +1,232 @@
+import functools
+import re
+from typing import NamedTuple
+from API_orcrim.domain import DomainRegistry
+
+_DATA = re.compile(r'(\d{2})/(\d{2})/(\d{4})\Z')
+_NAO_DIGITOS = re.compile(r'\D')
+_DIAS_MES = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+VALORES_OBITO = frozenset({'S', 'N', ''})
+
+
+class Violacao(NamedTuple):
+    """
+    Problema encontrado em um registro.
+
+    Atributos:
+        indice (int): Posição do registro no lote validado.
+        campo (str): Campo com problema (ex.: 'cpfs[0]', 'uf.id').
+        mensagem (str): Descrição do problema.
+    """
+    indice: int
+    campo: str
+    mensagem: str
+
+
+class ErroValidacao(ValueError):
+    """
+    Levantada quando um ou mais registros não passam na validação.
+
+    Atributos:
+        violacoes (list[Violacao]): Todos os problemas encontrados no lote.
+    """
+
+    def __init__(self, violacoes):
+        self.violacoes = violacoes
+        detalhes = '; '.join(f"[{v.indice}] {v.campo}: {v.mensagem}" for v in violacoes[:10])
+        mais = f" (e mais {len(violacoes) - 10})" if len(violacoes) > 10 else ''
+        super().__init__(f"{len(violacoes)} problema(s) de validação: {detalhes}{mais}")
+
+
+@functools.lru_cache(maxsize=65536)
+def data_valida(valor):
+    """
+    Verifica se a data está no formato DD/MM/AAAA e existe no calendário.
+    """
+    m = _DATA.match(valor)
+    if not m:
+        return False
+    dia, mes, ano = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    if not 1 <= mes <= 12 or not 1 <= dia <= _DIAS_MES[mes - 1] or ano < 1800:
+        return False
+    return not (mes == 2 and dia == 29 and (ano % 4 or (ano % 100 == 0 and ano % 400)))
+
+
+def cpf_valido(valor):
+    """
+    Verifica os dígitos verificadores de um CPF (com ou sem pontuação).
+    """
+    digitos = _NAO_DIGITOS.sub('', str(valor))
+    if len(digitos) != 11 or digitos == digitos[0] * 11:
+        return False
+    numeros = [ord(c) - 48 for c in digitos]
+    for posicao in (9, 10):
+        soma = sum(n * peso for n, peso in zip(numeros, range(posicao + 1, 1, -1)))
+        if (soma * 10 % 11) % 10 != numeros[posicao]:
+            return False
+    return True
+
+
+class ValidadorPessoa:
+    """
+    Validação local dos corpos de POST de personalidade, telefones e alcunhas, antes do envio.
+
+    Verifica nome obrigatório, datas DD/MM/AAAA, valores de obito, dígitos de CPF e se os ids de
+    uf, município (inclusive a UF a que pertence), sexo, nacionalidade e orcrims existem nas tabelas
+    de domínio. Os ids válidos são carregados uma vez em conjuntos, de modo que cada registro custa
+    apenas consultas de conjunto e algumas expressões regulares pré-compiladas.
+
+    Todos os problemas de um lote são reunidos e devolvidos de uma vez.
+
+    Métodos:
+        validar(registro): Lista os problemas (campo, mensagem) de um registro.
+        validar_lote(registros): Lista as Violacoes de todos os registros.
+        exigir_valido(registros): Levanta ErroValidacao com todas as Violacoes, se houver.
+        validar_telefones(payload) / validar_alcunhas(payload): Validam os corpos dos sub-recursos.
+
+    Exemplo de uso:
+    >>> validador = ValidadorPessoa()
+    >>> validador.validar_lote(pessoas)
+    [Violacao(indice=3, campo='cpfs[0]', mensagem="CPF inválido: '12345678900'")]
+    """
+
+    def __init__(self, dominio=None):
+        """
+        Parâmetros:
+            dominio (DomainRegistry): Registro de tabelas de domínio. Se omitido, usa o registro
+                padrão (snapshots de jsonBase/1/).
+        """
+        dominio = dominio or DomainRegistry.padrao()
+        self.ufs = frozenset(dominio.tabela('ufs').por_id)
+        self.sexos = frozenset(dominio.tabela('sexos').por_id)
+        self.nacionalidades = frozenset(dominio.tabela('nacionalidades').por_id)
+        self.orcrims = frozenset(dominio.tabela('orcrims').por_id)
+        self.uf_do_municipio = {id_: (m.get('uf') or {}).get('id')
+                                for id_, m in dominio.tabela('municipios').por_id.items()}
+
+    def validar(self, registro):
+        """
+        Valida um item da lista "data" do POST de personalidade.
+
+        Parâmetros:
+            registro (Pessoa, dict): Pessoa ou dicionário no formato de Pessoa.to_registro().
+
+        Retorna:
+            list[tuple]: Pares (campo, mensagem); vazia se o registro é válido.
+        """
+        if hasattr(registro, 'to_registro'):
+            registro = registro.to_registro()
+        problemas = []
+        if not isinstance(registro, dict):
+            return [('', 'registro deve ser um objeto')]
+
+        nome = registro.get('nome')
+        if not isinstance(nome, str) or not nome.strip():
+            problemas.append(('nome', 'obrigatório'))
+
+        data_nascimento = registro.get('dataNascimento') or ''
+        if data_nascimento and not (isinstance(data_nascimento, str) and data_valida(data_nascimento)):
+            problemas.append(('dataNascimento', f"data inválida (esperado DD/MM/AAAA): {data_nascimento!r}"))
+
+        obito = registro.get('obito')
+        if (obito or '') not in VALORES_OBITO:
+            problemas.append(('obito', f"valor inválido {obito!r} (esperado 'S', 'N' ou vazio)"))
+
+        uf_id = self._id_dominio(registro, 'uf', self.ufs, problemas)
+        self._id_dominio(registro, 'sexo', self.sexos, problemas)
+        self._id_dominio(registro, 'nacionalidade', self.nacionalidades, problemas)
+        municipio = registro.get('municipio') or {}
+        if municipio:
+            municipio_id = municipio.get('id')
+            if municipio_id not in self.uf_do_municipio:
+                problemas.append(('municipio.id', f"não encontrado na tabela de domínio: {municipio_id!r}"))
+            elif uf_id is not None and self.uf_do_municipio[municipio_id] not in (None, uf_id):
+                problemas.append(('municipio.id', f"município {municipio_id} não pertence à UF {uf_id}"))
+
+        for i, cpf in enumerate(registro.get('cpfs') or ()):
+            if not cpf_valido(cpf):
+                problemas.append((f'cpfs[{i}]', f"CPF inválido: {cpf!r}"))
+        for i, rg in enumerate(registro.get('rgs') or ()):
+            if not str(rg.get('rg') or '').strip():
+                problemas.append((f'rgs[{i}].rg', 'obrigatório'))
+            if (rg.get('ufRg') or {}).get('id') not in self.ufs:
+                problemas.append((f'rgs[{i}].ufRg.id', f"não encontrado na tabela de domínio: "
+                                                       f"{(rg.get('ufRg') or {}).get('id')!r}"))
+        for i, orcrim in enumerate(registro.get('orcrims') or ()):
+            if orcrim.get('id') not in self.orcrims:
+                problemas.append((f'orcrims[{i}].id', f"não encontrado na tabela de domínio: {orcrim.get('id')!r}"))
+        for i, alcunha in enumerate(registro.get('alcunhas') or ()):
+            problemas.extend((f'alcunhas[{i}].{campo}', mensagem) for campo, mensagem in _validar_alcunha(alcunha))
+        return problemas
+
+    @staticmethod
+    def _id_dominio(registro, campo, validos, problemas):
+        valor = registro.get(campo) or {}
+        if not valor:
+            return None
+        id_ = valor.get('id')
+        if id_ not in validos:
+            problemas.append((f'{campo}.id', f"não encontrado na tabela de domínio: {id_!r}"))
+            return None
+        return id_
+
+    def validar_lote(self, registros):
+        """
+        Valida vários registros e reúne todos os problemas encontrados.
+
+        Parâmetros:
+            registros (iterable, dict): Pessoas, itens de "data" ou um corpo {"data": [...]}.
+
+        Retorna:
+            list[Violacao]: Problemas de todos os registros, na ordem da entrada.
+        """
+        if isinstance(registros, dict) and 'data' in registros:
+            registros = registros['data']
+        return [Violacao(indice, campo, mensagem)
+                for indice, registro in enumerate(registros)
+                for campo, mensagem in self.validar(registro)]
+
+    def exigir_valido(self, registros):
+        """
+        Como validar_lote, mas levanta ErroValidacao com todas as violações, se houver alguma.
+        """
+        violacoes = self.validar_lote(registros)
+        if violacoes:
+            raise ErroValidacao(violacoes)
+
+    @staticmethod
+    def validar_telefones(payload):
+        """
+        Valida o corpo do POST de telefones ({"data": [{"telefone": ...}]}).
+
+        Retorna:
+            list[Violacao]: Problemas encontrados, um por item inválido.
+        """
+        violacoes = []
+        for i, item in enumerate(payload.get('data') or ()):
+            digitos = _NAO_DIGITOS.sub('', str(item.get('telefone') or ''))
+            if not 8 <= len(digitos) <= 13:
+                violacoes.append(Violacao(i, 'telefone', f"número inválido: {item.get('telefone')!r}"))
+        return violacoes
+
+    @staticmethod
+    def validar_alcunhas(payload):
+        """
+        Valida o corpo do POST de alcunhas ({"data": [{"alcunha": ..., "dataAlcunha": ...}]}).
+
+        Retorna:
+            list[Violacao]: Problemas encontrados.
+        """
+        return [Violacao(i, campo, mensagem)
+                for i, item in enumerate(payload.get('data') or ())
+                for campo, mensagem in _validar_alcunha(item)]
+
+
+def _validar_alcunha(item):
+    problemas = []
+    if not str(item.get('alcunha') or '').strip():
+        problemas.append(('alcunha', 'obrigatória'))
+    data_alcunha = item.get('dataAlcunha') or ''
+    if data_alcunha and not data_valida(data_alcunha):
+        problemas.append(('dataAlcunha', f"data inválida (esperado DD/MM/AAAA): {data_alcunha!r}"))
+    return problemas
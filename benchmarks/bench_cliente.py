@@ -0,0 +1,169 @@
+"""
+Benchmark de ponta a ponta do cliente contra o servidor stub local (benchmarks/servidor_stub.py).
+
+Cenários:
+    unitario     chamadas GET de detalhe, uma por vez, pelo ApiClient
+    lote         criação em massa de Pessoa via post_personalidades (tempo por lote)
+    hidratacao   listagem de UUIDs e busca concorrente dos seus detalhes pelo AsyncApiClient
+
+Para cada cenário são informados a vazão (registros/s) e as latências p50/p95/p99 das
+requisições, além dos contadores do servidor (requisições, tokens, 429 e 500). Com --metricas,
+imprime também o registro de métricas do transporte (JSON ou texto do Prometheus). O servidor
+roda no próprio processo; latência, erros e limite de taxa são configuráveis para reproduzir
+as condições do ambiente real sem depender dele.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_cliente
+    python -m benchmarks.bench_cliente --cenario hidratacao --quantidade 5000 --concorrencia 32
+    python -m benchmarks.bench_cliente --latencia 0.05 --taxa-erro 0.02 --limite-rps 300
+    python -m benchmarks.bench_cliente --cenario unitario --metricas prometheus
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid as uuid_lib
+from API_orcrim import buscar_personalidade
+from API_orcrim.api_client import ApiClient
+from API_orcrim.async_client import AsyncApiClient
+from API_orcrim.metrics import RegistroMetricas
+from API_orcrim.person import Pessoa
+from API_orcrim.ratelimit import LimitadorTaxa, PoliticaRetentativa
+from API_orcrim.token import TokenManager
+from API_orcrim.transport import HttpTransport
+from benchmarks.bench_pessoa import criar_pessoas
+from benchmarks.servidor_stub import ConfiguracaoStub, ServidorStub, lista_exemplo
+
+
+def percentil(valores, p):
+    """
+    Percentil por interpolação linear entre as posições vizinhas (valores já ordenados).
+    """
+    if not valores:
+        return 0.0
+    posicao = (len(valores) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(valores) - 1)
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (posicao - inferior)
+
+
+def relatar(descricao, registros, duracao, latencias, stub):
+    latencias = sorted(latencias)
+    p50, p95, p99 = (percentil(latencias, p) * 1000 for p in (50, 95, 99))
+    print(f'{descricao:<12} {registros:>7} registros em {duracao:7.2f} s  {registros / duracao:9.1f} reg/s   '
+          f'p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  p99 {p99:7.1f} ms')
+    print(f'{"":<12} servidor: {dict(sorted(stub.contadores.items()))}')
+    stub.contadores.clear()
+
+
+def criar_cliente(stub, args):
+    transporte = HttpTransport(pool_maxsize=max(32, args.concorrencia),
+                               limitador=LimitadorTaxa(taxa_maxima=args.taxa_cliente, rajada=int(args.taxa_cliente)),
+                               politica=PoliticaRetentativa(max_tentativas=args.tentativas, base=0.05),
+                               metricas=RegistroMetricas())
+    token_manager = TokenManager(client_id='benchmark', client_secret='benchmark', token_url=stub.token_url,
+                                 transporte=transporte)
+    return ApiClient(transporte=transporte, base_url=stub.base_url, token_manager=token_manager)
+
+
+def cenario_unitario(cliente, stub, args):
+    latencias = []
+    inicio = time.perf_counter()
+    for _ in range(args.quantidade):
+        t0 = time.perf_counter()
+        cliente.get_personalidade(str(uuid_lib.uuid4()))
+        latencias.append(time.perf_counter() - t0)
+    relatar('unitario', args.quantidade, time.perf_counter() - inicio, latencias, stub)
+
+
+def cenario_lote(cliente, stub, args):
+    pessoas = criar_pessoas(args.quantidade)
+    latencias = []
+    original = cliente.post_personalidade
+
+    def post_medido(dados):
+        t0 = time.perf_counter()
+        try:
+            return original(dados)
+        finally:
+            latencias.append(time.perf_counter() - t0)
+
+    cliente.post_personalidade = post_medido
+    inicio = time.perf_counter()
+    falhas = sum(not r.sucesso for r in Pessoa.post_personalidades(pessoas, batch_size=args.lote, api=cliente))
+    duracao = time.perf_counter() - inicio
+    del cliente.post_personalidade
+    relatar('lote', args.quantidade, duracao, latencias, stub)
+    if falhas:
+        print(f'{"":<12} {falhas} registro(s) com falha')
+
+
+def cenario_hidratacao(cliente, stub, args):
+    # Como na sincronização: a lista vem da API, e cada dataAtualizacao segue junto com o uuid.
+    lista = buscar_personalidade('01/01/2024 00:00:00.000', '31/12/2024 23:59:59.999',
+                                 cliente.token_manager.get_access_token(), transporte=cliente.transporte,
+                                 base_url=stub.base_url)
+    if not isinstance(lista, dict):
+        raise SystemExit(f'Falha ao listar UUIDs: {lista}')
+    itens = [(item['uuid'], item['dataAtualizacao']) for item in lista['data']]
+    latencias = []
+    original = cliente.get_personalidade
+
+    def get_medido(uuid, data_atualizacao=None):
+        t0 = time.perf_counter()
+        try:
+            return original(uuid, data_atualizacao)
+        finally:
+            latencias.append(time.perf_counter() - t0)
+
+    cliente.get_personalidade = get_medido
+
+    async def hidratar():
+        falhas = 0
+        async with AsyncApiClient(cliente, max_concorrencia=args.concorrencia) as api:
+            async for _, resposta in api.buscar_personalidades(itens):
+                falhas += isinstance(resposta, Exception) or not resposta.ok
+        return falhas
+
+    inicio = time.perf_counter()
+    falhas = asyncio.run(hidratar())
+    duracao = time.perf_counter() - inicio
+    del cliente.get_personalidade
+    relatar('hidratacao', len(itens), duracao, latencias, stub)
+    if falhas:
+        print(f'{"":<12} {falhas} uuid(s) com falha')
+
+
+CENARIOS = {'unitario': cenario_unitario, 'lote': cenario_lote, 'hidratacao': cenario_hidratacao}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cenario', choices=[*CENARIOS, 'todos'], default='todos')
+    parser.add_argument('--quantidade', type=int, default=500, help='registros por cenário')
+    parser.add_argument('--lote', type=int, default=50, help='batch_size do cenário lote')
+    parser.add_argument('--concorrencia', type=int, default=16, help='max_concorrencia do cenário hidratacao')
+    parser.add_argument('--latencia', type=float, default=0.02, help='latência média do servidor, em segundos')
+    parser.add_argument('--taxa-erro', type=float, default=0.0, help='fração de respostas 500 do servidor')
+    parser.add_argument('--limite-rps', type=float, default=0, help='req/s aceitas pelo servidor antes de 429')
+    parser.add_argument('--taxa-cliente', type=float, default=1000, help='taxa máxima do limitador do cliente')
+    parser.add_argument('--tentativas', type=int, default=5)
+    parser.add_argument('--metricas', choices=['json', 'prometheus'], help='imprime as métricas do transporte ao final')
+    args = parser.parse_args()
+
+    config = ConfiguracaoStub(latencia=args.latencia, variacao=args.latencia / 2, taxa_erro=args.taxa_erro,
+                              limite_rps=args.limite_rps, retry_after=0.5, uuids=lista_exemplo(args.quantidade))
+    with ServidorStub(config) as stub:
+        cliente = criar_cliente(stub, args)
+        for nome, cenario in CENARIOS.items():
+            if args.cenario in (nome, 'todos'):
+                cenario(cliente, stub, args)
+        cliente.transporte.close()
+    if args.metricas == 'json':
+        print(json.dumps(cliente.transporte.metricas.snapshot(), indent=2, ensure_ascii=False))
+    elif args.metricas == 'prometheus':
+        print(cliente.transporte.metricas.prometheus(), end='')
+
+
+if __name__ == '__main__':
+    main()
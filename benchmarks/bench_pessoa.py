@@ -0,0 +1,83 @@
+"""
+Benchmark da camada de modelo: criação e serialização de Pessoa em massa.
+
+Mede o tempo para construir N pessoas e para serializá-las pelos dois caminhos
+disponíveis: to_dict() + json.dumps e o caminho rápido to_json_bytes(), e o da conversão de
+N detalhes do GET (corpos JSON) em pessoas, no próprio processo e no pool de processos do
+TransformadorPessoas. Com --memoria,
+mede também o pico de memória (o tracemalloc deixa a execução bem mais lenta, então os
+tempos dessa execução não devem ser comparados com os da execução sem a opção).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_pessoa
+    python -m benchmarks.bench_pessoa --quantidade 100000 --memoria
+    python -m benchmarks.bench_pessoa --processos 4
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from API_orcrim.person import Pessoa
+from API_orcrim.transformacao import TransformadorPessoas
+from benchmarks.servidor_stub import detalhe_exemplo
+
+UFS = [(27, 'DISTRITO FEDERAL', 'DF'), (21, 'MINAS GERAIS', 'MG'), (2, 'AMAZONAS', 'AM'), (3, 'AMAPÁ', 'AP')]
+MUNICIPIOS = [(530010801, 'Brasília'), (3114600, 'Carrancas'), (1302603, 'Manaus'), (1600303, 'Macapá')]
+ORCRIMS = [{'id': 230, 'nome': 'BONDE DO TERROR', 'sigla': 'BDT'},
+           {'id': 13, 'nome': 'PRIMEIRO COMANDO DA CAPITAL', 'sigla': 'PCC'}]
+
+
+def criar_pessoas(quantidade):
+    pessoas = []
+    for i in range(quantidade):
+        uf_id, uf_nome, uf_sigla = UFS[i % len(UFS)]
+        municipio_id, municipio_nome = MUNICIPIOS[i % len(MUNICIPIOS)]
+        pessoas.append(Pessoa(
+            nome=f'PESSOA DE TESTE {i}', dataNascimento='12/12/1984', nomeMae=f'MAE {i}', nomePai=f'PAI {i}',
+            obito='N', municipio_id=municipio_id, municipio_nome=municipio_nome,
+            uf_id=uf_id, uf_nome=uf_nome, uf_sigla=uf_sigla, sexo_id=7, sexo_nome='Masculino',
+            nacionalidade_id=76, nacionalidade_nome='Brasil',
+            alcunhas=[{'alcunha': f'APELIDO {i}', 'dataAlcunha': '01/01/2020'}],
+            cpfs=[f'{i:011d}'],
+            rgs=[{'rg': str(i), 'ufRg': {'id': uf_id, 'nome': uf_nome, 'sigla': uf_sigla}}],
+            orcrim=[ORCRIMS[i % len(ORCRIMS)]],
+        ))
+    return pessoas
+
+
+def medir(descricao, funcao, memoria=False):
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+    linha = f'{descricao:<40} {duracao:8.3f} s'
+    if memoria:
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        linha += f'   pico de memória {pico / 2 ** 20:8.1f} MiB'
+    print(linha)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quantidade', type=int, default=100000)
+    parser.add_argument('--memoria', action='store_true', help='mede também o pico de memória (mais lento)')
+    parser.add_argument('--processos', type=int, default=None, help='processos do TransformadorPessoas (padrão: CPUs)')
+    args = parser.parse_args()
+
+    pessoas = medir(f'criar {args.quantidade} pessoas', lambda: criar_pessoas(args.quantidade), args.memoria)
+    medir('to_dict() + json.dumps', lambda: [json.dumps(p.to_dict()).encode('utf-8') for p in pessoas], args.memoria)
+    medir('to_json_bytes()', lambda: [p.to_json_bytes() for p in pessoas], args.memoria)
+
+    corpos = [json.dumps(detalhe_exemplo(f'{i:08x}-0000-0000-0000-000000000000')).encode('utf-8')
+              for i in range(args.quantidade)]
+    medir('from_api_response()', lambda: [Pessoa.from_api_response(c) for c in corpos], args.memoria)
+    with TransformadorPessoas(max_processos=args.processos) as transformador:
+        medir(f'TransformadorPessoas ({transformador.max_processos} processo(s))',
+              lambda: list(transformador.transformar(corpos)), args.memoria)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+Servidor local que imita o backend ORCRIM e o endpoint de token do Keycloak.
+
+Implementa, sem persistência:
+    POST .../protocol/openid-connect/token        token client_credentials
+    GET  /backend-orcrim/api/v1/personalidade     lista de UUIDs com dataAtualizacao em [dataInicio, dataFim]
+    GET  /backend-orcrim/api/v1/personalidade/ID  detalhe no formato de jsonBase/1/exemplo de personalidade.json
+    POST /backend-orcrim/api/v1/personalidade     criação (aceita vários itens em "data")
+    POST /backend-orcrim/api/v1/personalidade/ID/telefones
+    POST /backend-orcrim/api/v1/personalidade/ID/alcunhas
+
+Latência, taxa de erros 500 e limite de requisições por segundo (acima dele responde 429
+com Retry-After) são configuráveis. Respostas GET trazem ETag (If-None-Match igual responde 304)
+e são comprimidas com gzip quando o cliente aceita.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.servidor_stub --porta 8080 --latencia 0.05 --taxa-erro 0.01 --limite-rps 200
+"""
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid as uuid_lib
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+PREFIXO_API = '/backend-orcrim/api/v1/personalidade'
+FORMATO_DATA = '%d/%m/%Y %H:%M:%S.%f'
+
+
+class ConfiguracaoStub:
+    """
+    Comportamento do servidor stub.
+
+    Atributos:
+        latencia (float): Atraso médio, em segundos, de cada resposta da API.
+        variacao (float): Variação máxima (±) somada à latência.
+        latencia_token (float): Atraso do endpoint de token.
+        taxa_erro (float): Fração de respostas 500 (0 a 1).
+        limite_rps (float): Requisições por segundo aceitas; acima disso responde 429 (0 = sem limite).
+        retry_after (float): Valor do cabeçalho Retry-After nas respostas 429.
+        expires_in (int): Validade, em segundos, dos tokens emitidos.
+        uuids (list): Itens {"uuid", "dataAtualizacao"} devolvidos pela listagem.
+        validadores (bool): Se as respostas GET trazem ETag e atendem If-None-Match com 304.
+        comprimir (bool): Se as respostas comprimem o corpo com gzip quando o cliente aceita.
+        status_listagem (int): Se definido, a listagem sempre responde com esse status de erro
+            (ex.: 401 ou 400), para simular falhas que não dependem da janela consultada.
+    """
+
+    def __init__(self, latencia=0.02, variacao=0.01, latencia_token=0.05, taxa_erro=0.0, limite_rps=0,
+                 retry_after=1.0, expires_in=300, uuids=None, validadores=True, comprimir=True, status_listagem=None):
+        self.latencia = latencia
+        self.variacao = variacao
+        self.latencia_token = latencia_token
+        self.taxa_erro = taxa_erro
+        self.limite_rps = limite_rps
+        self.retry_after = retry_after
+        self.expires_in = expires_in
+        self.uuids = uuids or []
+        self.validadores = validadores
+        self.comprimir = comprimir
+        self.status_listagem = status_listagem
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # Cabeçalhos e corpo saem em escritas separadas.
+    servidor = None  # ServidorStub, definido pela subclasse criada em ServidorStub.__init__
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status, corpo=None, headers=None):
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8') if corpo is not None else b''
+        headers = dict(headers or {})
+        config = self.servidor.config
+        if self.command == 'GET' and status == 200 and config.validadores:
+            etag = '"%s"' % hashlib.sha1(dados).hexdigest()[:16]
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                self.servidor.contar('304')
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        if config.comprimir and len(dados) >= 256 and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            dados = gzip.compress(dados, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(dados)))
+        for nome, valor in headers.items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _ler_corpo(self):
+        tamanho = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(tamanho) if tamanho else b''
+
+    def _filtrar(self):
+        """
+        Aplica limite de taxa, erros aleatórios e latência. Retorna True se a requisição já foi respondida.
+        """
+        config = self.servidor.config
+        self.servidor.contar('requisicoes')
+        if config.limite_rps and not self.servidor.admitir():
+            self.servidor.contar('429')
+            self._responder(429, {'errors': [{'status': 429, 'detail': 'Too Many Requests'}]},
+                            {'Retry-After': str(config.retry_after)})
+            return True
+        time.sleep(max(0.0, config.latencia + random.uniform(-config.variacao, config.variacao)))
+        if config.taxa_erro and random.random() < config.taxa_erro:
+            self.servidor.contar('500')
+            self._responder(500, {'errors': [{'status': 500, 'detail': 'Erro simulado'}]})
+            return True
+        return False
+
+    def _listar(self, consulta):
+        status = self.servidor.config.status_listagem
+        if status:
+            return self._responder(status, {'errors': [{'status': status, 'detail': 'Erro simulado'}]})
+        parametros = parse_qs(consulta)
+        try:
+            limites = [datetime.datetime.strptime(parametros[nome][0], FORMATO_DATA) if nome in parametros else None
+                       for nome in ('dataInicio', 'dataFim')]
+        except ValueError:
+            return self._responder(400, {'errors': [{'status': 400, 'detail': 'Data inválida'}]})
+        inicio, fim = limites
+        itens = []
+        for item in self.servidor.config.uuids:
+            data = datetime.datetime.strptime(item['dataAtualizacao'], FORMATO_DATA)
+            if (inicio is None or data >= inicio) and (fim is None or data <= fim):
+                itens.append(item)
+        self._responder(200, {'data': itens})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.startswith(PREFIXO_API):
+            return self._responder(404, {'errors': [{'status': 404}]})
+        if self._filtrar():
+            return
+        resto = url.path[len(PREFIXO_API):].strip('/')
+        if not resto:
+            return self._listar(url.query)
+        self._responder(200, detalhe_exemplo(resto))
+
+    def do_POST(self):
+        caminho = urlparse(self.path).path
+        corpo = self._ler_corpo()
+        if caminho.endswith('/token'):
+            self.servidor.contar('token')
+            time.sleep(self.servidor.config.latencia_token)
+            return self._responder(200, {'access_token': uuid_lib.uuid4().hex, 'token_type': 'Bearer',
+                                         'expires_in': self.servidor.config.expires_in})
+        if not caminho.startswith(PREFIXO_API):
+            return self._responder(404, {'errors': [{'status': 404}]})
+        if self._filtrar():
+            return
+        try:
+            itens = json.loads(corpo or b'{}').get('data') or []
+        except ValueError:
+            return self._responder(400, {'errors': [{'status': 400, 'detail': 'JSON inválido'}]})
+        if caminho.rstrip('/') == PREFIXO_API:
+            if any(not item.get('nome') for item in itens):
+                return self._responder(400, {'errors': [{'status': 400, 'detail': 'nome obrigatório'}]})
+            return self._responder(200, {'data': [dict(item, uuid=str(uuid_lib.uuid4())) for item in itens]})
+        if caminho.endswith('/telefones') or caminho.endswith('/alcunhas'):
+            return self._responder(200, {'data': itens})
+        self._responder(404, {'errors': [{'status': 404}]})
+
+
+def lista_exemplo(quantidade, inicio=datetime.datetime(2024, 1, 1)):
+    """
+    Itens {"uuid", "dataAtualizacao"} para ConfiguracaoStub.uuids, atualizados um por minuto a partir de inicio.
+    """
+    return [{'uuid': str(uuid_lib.uuid4()),
+             'dataAtualizacao': (inicio + datetime.timedelta(minutes=i)).strftime(FORMATO_DATA)[:-3]}
+            for i in range(quantidade)]
+
+
+def detalhe_exemplo(uuid):
+    return {
+        'dadosPessoais': {
+            'nome': f'PESSOA {uuid[:8].upper()}', 'alcunhas': [{'id': 1, 'alcunha': 'TESTE'}],
+            'dataNascimento': '07/05/1988', 'nomeMae': 'MAE DE TESTE', 'nomePai': 'PAI DE TESTE',
+            'sexo': {'id': 7, 'nome': 'Masculino'}, 'obito': 'N', 'nacionalidade': {'id': 76, 'nome': 'Brasil'},
+            'uf': {'id': 27, 'nome': 'DISTRITO FEDERAL', 'sigla': 'DF'},
+            'municipio': {'id': 530010801, 'nome': 'Brasília'},
+            'dadosPessoaisOrcrim': [{'id': 1, 'idOrcrim': 230, 'nomeOrcrim': 'BONDE DO TERROR', 'siglaOrcrim': 'BDT',
+                                     'dataInicio': None, 'dataTermino': None,
+                                     'dataInicioFormatoString': None, 'dataTerminoFormatoString': None}],
+            'documentos': [], 'uuid': uuid,
+        },
+        'dadosOrganizacao': [], 'dadosEndereco': [], 'dadosTelefone': [],
+        'dadosVidasPregressas': [], 'dadosInformacoesPrisionais': [],
+    }
+
+
+class ServidorStub:
+    """
+    Servidor stub executado em uma thread de fundo.
+
+    Exemplo de uso:
+    >>> with ServidorStub(ConfiguracaoStub(latencia=0.01)) as stub:
+    ...     cliente = ApiClient(base_url=stub.base_url, token_manager=TokenManager(token_url=stub.token_url))
+    """
+
+    def __init__(self, config=None, host='127.0.0.1', porta=0):
+        self.config = config or ConfiguracaoStub()
+        self.contadores = {}
+        self._lock = threading.Lock()
+        self._janela = deque()
+        manipulador = type('Manipulador', (_Manipulador,), {'servidor': self})
+        self._http = ThreadingHTTPServer((host, porta), manipulador)
+        self._http.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self._http.server_address[:2]
+        return f'http://{host}:{porta}'
+
+    @property
+    def base_url(self):
+        return f'{self.url}/backend-orcrim'
+
+    @property
+    def token_url(self):
+        return f'{self.url}/auth/realms/stub/protocol/openid-connect/token'
+
+    def contar(self, chave):
+        with self._lock:
+            self.contadores[chave] = self.contadores.get(chave, 0) + 1
+
+    def admitir(self):
+        """
+        Janela deslizante de 1 s: retorna False se o limite de requisições por segundo foi atingido.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            while self._janela and self._janela[0] < agora - 1:
+                self._janela.popleft()
+            if len(self._janela) >= self.config.limite_rps:
+                return False
+            self._janela.append(agora)
+            return True
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._http.serve_forever, name='servidor-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--porta', type=int, default=8080)
+    parser.add_argument('--latencia', type=float, default=0.02)
+    parser.add_argument('--taxa-erro', type=float, default=0.0)
+    parser.add_argument('--limite-rps', type=float, default=0)
+    parser.add_argument('--uuids', type=int, default=1000, help='itens da listagem')
+    args = parser.parse_args()
+
+    config = ConfiguracaoStub(latencia=args.latencia, taxa_erro=args.taxa_erro, limite_rps=args.limite_rps,
+                              uuids=lista_exemplo(args.uuids))
+    stub = ServidorStub(config, porta=args.porta)
+    print(f'API: {stub.base_url}\nToken: {stub.token_url}')
+    try:
+        stub._http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+"""
+
+Arquivo de exemplo
+
+-Faça uma cópia
+-Remova o a extenção .example
+-subistitua subistitua as informações abaixo por suas credenciais
+
+"""
+
+
+
+
+
+api_secret = 'sua senha aqui'
+id = 'seu id aqui'
\ No newline at end of file
@@ -3,4 +3,27 @@ client_secret = api_secret
 client_id = id
 token_url = "https://hmlsegurancaorcrim.mj.gov.br/auth/realms/hmlorcrim/protocol/openid-connect/token"
 scopes = 'openid profile orcrim-backend'
-API_BASE_URL = "https://hmlorcrim.mj.gov.br/backend-orcrim"
\ No newline at end of file
+API_BASE_URL = "https://hmlorcrim.mj.gov.br/backend-orcrim"
+
+# Transporte HTTP (conexões persistentes)
+HTTP_POOL_CONNECTIONS = 4  # Quantidade de hosts distintos mantidos em cache de pools
+HTTP_POOL_MAXSIZE = 32  # Conexões keep-alive mantidas por host
+HTTP_TIMEOUT_CONEXAO = 5  # Segundos para estabelecer a conexão TCP+TLS
+HTTP_TIMEOUT_LEITURA = 60  # Segundos aguardando dados do servidor
+HTTP_TAXA_MAXIMA = 50  # Requisições por segundo, somando todas as threads do processo
+HTTP_RAJADA = 50  # Requisições que podem sair de uma vez após um período ocioso
+HTTP_MAX_TENTATIVAS = 5  # Tentativas por requisição idempotente (429/502/503/504 e falhas de conexão)
+
+# Log (API_orcrim.log.configurar_logging)
+LOG_ARQUIVO = 'app.log'
+LOG_NIVEL = 'INFO'
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotaciona o arquivo ao atingir 10 MiB
+LOG_BACKUPS = 5  # Arquivos rotacionados mantidos (app.log.1 ... app.log.5)
+LOG_AMOSTRAGEM = 100  # Mensagens por requisição: registra 1 a cada N após as 10 primeiras
+
+# Cache de token entre processos (API_orcrim.token_arquivo). None desativa; ex.: os.path.expanduser('~/.cache/orcrim')
+TOKEN_CACHE_DIRETORIO = None
+
+# Requisições condicionais (ETag/Last-Modified) de detalhes e tabelas de domínio (API_orcrim.cache.CacheCondicional).
+# None desativa; ex.: 'json/cache_condicional.sqlite3'
+CACHE_CONDICIONAL_CAMINHO = None
@@ -1,8 +1,11 @@
 from API_orcrim.token import get_token, check_token
 from API_orcrim import buscar_personalidade
+from API_orcrim.log import configurar_logging
 
 import json
 
+configurar_logging()
+
 
 # token = get_token()
 
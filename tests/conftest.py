@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from servidor_stub import ServidorStub, ConfiguracaoStub  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    """
+    Servidor stub (benchmarks/servidor_stub.py) com 20 UUIDs na listagem e latência baixa.
+    """
+    uuids = [{'uuid': f'00000000-0000-0000-0000-{i:012d}', 'dataAtualizacao': f'{i + 1:02d}/02/2024 10:00:00.000'}
+             for i in range(20)]
+    with ServidorStub(ConfiguracaoStub(latencia=0.01, variacao=0, latencia_token=0, uuids=uuids)) as servidor:
+        yield servidor
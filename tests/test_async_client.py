@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from API_orcrim.async_client import AsyncApiClient
+from API_orcrim.token import TokenManager
+
+
+def _cliente(stub, **kwargs):
+    return AsyncApiClient(base_url=stub.base_url, token_manager=TokenManager(token_url=stub.token_url),
+                          cache_condicional=False, **kwargs)
+
+
+def test_buscar_personalidades(stub):
+    uuids = [item['uuid'] for item in stub.config.uuids]
+
+    async def main():
+        async with _cliente(stub, max_concorrencia=4) as api:
+            return [(uuid, resposta.status_code) async for uuid, resposta in api.buscar_personalidades(uuids)]
+
+    resultados = asyncio.run(main())
+    assert sorted(uuid for uuid, _ in resultados) == sorted(uuids)
+    assert {status for _, status in resultados} == {200}
+
+
+def test_saida_do_contexto_nao_bloqueia_o_laco(stub):
+    stub.config.latencia = 0.3
+    uuid = stub.config.uuids[0]['uuid']
+    batidas = []
+
+    async def pulsar():
+        while True:
+            batidas.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        pulso = asyncio.ensure_future(pulsar())
+        api = _cliente(stub, max_concorrencia=2)
+        async with api:
+            asyncio.ensure_future(api.get_personalidade(uuid))
+            await asyncio.sleep(0.05)  # A requisição fica em voo durante a saída do contexto.
+        await asyncio.sleep(0.03)  # Uma batida depois da saída, para medir o intervalo dela.
+        pulso.cancel()
+        return api
+
+    api = asyncio.run(main())
+    assert api._executor._shutdown
+    intervalos = [b - a for a, b in zip(batidas, batidas[1:])]
+    # Enquanto o pool termina a requisição em voo (~0,3 s), o laço continua atendendo outras tarefas.
+    assert max(intervalos) < 0.15
@@ -0,0 +1,63 @@
+import pytest
+
+from API_orcrim.busca import IndiceBusca, normalizar_busca
+
+
+def _detalhe(uuid, nome, alcunhas=(), nome_mae=''):
+    return {'dadosPessoais': {'uuid': uuid, 'nome': nome, 'nomeMae': nome_mae,
+                              'alcunhas': [{'alcunha': alcunha} for alcunha in alcunhas]}}
+
+
+@pytest.fixture
+def indice(tmp_path):
+    with IndiceBusca(str(tmp_path / 'busca.sqlite3')) as indice:
+        indice.atualizar_varios([
+            _detalhe('u1', 'Adriano Braga do Nascimento', ['Nandinho']),
+            _detalhe('u2', 'Fernando Nascimento Silva', nome_mae='Maria do Nascimento'),
+            _detalhe('u3', 'João Pereira', ['Nando']),
+        ])
+        yield indice
+
+
+def test_normalizar_busca():
+    assert normalizar_busca('  João d\'Ávila-Júnior ') == 'JOAO D AVILA JUNIOR'
+
+
+def test_ordena_por_semelhanca(indice):
+    resultados = indice.buscar('nando')
+    # Alcunha exata, depois a parecida ('NANDINHO') e por fim o nome que só contém parte da palavra.
+    assert [r.uuid for r in resultados] == ['u3', 'u1', 'u2']
+    assert resultados[0].pontuacao == 1.0
+    assert resultados[0].campo == 'alcunha'
+    assert resultados[0].pontuacao > resultados[1].pontuacao > resultados[2].pontuacao
+
+
+def test_busca_parcial(indice):
+    assert [r.uuid for r in indice.buscar('nandi')] == ['u1', 'u3']
+    assert [r.uuid for r in indice.buscar('nandi', min_pontuacao=0.6)] == ['u1']
+
+
+def test_tolera_erro_de_digitacao(indice):
+    resultados = indice.buscar('adriano nacimento')
+    assert resultados[0].uuid == 'u1'
+    assert 0.3 <= resultados[0].pontuacao < 1.0
+
+
+def test_restringe_campos(indice):
+    assert {r.uuid for r in indice.buscar('nascimento', campos=['nomeMae'])} == {'u2'}
+    assert 'u2' in {r.uuid for r in indice.buscar('nascimento')}
+
+
+def test_atualizacao_incremental(indice, tmp_path):
+    indice.atualizar(_detalhe('u3', 'João Pereira', ['Tiziu']))
+    assert 'u3' not in {r.uuid for r in indice.buscar('nando')}
+    assert indice.buscar('tiziu')[0].uuid == 'u3'
+
+    indice.remover('u1')
+    assert 'u1' not in {r.uuid for r in indice.buscar('nandinho')}
+    assert len(indice) == 2
+
+    # O índice em memória é reconstruído a partir do SQLite ao reabrir.
+    with IndiceBusca(str(tmp_path / 'busca.sqlite3')) as reaberto:
+        assert len(reaberto) == 2
+        assert reaberto.buscar('tiziu')[0].uuid == 'u3'
@@ -0,0 +1,111 @@
+import pytest
+
+from API_orcrim.api_client import ApiClient
+from API_orcrim.cache import CacheCondicional, CachePersonalidades
+from API_orcrim.token import TokenManager
+
+UUID = '00000000-0000-0000-0000-000000000001'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CachePersonalidades(str(tmp_path / 'personalidades.sqlite3'))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def condicional(tmp_path):
+    cache = CacheCondicional(str(tmp_path / 'condicional.sqlite3'))
+    yield cache
+    cache.close()
+
+
+def _cliente(stub, **kwargs):
+    kwargs.setdefault('cache_condicional', False)
+    return ApiClient(base_url=stub.base_url, token_manager=TokenManager(token_url=stub.token_url), **kwargs)
+
+
+def test_get_condicional_revalida_com_304(stub, condicional):
+    api = _cliente(stub, cache_condicional=condicional)
+    primeira = api.get_personalidade(UUID)
+    assert primeira.status_code == 200 and 'X-Cache' not in primeira.headers
+    assert condicional.cabecalhos(primeira.url) == {'If-None-Match': primeira.headers['ETag']}
+
+    segunda = api.get_personalidade(UUID)
+    # O stub só responde 304 quando o If-None-Match coincide com o ETag atual.
+    assert stub.contadores['304'] == 1
+    assert segunda.status_code == 200
+    assert segunda.headers['X-Cache'] == 'REVALIDATED'
+    assert segunda.headers['ETag'] == primeira.headers['ETag']
+    assert segunda.content == primeira.content
+    assert condicional.estatisticas() == {'revalidacoes': 1, 'gravacoes': 1, 'registros': 1}
+
+
+def test_get_condicional_corpo_removido_busca_de_novo(stub, condicional, monkeypatch):
+    api = _cliente(stub, cache_condicional=condicional)
+    primeira = api.get_personalidade(UUID)
+    url = primeira.url
+    cabecalhos = condicional.cabecalhos
+
+    def removido_apos_consulta(url_consultada):
+        # O LRU remove o corpo entre o envio do If-None-Match e a chegada do 304.
+        resultado = cabecalhos(url_consultada)
+        condicional._conexao.execute('DELETE FROM respostas WHERE url = ?', (url_consultada,))
+        return resultado
+
+    monkeypatch.setattr(condicional, 'cabecalhos', removido_apos_consulta)
+    segunda = api.get_personalidade(UUID)
+    assert stub.contadores['304'] == 1
+    assert stub.contadores['requisicoes'] == 3  # Original, condicional (304) e a nova busca completa.
+    assert segunda.status_code == 200 and 'X-Cache' not in segunda.headers
+    assert segunda.content == primeira.content
+    monkeypatch.undo()
+    assert condicional.corpo(url) == primeira.content  # Regravado pela busca completa.
+
+
+def test_get_personalidade_hit_e_miss_por_data(stub, cache):
+    api = _cliente(stub, cache=cache)
+    primeira = api.get_personalidade(UUID, '01/02/2024 10:00:00.000')
+    assert 'X-Cache' not in primeira.headers
+
+    segunda = api.get_personalidade(UUID, '01/02/2024 10:00:00.000')
+    assert segunda.headers['X-Cache'] == 'HIT'
+    assert segunda.json() == primeira.json()
+    assert stub.contadores['requisicoes'] == 1
+
+    # Data diferente da guardada: o detalhe foi atualizado e volta à rede.
+    terceira = api.get_personalidade(UUID, '02/02/2024 10:00:00.000')
+    assert 'X-Cache' not in terceira.headers
+    assert stub.contadores['requisicoes'] == 2
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 1)
+    assert cache.obter(UUID, '02/02/2024 10:00:00.000') is not None
+
+
+def test_get_personalidade_sem_data_ignora_cache(stub, cache):
+    cache.gravar(UUID, '01/02/2024 10:00:00.000', b'{"antigo": true}')
+    api = _cliente(stub, cache=cache)
+    for _ in range(2):
+        response = api.get_personalidade(UUID)
+        assert 'X-Cache' not in response.headers and 'antigo' not in response.json()
+    assert stub.contadores['requisicoes'] == 2
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert cache.obter(UUID) == b'{"antigo": true}'  # Nem lido nem sobrescrito.
+
+
+def test_cache_personalidades_lru(tmp_path):
+    cache = CachePersonalidades(str(tmp_path / 'lru.sqlite3'), max_registros=2)
+    cache.gravar('a', 'd', b'A')
+    cache.gravar('b', 'd', b'B')
+    assert cache.obter('a') == b'A'  # 'a' passa a ser o mais recente.
+    cache.gravar('c', 'd', b'C')
+    assert (len(cache), cache.remocoes) == (2, 1)
+    assert cache.obter('b') is None
+    assert (cache.obter('a'), cache.obter('c')) == (b'A', b'C')
+    cache.close()
+
+    # O relógio LRU continua de onde parou ao reabrir o arquivo.
+    reaberto = CachePersonalidades(str(tmp_path / 'lru.sqlite3'), max_registros=2)
+    reaberto.gravar('d', 'd', b'D')
+    assert reaberto.obter('a') is None and reaberto.obter('c') == b'C'
+    reaberto.close()
@@ -0,0 +1,77 @@
+import json
+
+from API_orcrim.api_client import ResultadoRegistro
+from API_orcrim.carga import CargaRetomavel, DiarioCarga, hash_registro, CRIADO, ENVIANDO, FALHA, JA_CRIADO, DUPLICADO
+
+
+class ApiFalsa:
+    """
+    Substitui o ApiClient: cria tudo, exceto registros sem nome, e guarda o que foi enviado.
+    """
+
+    def __init__(self):
+        self.enviados = []
+
+    def post_personalidades(self, registros, batch_size=50):
+        resultados = []
+        for indice, registro in enumerate(registros):
+            self.enviados.append(registro['nome'])
+            if registro['nome']:
+                resultados.append(ResultadoRegistro(indice, registro, True, f"uuid-{registro['nome']}", 200))
+            else:
+                resultados.append(ResultadoRegistro(indice, registro, False, status=400, erro='nome obrigatório'))
+        return resultados
+
+
+def _registros(*nomes):
+    return [{'nome': nome} for nome in nomes]
+
+
+def test_diario_descarta_linha_final_interrompida(tmp_path):
+    caminho = tmp_path / 'carga.journal'
+    a, b = hash_registro({'nome': 'A'}), hash_registro({'nome': 'B'})
+    with DiarioCarga(str(caminho)) as diario:
+        diario.registrar(a, CRIADO, uuid='uuid-A')
+        diario.registrar(b, ENVIANDO)
+    completo = caminho.read_bytes()
+    # Queda no meio da escrita da linha seguinte.
+    caminho.write_bytes(completo + json.dumps({'hash': b, 'situacao': CRIADO})[:20].encode())
+
+    with DiarioCarga(str(caminho)) as diario:
+        assert diario.situacao(a) == CRIADO
+        assert diario.situacao(b) == ENVIANDO
+        diario.registrar(b, CRIADO, uuid='uuid-B')
+    # A linha interrompida foi removida: a nova começa em uma linha própria.
+    assert caminho.read_bytes().startswith(completo)
+    with DiarioCarga(str(caminho)) as diario:
+        assert diario.situacao(b) == CRIADO
+
+
+def test_retomada_nao_reenvia_criados(tmp_path, caplog):
+    caminho = str(tmp_path / 'carga.journal')
+    api = ApiFalsa()
+    with CargaRetomavel(caminho, api=api, batch_size=2) as carga:
+        resultados = list(carga.executar(_registros('A', '', 'C')))
+    assert [r.situacao for r in resultados] == [CRIADO, FALHA, CRIADO]
+
+    # Simula uma queda com 'D' em voo: marcado como enviando, sem resposta no diário.
+    with DiarioCarga(caminho) as diario:
+        diario.registrar(hash_registro({'nome': 'D'}), ENVIANDO)
+
+    api = ApiFalsa()
+    with CargaRetomavel(caminho, api=api, batch_size=2) as carga:
+        resultados = list(carga.executar(_registros('A', '', 'C', 'D')))
+    assert api.enviados == ['', 'D']
+    situacoes = {r.indice: (r.situacao, r.uuid) for r in resultados}
+    assert situacoes == {0: (JA_CRIADO, 'uuid-A'), 1: (FALHA, None), 2: (JA_CRIADO, 'uuid-C'), 3: (CRIADO, 'uuid-D')}
+    assert 'estava em envio' in caplog.text
+
+
+def test_duplicados_na_mesma_carga(tmp_path):
+    api = ApiFalsa()
+    with CargaRetomavel(str(tmp_path / 'carga.journal'), api=api, batch_size=3) as carga:
+        resultados = sorted(carga.executar(_registros('A', 'A', 'B', '', '', 'A')))
+    assert api.enviados == ['A', 'B', '']
+    assert [(r.situacao, r.uuid, r.status) for r in resultados] == [
+        (CRIADO, 'uuid-A', 200), (DUPLICADO, 'uuid-A', 200), (CRIADO, 'uuid-B', 200),
+        (FALHA, None, 400), (DUPLICADO, None, 400), (DUPLICADO, 'uuid-A', 200)]
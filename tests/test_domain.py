@@ -0,0 +1,31 @@
+import threading
+import time
+
+from API_orcrim.domain import DomainRegistry
+
+
+class _RegistroLento(DomainRegistry):
+    _padrao = None
+    criados = 0
+
+    def __init__(self):
+        type(self).criados += 1
+        time.sleep(0.05)  # Alarga a janela entre a verificação e a atribuição.
+        super().__init__()
+
+
+def test_padrao_cria_uma_so_instancia():
+    barreira = threading.Barrier(8)
+    instancias = []
+
+    def obter():
+        barreira.wait()
+        instancias.append(_RegistroLento.padrao())
+
+    threads = [threading.Thread(target=obter) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _RegistroLento.criados == 1
+    assert all(instancia is instancias[0] for instancia in instancias)
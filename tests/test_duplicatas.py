@@ -0,0 +1,63 @@
+import pytest
+
+from API_orcrim import duplicatas
+from API_orcrim.duplicatas import DetectorDuplicatas, pontuar_pares, CRIAR, PULAR, REVISAR
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def backend(request, monkeypatch):
+    """
+    Executa o teste com a pontuação em Python puro e, se instalado, com numpy.
+    """
+    if request.param == 'numpy':
+        monkeypatch.setattr(duplicatas, 'numpy', pytest.importorskip('numpy'))
+    else:
+        monkeypatch.setattr(duplicatas, 'numpy', None)
+    return request.param
+
+
+def _registro(nome, nascimento='', mae='', pai='', cpfs=()):
+    return {'nome': nome, 'dataNascimento': nascimento, 'nomeMae': mae, 'nomePai': pai, 'cpfs': list(cpfs)}
+
+
+def _existente(uuid, nome, nascimento='', mae='', pai='', cpf=None):
+    documentos = [{'id': 1, 'numero': cpf, 'tipoDocumento': {'id': 9}}] if cpf else []
+    return {'dadosPessoais': {'uuid': uuid, 'nome': nome, 'dataNascimento': nascimento, 'nomeMae': mae,
+                              'nomePai': pai, 'documentos': documentos}}
+
+
+def test_pontuar_pares(backend):
+    valores = [(1.0, 1.0, 1.0, 1.0), (0.5, 0.0, 1.0, 0.0), (1.0, 1.0, 0.0, 0.0)]
+    presentes = [(1.0, 1.0, 1.0, 1.0), (1.0, 1.0, 1.0, 1.0), (1.0, 1.0, 0.0, 0.0)]
+    assert pontuar_pares(valores, presentes) == pytest.approx([1.0, 0.425, 1.0])
+    # Sem nenhum campo presente nos dois registros, a pontuação é 0 (sem divisão por zero).
+    assert pontuar_pares([(1.0, 1.0, 1.0, 1.0)], [(0.0, 0.0, 0.0, 0.0)]) == [0.0]
+    assert pontuar_pares([], []) == []
+
+
+def test_classificacao(backend):
+    detector = DetectorDuplicatas()
+    detector.adicionar_varios([
+        _existente('u1', 'CARLOS ANDRE EXEMPLO', '01/02/1980', 'MARIA EXEMPLO', 'JOSE EXEMPLO', cpf='123.456.789-00'),
+        _existente('u2', 'ANA PAULA TESTE', '03/04/1990', 'JOANA TESTE'),
+    ])
+    decisoes = list(detector.classificar([
+        _registro('Carlos André Exemplo', cpfs=['12345678900']),                             # mesmo CPF
+        _registro('CARLOS ANDRE DEDF EXEMPLO', '01/02/1980', 'MARIA EXEMPLO', 'JOSE EXEMPLO'),  # bloco nome+nascimento
+        _registro('ANA PAULA TESTE', '03/04/1990', 'JOANA SILVA'),                            # mãe diferente
+        _registro('PEDRO NOVO', '05/06/2000', 'LUCIA NOVA'),
+        _registro('PEDRO NOVO', '05/06/2000', 'LUCIA NOVA'),                                  # repetição na carga
+    ]))
+
+    assert [d.acao for d in decisoes] == [PULAR, PULAR, REVISAR, CRIAR, PULAR]
+    assert (decisoes[0].motivo, decisoes[0].uuid, decisoes[0].pontuacao) == ('cpf', 'u1', 1.0)
+    assert (decisoes[1].motivo, decisoes[1].uuid) == ('nome+nascimento', 'u1')
+    assert decisoes[2].uuid == 'u2' and 0.7 <= decisoes[2].pontuacao < 0.9
+    assert decisoes[4].indice_correspondente == 3 and decisoes[4].uuid is None
+
+
+def test_cpfs_diferentes_nunca_pulam(backend):
+    detector = DetectorDuplicatas()
+    detector.adicionar(_existente('u1', 'CARLOS EXEMPLO', '01/02/1980', 'MARIA EXEMPLO', cpf='11111111111'))
+    decisao, = detector.classificar([_registro('CARLOS EXEMPLO', '01/02/1980', 'MARIA EXEMPLO', cpfs=['22222222222'])])
+    assert decisao.acao == REVISAR
@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+
+from API_orcrim import buscar_personalidade
+from API_orcrim.janelas import buscar_personalidade_janelas
+from API_orcrim.ratelimit import PoliticaRetentativa
+from API_orcrim.token import TokenManager
+from API_orcrim.transport import HttpTransport
+from servidor_stub import ServidorStub, ConfiguracaoStub
+
+INICIO, FIM = '01/02/2024 00:00:00.000', '21/02/2024 00:00:00.000'
+
+
+def _buscar(stub, **kwargs):
+    kwargs.setdefault('base_url', stub.base_url)
+    return buscar_personalidade_janelas(INICIO, FIM, token_manager=TokenManager(token_url=stub.token_url), **kwargs)
+
+
+def test_subdivide_ao_atingir_limite_registros(stub):
+    resultado = _buscar(stub, janelas=1, limite_registros=6, janela_minima=datetime.timedelta(hours=1))
+    assert sorted(item['uuid'] for item in resultado['data']) == sorted(item['uuid'] for item in stub.config.uuids)
+    # 20 itens com no máximo 5 por janela: ao menos 4 janelas folha, mais as subdivididas.
+    assert stub.contadores['requisicoes'] >= 7
+
+
+@pytest.mark.parametrize('status', [401, 400])
+def test_erro_que_nao_depende_da_janela_encerra_na_hora(stub, status):
+    stub.config.status_listagem = status
+    with pytest.raises(RuntimeError, match=str(status)):
+        _buscar(stub, janelas=2, max_concorrencia=1)
+    assert stub.contadores['requisicoes'] == 1
+
+
+def test_erro_5xx_subdivide(stub):
+    stub.config.status_listagem = 503
+    # Sem retentativas no transporte, cada janela corresponde a uma única requisição.
+    with HttpTransport(politica=PoliticaRetentativa(max_tentativas=1)) as transporte:
+        with pytest.raises(RuntimeError, match='503'):
+            _buscar(stub, transporte=transporte, janelas=1, max_concorrencia=1,
+                    janela_minima=datetime.timedelta(days=5))
+    # 20 dias -> 10 -> 5 (mínima): a janela mínima que falha encerra a busca.
+    assert stub.contadores['requisicoes'] == 3
+
+
+def test_base_url_invalida_nao_subdivide(stub):
+    erro = buscar_personalidade(INICIO, FIM, 'token', base_url='http://')
+    assert erro.tipo == 'configuracao'
+    with pytest.raises(RuntimeError, match='configuração'):
+        _buscar(stub, base_url='localhost:1/x', janelas=4)
+    assert 'requisicoes' not in stub.contadores
+
+
+def test_mescla_por_uuid():
+    uuids = [
+        {'uuid': 'repetido', 'dataAtualizacao': '03/02/2024 10:00:00.000'},
+        {'uuid': 'repetido', 'dataAtualizacao': '15/02/2024 10:00:00.000'},
+        # Exatamente no limite entre as duas janelas: devolvido pelas duas.
+        {'uuid': 'limite', 'dataAtualizacao': '11/02/2024 00:00:00.000'},
+        {'uuid': 'outro', 'dataAtualizacao': '20/02/2024 10:00:00.000'},
+    ]
+    with ServidorStub(ConfiguracaoStub(latencia=0, variacao=0, latencia_token=0, uuids=uuids)) as stub:
+        resultado = _buscar(stub, janelas=2)
+        assert stub.contadores['requisicoes'] == 2
+    por_uuid = {item['uuid']: item['dataAtualizacao'] for item in resultado['data']}
+    assert len(resultado['data']) == 3
+    assert por_uuid['repetido'] == '15/02/2024 10:00:00.000'
+    assert set(por_uuid) == {'repetido', 'limite', 'outro'}
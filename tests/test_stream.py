@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from API_orcrim.stream import iter_registros, iter_uuids
+
+ITENS = [
+    {'uuid': 'a1', 'dataAtualizacao': '01/02/2024 10:00:00.000', 'total': 12345, 'taxa': -1.5e-3},
+    {'uuid': 'b2', 'nome': 'JOÃO \\"TESTE\\" D\'ÁVILA', 'alcunhas': [{'alcunha': 'NANDO'}, {}], 'obito': None},
+    98765,
+    'texto com , e ] e }',
+    [],
+]
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / 'personalidades.json'
+    # Chaves antes de "data" (inclusive aninhadas) são descartadas pelo leitor.
+    caminho.write_text(json.dumps({'meta': {'data': [0], 'n': 5}, 'data': ITENS, 'fim': True}, ensure_ascii=False,
+                                  indent=1), encoding='utf-8')
+    return caminho
+
+
+def test_valores_divididos_entre_blocos(arquivo):
+    tamanho = len(arquivo.read_text(encoding='utf-8'))
+    # Todo ponto de corte possível: strings, números e objetos ficam partidos entre dois blocos.
+    for tamanho_bloco in range(1, tamanho + 1):
+        assert list(iter_registros(str(arquivo), tamanho_bloco=tamanho_bloco)) == ITENS, tamanho_bloco
+
+
+def test_numero_no_fim_do_bloco(tmp_path):
+    caminho = tmp_path / 'numeros.json'
+    caminho.write_text('[1234567, 89]', encoding='utf-8')
+    # Com blocos de 4 caracteres o primeiro bloco termina em '[123', um número aparentemente completo.
+    assert list(iter_registros(str(caminho), tamanho_bloco=4)) == [1234567, 89]
+
+
+def test_lista_na_raiz_e_vazia(tmp_path):
+    caminho = tmp_path / 'lista.json'
+    caminho.write_text('[{"uuid": "x"}]', encoding='utf-8')
+    assert list(iter_uuids(str(caminho), tamanho_bloco=3)) == [('x', None)]
+    caminho.write_text('{"data": []}', encoding='utf-8')
+    assert list(iter_registros(str(caminho), tamanho_bloco=2)) == []
+
+
+@pytest.mark.parametrize('conteudo', ['{"data": [1, 2', '{"data": [1 2]}', '"data"'])
+def test_json_invalido(tmp_path, conteudo):
+    caminho = tmp_path / 'invalido.json'
+    caminho.write_text(conteudo, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_registros(str(caminho), tamanho_bloco=4))
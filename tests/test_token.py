@@ -0,0 +1,77 @@
+import threading
+import time
+
+from API_orcrim.token import TokenManager
+from API_orcrim.transport import resposta_local
+
+
+def _em_paralelo(funcao, quantidade):
+    """
+    Executa 'funcao' em 'quantidade' threads liberadas ao mesmo tempo e devolve os resultados.
+    """
+    barreira = threading.Barrier(quantidade)
+    resultados = [None] * quantidade
+
+    def executar(i):
+        barreira.wait()
+        resultados[i] = funcao()
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+
+def _aguardar_renovacao(gerenciador):
+    # A renovação em segundo plano mantém o lock do estado até terminar.
+    with gerenciador._estado.lock:
+        pass
+
+
+def test_token_expirado_pede_um_so_token(stub):
+    stub.config.latencia_token = 0.1
+    gerenciador = TokenManager(token_url=stub.token_url)
+    tokens = _em_paralelo(gerenciador.get_access_token, 8)
+    assert stub.contadores['token'] == 1
+    assert len(set(tokens)) == 1 and tokens[0]
+
+
+def test_renovacao_antecipada_em_segundo_plano(stub):
+    # expires_at fica 30 s antes do expires_in: 60 s de validade caem dentro da margem de 60 s.
+    stub.config.expires_in = 60
+    gerenciador = TokenManager(token_url=stub.token_url, margem_renovacao=60)
+    antigo = gerenciador.get_access_token()
+
+    stub.config.latencia_token = 0.5
+    inicio = time.perf_counter()
+    assert gerenciador.get_access_token() == antigo
+    assert time.perf_counter() - inicio < 0.25
+
+    _aguardar_renovacao(gerenciador)
+    assert stub.contadores['token'] == 2
+    assert gerenciador.get_access_token() != antigo
+
+
+def test_invalidar_em_paralelo_renova_uma_vez(stub):
+    stub.config.latencia_token = 0.1
+    gerenciador = TokenManager(token_url=stub.token_url)
+    antigo = gerenciador.get_access_token()
+    novos = _em_paralelo(lambda: gerenciador.invalidar(antigo), 2)
+    assert stub.contadores['token'] == 2
+    assert novos[0] == novos[1] != antigo
+
+
+class _TransporteSemToken:
+    def post(self, url, **kwargs):
+        return resposta_local(url, b'{"token_type": "Bearer"}')
+
+
+def test_resposta_sem_access_token_em_segundo_plano(caplog):
+    gerenciador = TokenManager(token_url='http://autenticacao.invalido/sem-token', transporte=_TransporteSemToken())
+    gerenciador.token_data.update(access_token='antigo', expires_at=time.time() + 10)
+    assert gerenciador.get_access_token() == 'antigo'
+    _aguardar_renovacao(gerenciador)
+    assert "sem o campo 'access_token'" in caplog.text
+    assert gerenciador.token_data['access_token'] == 'antigo'
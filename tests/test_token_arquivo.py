@@ -0,0 +1,66 @@
+import os
+import stat
+
+import pytest
+
+from API_orcrim.token import TokenManager
+from API_orcrim.token_arquivo import ArmazemTokenArquivo
+
+
+def _modo(caminho):
+    return stat.S_IMODE(os.stat(caminho).st_mode)
+
+
+def _novo_processo(monkeypatch):
+    # Descarta o estado em memória compartilhado pelo processo: só resta o armazém em arquivo.
+    monkeypatch.setattr(TokenManager, '_estados', {})
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='permissões POSIX')
+def test_permissoes(tmp_path):
+    diretorio = tmp_path / 'tokens'
+    diretorio.mkdir(mode=0o755)
+    os.chmod(diretorio, 0o755)
+    armazem = ArmazemTokenArquivo(str(diretorio))
+    assert _modo(diretorio) == 0o700
+    chave = ('cliente', 'http://token', 'openid')
+    armazem.gravar(chave, {'access_token': 'abc', 'expires_at': 123.0})
+    assert _modo(armazem._caminho(chave)) == 0o600
+    assert armazem.ler(chave) == {'access_token': 'abc', 'expires_at': 123.0}
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='sem uid no Windows')
+def test_recusa_diretorio_de_outro_usuario(tmp_path, monkeypatch):
+    diretorio = tmp_path / 'tokens'
+    diretorio.mkdir(mode=0o755)
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(diretorio).st_uid + 1)
+    with pytest.raises(PermissionError, match='outro usuário'):
+        ArmazemTokenArquivo(str(diretorio))
+    assert _modo(diretorio) != 0o700  # Nem o modo do diretório alheio é alterado.
+
+
+def test_outra_instancia_reaproveita_token(stub, tmp_path, monkeypatch):
+    primeiro = TokenManager(token_url=stub.token_url, armazem=ArmazemTokenArquivo(str(tmp_path)))
+    token = primeiro.get_access_token()
+
+    _novo_processo(monkeypatch)
+    segundo = TokenManager(token_url=stub.token_url, armazem=ArmazemTokenArquivo(str(tmp_path)))
+    assert segundo.get_access_token() == token
+    assert stub.contadores['token'] == 1
+
+
+def test_token_recusado_nao_e_reaproveitado(stub, tmp_path, monkeypatch):
+    primeiro = TokenManager(token_url=stub.token_url, armazem=ArmazemTokenArquivo(str(tmp_path)))
+    recusado = primeiro.get_access_token()
+
+    _novo_processo(monkeypatch)
+    segundo = TokenManager(token_url=stub.token_url, armazem=ArmazemTokenArquivo(str(tmp_path)))
+    novo = segundo.invalidar(recusado)
+    assert novo != recusado
+    assert stub.contadores['token'] == 2
+
+    # O substituto foi gravado: um terceiro processo o reaproveita sem nova requisição.
+    _novo_processo(monkeypatch)
+    terceiro = TokenManager(token_url=stub.token_url, armazem=ArmazemTokenArquivo(str(tmp_path)))
+    assert terceiro.get_access_token() == novo
+    assert stub.contadores['token'] == 2
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+import requests
+
+from API_orcrim.ratelimit import LimitadorTaxa, PoliticaRetentativa
+from API_orcrim.transport import HttpTransport
+from servidor_stub import ServidorStub, ConfiguracaoStub, PREFIXO_API
+
+
+def _transporte(status=(429, 502, 503, 504), **kwargs):
+    # Três tentativas com backoff curto; sem métricas para não misturar com o registro do processo.
+    return HttpTransport(politica=PoliticaRetentativa(max_tentativas=3, base=0.01, status=status), metricas=False,
+                         **kwargs)
+
+
+def _stub(**kwargs):
+    kwargs.setdefault('latencia', 0)
+    return ServidorStub(ConfiguracaoStub(variacao=0, latencia_token=0, **kwargs))
+
+
+@pytest.mark.parametrize('status', [502, 503, 504])
+def test_get_repete_status_transitorios(status):
+    with _stub(status_listagem=status) as stub, _transporte() as transporte:
+        response = transporte.get(stub.url + PREFIXO_API)
+        assert response.status_code == status
+        assert stub.contadores['requisicoes'] == 3
+
+
+def test_post_nao_repete_5xx():
+    # Mesmo com 500 na lista de status repetíveis, um POST que chegou ao servidor não é reenviado.
+    with _stub(taxa_erro=1.0) as stub, _transporte(status=(429, 500, 502, 503, 504)) as transporte:
+        assert transporte.get(stub.url + PREFIXO_API).status_code == 500
+        assert stub.contadores['requisicoes'] == 3
+        assert transporte.post(stub.url + PREFIXO_API, json={'data': [{'nome': 'A'}]}).status_code == 500
+        assert stub.contadores['requisicoes'] == 4
+
+
+def test_post_nao_repete_apos_timeout_de_leitura():
+    with _stub(latencia=0.3) as stub, _transporte(timeout_leitura=0.1) as transporte:
+        with pytest.raises(requests.ReadTimeout):
+            transporte.post(stub.url + PREFIXO_API, json={'data': [{'nome': 'A'}]})
+        assert stub.contadores['requisicoes'] == 1
+        with pytest.raises(requests.ReadTimeout):
+            transporte.get(stub.url + PREFIXO_API)
+        assert stub.contadores['requisicoes'] == 4
+
+
+def test_post_repete_429_respeitando_retry_after():
+    with _stub(limite_rps=1, retry_after=1.1) as stub, _transporte() as transporte:
+        assert transporte.post(stub.url + PREFIXO_API, json={'data': [{'nome': 'A'}]}).status_code == 200
+        inicio = time.monotonic()
+        assert transporte.post(stub.url + PREFIXO_API, json={'data': [{'nome': 'B'}]}).status_code == 200
+        assert time.monotonic() - inicio >= 1.1
+        assert (stub.contadores['requisicoes'], stub.contadores['429']) == (3, 1)
+
+
+def test_post_repete_falha_de_conexao(monkeypatch):
+    with _stub() as stub, _transporte() as transporte:
+        original = transporte.session.request
+        chamadas = []
+
+        def conexao_falha_uma_vez(*args, **kwargs):
+            chamadas.append(args)
+            if len(chamadas) == 1:
+                raise requests.ConnectTimeout('conexão não estabelecida')
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(transporte.session, 'request', conexao_falha_uma_vez)
+        assert transporte.post(stub.url + PREFIXO_API, json={'data': [{'nome': 'A'}]}).status_code == 200
+        assert len(chamadas) == 2
+        assert stub.contadores['requisicoes'] == 1
+
+
+def test_limitador_penalizar_e_recompensar():
+    limitador = LimitadorTaxa(taxa_maxima=8, taxa_minima=1, fator_reducao=0.5, incremento=2, intervalo_reducao=0)
+    taxas = []
+    for _ in range(4):
+        limitador.penalizar()
+        taxas.append(limitador.taxa)
+    assert taxas == [4, 2, 1, 1]  # Redução multiplicativa até o piso.
+
+    limitador.recompensar()
+    assert limitador.taxa == 3  # 1 + incremento / taxa
+    limitador.recompensar()
+    assert limitador.taxa == pytest.approx(3 + 2 / 3)
+    for _ in range(50):
+        limitador.recompensar()
+    assert limitador.taxa == 8  # Nunca passa de taxa_maxima.
+
+
+def test_limitador_agrupa_rejeicoes_e_pausa():
+    limitador = LimitadorTaxa(taxa_maxima=100, rajada=100, intervalo_reducao=60)
+    limitador.penalizar()
+    limitador.penalizar()  # Mesma rajada: conta como uma só redução.
+    assert limitador.taxa == 50
+    limitador.penalizar(0.2)
+    assert limitador.adquirir() == pytest.approx(0.2, abs=0.05)
+
+
+class _MetricasQuebradas:
+    def registrar(self, medicao):
+        raise RuntimeError('registro indisponível')
+
+
+def test_falha_nas_metricas_nao_substitui_resposta(caplog):
+    with _stub() as stub, HttpTransport(politica=PoliticaRetentativa(max_tentativas=1),
+                                      metricas=_MetricasQuebradas()) as transporte:
+        assert transporte.get(stub.url + PREFIXO_API).status_code == 200
+        with pytest.raises(requests.ConnectionError):
+            transporte.get('http://127.0.0.1:1/')
+    assert 'Falha ao registrar a medição' in caplog.text
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from API_orcrim.domain import DomainRegistry, TABELAS
+from API_orcrim.validacao import ValidadorPessoa, ErroValidacao, Violacao, cpf_valido, data_valida
+
+DOMINIO = {
+    'ufs': [{'id': 27, 'nome': 'DISTRITO FEDERAL', 'sigla': 'DF'}, {'id': 35, 'nome': 'SAO PAULO', 'sigla': 'SP'}],
+    'municipios': [{'id': 530010801, 'nome': 'Brasília', 'uf': {'id': 27}}, {'id': 355030801, 'nome': 'São Paulo',
+                                                                               'uf': {'id': 35}}],
+    'orcrims': [{'id': 230, 'nome': 'BONDE DO TERROR', 'sigla': 'BDT'}],
+    'sexos': [{'id': 7, 'nome': 'Masculino'}],
+    'nacionalidades': [{'id': 76, 'nome': 'Brasil'}],
+}
+
+VALIDO = {'nome': 'FULANO DE TAL', 'dataNascimento': '29/02/2000', 'obito': 'N', 'uf': {'id': 27},
+          'municipio': {'id': 530010801}, 'sexo': {'id': 7}, 'nacionalidade': {'id': 76},
+          'cpfs': ['529.982.247-25'], 'rgs': [{'rg': '123456', 'ufRg': {'id': 27}}], 'orcrims': [{'id': 230}],
+          'alcunhas': [{'alcunha': 'TESTE', 'dataAlcunha': '01/01/2010'}]}
+
+
+@pytest.fixture(scope='module')
+def validador(tmp_path_factory):
+    diretorio = tmp_path_factory.mktemp('dominio')
+    for nome, registros in DOMINIO.items():
+        (diretorio / TABELAS[nome][1]).write_text(json.dumps({'data': registros}), encoding='utf-8')
+    return ValidadorPessoa(DomainRegistry(str(diretorio)))
+
+
+@pytest.mark.parametrize('cpf, esperado', [
+    ('529.982.247-25', True),
+    ('11144477735', True),
+    ('529.982.247-24', False),  # Dígito verificador errado.
+    ('1234567890', False),      # Dígitos de menos.
+    ('', False),
+    ('111.111.111-11', False),  # Dígitos repetidos passam na conta, mas não são CPFs.
+    ('00000000000', False),
+])
+def test_cpf_valido(cpf, esperado):
+    assert cpf_valido(cpf) is esperado
+
+
+@pytest.mark.parametrize('data, esperado', [
+    ('29/02/2000', True),
+    ('29/02/2024', True),
+    ('31/02/2024', False),
+    ('29/02/2023', False),
+    ('29/02/1900', False),  # Múltiplo de 100 sem ser de 400.
+    ('31/04/2020', False),
+    ('01/13/2020', False),
+    ('00/01/2020', False),
+    ('01/01/1799', False),
+    ('2020-01-01', False),
+    ('1/1/2020', False),
+])
+def test_data_valida(data, esperado):
+    assert data_valida(data) is esperado
+
+
+@pytest.mark.parametrize('alteracao, campos', [
+    ({}, []),
+    ({'nome': '  '}, ['nome']),
+    ({'dataNascimento': '31/02/1990'}, ['dataNascimento']),
+    ({'obito': 'X'}, ['obito']),
+    ({'uf': {'id': 99}}, ['uf.id']),
+    ({'sexo': {'id': 99}}, ['sexo.id']),
+    ({'nacionalidade': {'id': 999}}, ['nacionalidade.id']),
+    ({'municipio': {'id': 1}}, ['municipio.id']),
+    ({'municipio': {'id': 355030801}}, ['municipio.id']),  # Município de outra UF.
+    ({'cpfs': ['529.982.247-25', '222.222.222-22']}, ['cpfs[1]']),
+    ({'rgs': [{'rg': '', 'ufRg': {'id': 99}}]}, ['rgs[0].rg', 'rgs[0].ufRg.id']),
+    ({'orcrims': [{'id': 1}]}, ['orcrims[0].id']),
+    ({'alcunhas': [{'alcunha': '', 'dataAlcunha': '30/02/2010'}]}, ['alcunhas[0].alcunha', 'alcunhas[0].dataAlcunha']),
+])
+def test_validar(validador, alteracao, campos):
+    assert [campo for campo, _ in validador.validar({**VALIDO, **alteracao})] == campos
+
+
+def test_exigir_valido_reune_o_lote(validador):
+    lote = {'data': [VALIDO, {**VALIDO, 'uf': {'id': 99}}, {**VALIDO, 'nome': '', 'cpfs': ['00000000000']}]}
+    with pytest.raises(ErroValidacao) as erro:
+        validador.exigir_valido(lote)
+    assert [(v.indice, v.campo) for v in erro.value.violacoes] == [(1, 'uf.id'), (2, 'nome'), (2, 'cpfs[0]')]
+    assert validador.validar_lote([VALIDO]) == []
+    assert validador.validar('texto') == [('', 'registro deve ser um objeto')]
+    assert isinstance(erro.value.violacoes[0], Violacao)